@@ -0,0 +1,63 @@
+import os
+import subprocess
+import sys
+
+# Cold-start and per-rerun payload measurements for the dashboards.
+#
+#   python -m benchmarks.coldstart
+#
+# Import time is measured in a fresh interpreter per module with streamlit already
+# loaded (the server always has it), so it isolates what each dashboard adds.
+# Stylesheet payload is the inline <style> block (fonts.css + the page's
+# stylesheet) each rerun sends; the files themselves are read once per process.
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULES = ["dashboards.adminDashboard", "dashboards.facultyDashboard", "dashboards.studentDashboard"]
+HEAVY = ["pandas", "plotly.express", "qrcode", "PIL.Image"]
+RUNS = 5
+
+PROBE = """
+import sys, time
+import streamlit
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(elapsed, ",".join(name for name in {heavy!r} if name in sys.modules))
+"""
+
+
+def import_time(module):
+    timings, loaded = [], ""
+    for _ in range(RUNS):
+        output = subprocess.run(
+            [sys.executable, "-c", PROBE.format(module=module, heavy=HEAVY)],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.split()
+        timings.append(float(output[0]))
+        loaded = output[1] if len(output) > 1 else ""
+    return min(timings), loaded
+
+
+def stylesheet_payload():
+    rows = []
+    css_dir = os.path.join(ROOT, "assets", "css")
+    fonts = os.path.getsize(os.path.join(css_dir, "fonts.css"))
+    for name in sorted(os.listdir(css_dir)):
+        if name == "fonts.css":
+            continue
+        rows.append((name, len("<style>\n</style>") + fonts + os.path.getsize(os.path.join(css_dir, name))))
+    return rows
+
+
+def main():
+    print("Import time (fresh interpreter, streamlit preloaded, best of %d)" % RUNS)
+    for module in MODULES:
+        seconds, loaded = import_time(module)
+        print(f"  {module:<32} {seconds * 1000:8.1f} ms   heavy modules loaded at import: {loaded or 'none'}")
+    print("Stylesheet bytes sent per rerun")
+    for name, inline in stylesheet_payload():
+        print(f"  {name:<16} {inline:>6} B")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import argparse
+import gc
+import json
+import random
+import tracemalloc
+
+import pandas as pd
+import pyarrow as pa
+
+from services.frames import arrow_frame, arrow_table
+
+# Memory held by a page of rows on the way to st.dataframe: the JSON response as
+# a list of dicts, an object-dtype DataFrame built from it, and the Arrow path.
+#
+#   python -m benchmarks.frames                  # 100k and 1M rows
+#   python -m benchmarks.frames --rows 250000
+#
+# Python allocations are measured with tracemalloc and Arrow buffers with
+# pyarrow.total_allocated_bytes(); "retained" is what stays alive afterwards
+# (what a cached page or a session costs), "peak" includes the conversion.
+
+TABLES = {
+    "users": ("id", "name", "username", "email", "role"),
+    "logs": ("id", "created_at", "level", "user_id", "message"),
+}
+
+
+def _rows(table, count, rng):
+    if table == "users":
+        roles = (["Student"] * 18) + (["Faculty"] * 2) + ["Admin"]
+        return [{"id": i, "name": f"User {i}", "username": f"user{i}", "email": f"user{i}@example.edu", "role": rng.choice(roles)}
+                for i in range(1, count + 1)]
+    levels = (["INFO"] * 8) + ["WARNING", "ERROR"]
+    return [{"id": i, "created_at": f"2025-01-01T00:00:{i % 60:02d}+00:00", "level": rng.choice(levels),
+             "user_id": rng.randint(1, count), "message": f"event {i}"} for i in range(1, count + 1)]
+
+
+def _measure(build):
+    gc.collect()
+    arrow_before = pa.total_allocated_bytes()
+    tracemalloc.start()
+    result = build()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    arrow = pa.total_allocated_bytes() - arrow_before
+    return result, retained + arrow, peak + arrow
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare memory of the JSON, object-dtype and Arrow data paths.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    args = parser.parse_args(argv)
+    rng = random.Random(42)
+    print(f"{'table':<6} {'rows':>9}  {'path':<24} {'retained MiB':>13} {'peak MiB':>9}")
+    for table, columns in TABLES.items():
+        for count in args.rows:
+            payload = json.dumps(_rows(table, count, rng))
+            rows, retained, peak = _measure(lambda: json.loads(payload))
+            results = [("JSON list of dicts", retained, peak)]
+
+            _, retained, peak = _measure(lambda: pd.DataFrame(rows, columns=list(columns)))
+            results.append(("pandas object dtypes", retained, peak))
+            page, retained, peak = _measure(lambda: arrow_table(rows, columns))
+            results.append(("arrow table", retained, peak))
+            _, retained, peak = _measure(lambda: arrow_frame(page))
+            results.append(("pandas ArrowDtype view", retained, peak))
+
+            for name, retained, peak in results:
+                print(f"{table:<6} {count:>9,}  {name:<24} {retained / 2**20:>13.1f} {peak / 2**20:>9.1f}")
+            del rows, page
+
+
+if __name__ == "__main__":
+    main()
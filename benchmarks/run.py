@@ -0,0 +1,227 @@
+import argparse
+import concurrent.futures
+import json
+import multiprocessing
+import os
+import queue
+import resource
+import sys
+import time
+import urllib.request
+
+from benchmarks.seed import BENCH_USERS, seed
+from benchmarks.standin import StandinServer
+
+# Drives every dashboard page through Streamlit's AppTest harness against the
+# local stand-in and reports wall time, query count, bytes transferred and peak
+# RSS per page: cold (full rerun, empty query cache), warm (immediate full
+# rerun) and fragment (the page function alone, empty query cache). The last is
+# what a widget interaction inside a page re-executes in the browser; AppTest
+# itself always re-runs the whole app, so cold vs fragment is the saving per
+# interaction.
+#
+#   python -m benchmarks.run                          # 10k, 100k and 1M rows
+#   python -m benchmarks.run --scales 10000 --roles Admin --json bench.json
+#   python -m benchmarks.run --baseline bench.json    # fail on regressions
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCH_KEY = "bench.standin.key"
+
+# (role, sidebar page, [(selectbox key, value), ...])
+SCENARIOS = [
+    ("Admin", "Dashboard", []),
+    ("Admin", "User Management", [("user_action_selectbox", "View Users")]),
+    ("Admin", "Team Management", [("team_action_selectbox", "View Teams")]),
+    ("Admin", "Team Management", [("team_action_selectbox", "Approve Team")]),
+    ("Admin", "Project Tracking", [("project_action_selectbox", "View Projects")]),
+    ("Admin", "Project Tracking", [("project_action_selectbox", "Update Project Status")]),
+    ("Admin", "Analytics and Reports", []),
+    ("Admin", "Notifications", []),
+    ("Admin", "Logs and Activity", [("log_action_selectbox", "View Logs")]),
+    ("Admin", "Logs and Activity", [("log_action_selectbox", "View Activity")]),
+    ("Admin", "Settings", []),
+    *[("Faculty", page, []) for page in ["Dashboard", "View Mentees", "Feedback & Grading", "Project Tracking", "Chat", "Notifications", "Analytics", "Profile & Settings"]],
+    *[("Student", page, []) for page in ["Dashboard", "View Projects", "Submit Work", "Chat", "Notifications", "Profile & Settings"]],
+]
+
+METRICS = ["wall_ms", "queries", "bytes_out"]
+
+DASHBOARDS = {"Admin": "dashboards.adminDashboard", "Faculty": "dashboards.facultyDashboard", "Student": "dashboards.studentDashboard"}
+
+
+def _stats(url, reset=True):
+    with urllib.request.urlopen(f"{url}/__stats{'?reset=1' if reset else ''}") as response:
+        return json.load(response)
+
+
+def _peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _fragment_script():
+    # The body of one page fragment, as re-executed by an interaction inside it
+    import importlib
+    import inspect
+    import streamlit as st
+    from services.session import current_user
+
+    page = importlib.import_module(st.session_state["bench_dashboard"]).PAGES[st.session_state["bench_page"]]
+    page(*([current_user()] if inspect.signature(page).parameters else []))
+
+
+def _run_scenario(url, scenario, results):
+    # Runs in a fresh process so the query cache, imports and peak RSS are per page
+    role, page, actions = scenario
+    os.environ["SUPABASE_URL"] = url
+    os.environ["SUPABASE_KEY"] = BENCH_KEY
+    os.chdir(ROOT)
+    sys.path.insert(0, ROOT)
+    from streamlit.testing.v1 import AppTest
+    from services.auth import issue_token
+    from services.queryCache import get_query_cache
+    from services.workers import pending
+
+    at = AppTest.from_file("login.py", default_timeout=300)
+    user_id = BENCH_USERS[role]
+    at.session_state["logged_in"] = True
+    at.session_state["role"] = role
+    at.session_state["user_id"] = user_id
+    at.session_state["username"] = f"user{user_id}"
+    at.session_state["token"] = issue_token(user_id, role)
+
+    steps = [lambda: None]
+    if page != "Dashboard":
+        steps.append(lambda: at.sidebar.radio[0].set_value(page))
+    for key, value in actions:
+        steps.append(lambda key=key, value=value: at.selectbox(key=key).set_value(value))
+
+    for step in steps[:-1]:
+        step()
+        at.run()
+    concurrent.futures.wait(pending())
+    rss_before = _peak_rss_mb()
+    _stats(url)
+
+    result = {"role": role, "page": page, "view": ", ".join(value for _, value in actions)}
+    steps[-1]()
+    for phase in ("cold", "warm"):
+        if phase == "cold":
+            # The setup reruns above warmed the shared query cache
+            get_query_cache().clear()
+        start = time.perf_counter()
+        at.run()
+        wall_ms = (time.perf_counter() - start) * 1000
+        # Background prefetches started by this render count towards it, not the next phase
+        concurrent.futures.wait(pending())
+        stats = _stats(url)
+        result[phase] = {"wall_ms": round(wall_ms, 1), "queries": stats["queries"], "bytes_out": stats["bytes_out"], "bytes_in": stats["bytes_in"]}
+
+    # Same page, same widget state, fragment body only
+    fragment = AppTest.from_function(_fragment_script, default_timeout=300)
+    for key in ("logged_in", "role", "user_id", "username", "token"):
+        fragment.session_state[key] = at.session_state[key]
+    fragment.session_state["bench_dashboard"] = DASHBOARDS[role]
+    fragment.session_state["bench_page"] = page
+    for key, value in actions:
+        fragment.session_state[key] = value
+    get_query_cache().clear()
+    start = time.perf_counter()
+    fragment.run()
+    wall_ms = (time.perf_counter() - start) * 1000
+    concurrent.futures.wait(pending())
+    stats = _stats(url)
+    result["fragment"] = {"wall_ms": round(wall_ms, 1), "queries": stats["queries"], "bytes_out": stats["bytes_out"], "bytes_in": stats["bytes_in"]}
+
+    result["peak_rss_mb"] = round(_peak_rss_mb(), 1)
+    result["rss_growth_mb"] = round(result["peak_rss_mb"] - rss_before, 1)
+    # Uncaught exceptions and pages that only rendered an st.error both count as failures
+    result["errors"] = [str(exception.value) for exception in at.exception] + [error.value for error in at.error]
+    results.put(result)
+
+
+def run(scales, roles, data_dir):
+    os.makedirs(data_dir, exist_ok=True)
+    context = multiprocessing.get_context("spawn")
+    report = []
+    for scale in scales:
+        db_path = os.path.join(data_dir, f"bench_{scale}.db")
+        if not os.path.exists(db_path):
+            print(f"Seeding {scale:,} rows...", file=sys.stderr)
+            seed(db_path, scale)
+        server = StandinServer(db_path).start()
+        try:
+            for scenario in SCENARIOS:
+                if scenario[0] not in roles:
+                    continue
+                results = context.Queue()
+                process = context.Process(target=_run_scenario, args=(server.url, scenario, results))
+                process.start()
+                process.join()
+                try:
+                    result = results.get(timeout=5)
+                except queue.Empty:
+                    role, page, actions = scenario
+                    empty = {"wall_ms": 0, "queries": 0, "bytes_out": 0, "bytes_in": 0}
+                    result = {"role": role, "page": page, "view": ", ".join(value for _, value in actions), "cold": empty, "warm": empty, "fragment": empty,
+                              "peak_rss_mb": 0, "rss_growth_mb": 0, "errors": [f"benchmark process exited with code {process.exitcode}"]}
+                result["scale"] = scale
+                report.append(result)
+                _print_row(result)
+        finally:
+            server.shutdown()
+    return report
+
+
+def _print_row(result):
+    cold, warm, fragment = result["cold"], result["warm"], result["fragment"]
+    name = f"{result['role']}/{result['page']}" + (f" [{result['view']}]" if result["view"] else "")
+    print(
+        f"{result['scale']:>9,}  {name:<50} "
+        f"cold {cold['wall_ms']:>8.1f} ms {cold['queries']:>3} q {cold['bytes_out'] / 1024:>9.1f} KiB  "
+        f"warm {warm['wall_ms']:>8.1f} ms {warm['queries']:>3} q {warm['bytes_out'] / 1024:>9.1f} KiB  "
+        f"fragment {fragment['wall_ms']:>8.1f} ms {fragment['queries']:>3} q  "
+        f"rss {result['peak_rss_mb']:>7.1f} MiB (+{result['rss_growth_mb']:.1f})"
+        + (f"  ERRORS: {result['errors']}" if result["errors"] else "")
+    )
+
+
+def compare(report, baseline, tolerance):
+    # Regressions: any cold metric more than `tolerance` worse than the baseline
+    previous = {(r["scale"], r["role"], r["page"], r["view"]): r for r in baseline}
+    regressions = []
+    for result in report:
+        before = previous.get((result["scale"], result["role"], result["page"], result["view"]))
+        if before is None:
+            continue
+        for metric in METRICS:
+            old, new = before["cold"][metric], result["cold"][metric]
+            if new > old * (1 + tolerance) and new - old > 1:
+                regressions.append(f"{result['scale']:,} {result['role']}/{result['page']} {result['view']}: {metric} {old} -> {new}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark CortexPM dashboard pages against a local PostgREST stand-in.")
+    parser.add_argument("--scales", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--roles", nargs="+", default=["Admin", "Faculty", "Student"])
+    parser.add_argument("--data-dir", default=os.path.join(ROOT, ".bench_data"))
+    parser.add_argument("--json", help="write the full report to this file")
+    parser.add_argument("--baseline", help="previous --json report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative regression (default 0.2)")
+    args = parser.parse_args(argv)
+
+    report = run(args.scales, args.roles, args.data_dir)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
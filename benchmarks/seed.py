@@ -0,0 +1,168 @@
+import os
+import random
+import sqlite3
+from datetime import datetime, timedelta
+
+# Synthetic CortexPM data for the benchmark stand-in. `scale` is the number of
+# users, logs and activity rows; teams, projects and approvals get a fifth of that.
+
+SCHEMA = """
+create table users (id integer primary key, name text, username text unique, email text unique, role text, password text, updated_at text default (strftime('%Y-%m-%dT%H:%M:%f', 'now')));
+create table teams (id integer primary key, name text, mentor_id integer, status text, updated_at text default (strftime('%Y-%m-%dT%H:%M:%f', 'now')));
+create table projects (id integer primary key, title text, team_id integer, status text, created_at text);
+create table approvals (id integer primary key, team_id integer, status text, created_at text);
+create table logs (id integer primary key, created_at text, level text, user_id integer, message text);
+create table activity (id integer primary key, created_at text, user_id integer, action text);
+create table notifications (id integer primary key, message text, type text, created_at text default current_timestamp);
+
+create index projects_status_idx on projects (status);
+create index approvals_status_idx on approvals (status);
+create index users_name_id_idx on users (name, id);
+create index users_role_id_idx on users (role, id);
+create index teams_status_id_idx on teams (status, id);
+create index projects_status_id_idx on projects (status, id);
+create index logs_created_at_id_idx on logs (created_at, id);
+create index activity_created_at_id_idx on activity (created_at, id);
+
+create table team_members (team_id integer, user_id integer, primary key (team_id, user_id));
+create table user_notifications (id integer primary key, user_id integer, notification_id integer, read_at text, created_at text default current_timestamp);
+create table notification_counters (user_id integer primary key, unread integer default 0);
+create table team_messages (id integer primary key, team_id integer, sender_id integer, body text, created_at text default current_timestamp);
+create table team_message_receipts (message_id integer, user_id integer, read_at text, primary key (user_id, message_id));
+create table direct_messages (id integer primary key, conversation text, sender_id integer, recipient_id integer, body text, created_at text default current_timestamp);
+create table submissions (id integer primary key, project_id integer, submitted_by integer, text text, created_at text);
+create table grades (id integer primary key, team_id integer, graded_by integer, grade real, feedback text, created_at text);
+
+create index teams_mentor_id_idx on teams (mentor_id, id);
+create index projects_team_id_idx on projects (team_id, id);
+create index team_members_user_id_idx on team_members (user_id);
+create index submissions_project_id_idx on submissions (project_id, created_at);
+create index grades_team_id_idx on grades (team_id, created_at);
+create index user_notifications_inbox_idx on user_notifications (user_id, id);
+create index team_messages_team_id_id_idx on team_messages (team_id, id);
+create index direct_messages_sender_id_idx on direct_messages (sender_id, id);
+create index direct_messages_recipient_id_idx on direct_messages (recipient_id, id);
+
+-- sql/009_mentor_overview.sql, with SQLite JSON functions in place of jsonb
+create view mentor_team_overview as
+select t.id as team_id, t.mentor_id, t.name as team_name, t.status as team_status,
+       (select json_group_array(json_object('id', id, 'title', title, 'status', status)) from projects where team_id = t.id) as projects,
+       (select json_group_array(json_object('id', u.id, 'name', u.name, 'username', u.username))
+          from team_members m join users u on u.id = m.user_id where m.team_id = t.id) as members,
+       (select json_group_array(json_object('id', id, 'project_id', project_id, 'submitted_by', submitted_by, 'created_at', created_at))
+          from (select s.* from submissions s join projects p on p.id = s.project_id where p.team_id = t.id order by s.created_at desc limit 10)) as recent_submissions,
+       (select count(*) from grades where team_id = t.id) as grade_count,
+       (select grade from grades where team_id = t.id order by created_at desc limit 1) as latest_grade,
+       (select feedback from grades where team_id = t.id order by created_at desc limit 1) as latest_feedback,
+       (select max(created_at) from grades where team_id = t.id) as last_graded_at
+from teams t;
+
+create view project_status_counts as select status, count(*) as count from projects group by status;
+
+create table project_status_daily (day text, status text, entered integer, exited integer, primary key (day, status));
+create table project_status_monthly (month text, status text, entered integer, exited integer, primary key (month, status));
+create view project_status_trend_weekly as
+select period, status, entered, exited, sum(entered - exited) over (partition by status order by period) as count
+from (
+    select date(day, 'weekday 0', '-6 days') as period, status, sum(entered) as entered, sum(exited) as exited
+    from project_status_daily group by 1, 2
+);
+create view project_status_trend_monthly as
+select month as period, status, entered, exited, sum(entered - exited) over (partition by status order by month) as count
+from project_status_monthly;
+
+-- sql/011_row_versions.sql: updated_at moves on every update
+create trigger users_touch_updated_at after update on users when new.updated_at is old.updated_at
+begin update users set updated_at = strftime('%Y-%m-%dT%H:%M:%f', 'now') where id = new.id; end;
+create trigger teams_touch_updated_at after update on teams when new.updated_at is old.updated_at
+begin update teams set updated_at = strftime('%Y-%m-%dT%H:%M:%f', 'now') where id = new.id; end;
+"""
+
+ROLES = (["Student"] * 18) + (["Faculty"] * 2) + ["Admin"]
+PROJECT_STATUSES = ["Initiated", "In Progress", "Completed"]
+APPROVAL_STATUSES = ["Pending", "Approved", "Rejected"]
+TEAM_STATUSES = ["Pending", "Approved"]
+LEVELS = (["INFO"] * 8) + ["WARNING", "ERROR"]
+ACTIONS = ["login", "logout", "submit", "comment", "update_profile"]
+
+BATCH = 50_000
+
+# Fixed accounts the benchmark sessions log in as (user id per role). The
+# faculty account mentors the first MENTORED_TEAMS teams; the student is a
+# member of team 1.
+BENCH_USERS = {"Admin": 1, "Faculty": 2, "Student": 3}
+MENTORED_TEAMS = 40
+TEAM_SIZE = 4
+
+
+def _timestamps(rng, count, start=datetime(2021, 1, 1)):
+    # Ascending timestamps spread over roughly the last few years
+    step = (datetime(2026, 1, 1) - start) / max(count, 1)
+    for i in range(count):
+        yield (start + step * i + timedelta(seconds=rng.randint(0, 59))).isoformat()
+
+
+def _insert(connection, table, columns, rows):
+    sql = f"insert into {table} ({', '.join(columns)}) values ({', '.join('?' * len(columns))})"
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == BATCH:
+            connection.executemany(sql, batch)
+            batch.clear()
+    if batch:
+        connection.executemany(sql, batch)
+
+
+def seed(path, scale, seed=42):
+    # Build (or rebuild) a SQLite database at path with `scale` synthetic rows
+    if os.path.exists(path):
+        os.remove(path)
+    rng = random.Random(seed)
+    groups = max(scale // 5, 1)
+    connection = sqlite3.connect(path)
+    connection.execute("pragma journal_mode = wal")
+    connection.executescript(SCHEMA)
+    fixed_roles = {user_id: role for role, user_id in BENCH_USERS.items()}
+    with connection:
+        _insert(connection, "users", ("id", "name", "username", "email", "role", "password"), (
+            (i, f"User {i}", f"user{i}", f"user{i}@example.edu", fixed_roles.get(i) or rng.choice(ROLES), f"password{i}")
+            for i in range(1, scale + 1)
+        ))
+        _insert(connection, "teams", ("id", "name", "mentor_id", "status"), (
+            (i, f"Team {i}", BENCH_USERS["Faculty"] if i <= MENTORED_TEAMS else rng.randint(1, scale), rng.choice(TEAM_STATUSES))
+            for i in range(1, groups + 1)
+        ))
+        _insert(connection, "team_members", ("team_id", "user_id"), (
+            (i, user_id) for i in range(1, groups + 1)
+            for user_id in {BENCH_USERS["Student"] if i == 1 else rng.randint(1, scale), *(rng.randint(1, scale) for _ in range(TEAM_SIZE - 1))}
+        ))
+        _insert(connection, "projects", ("id", "title", "team_id", "status", "created_at"), (
+            (i, f"Project {i}", i, rng.choice(PROJECT_STATUSES), created_at)
+            for i, created_at in enumerate(_timestamps(rng, groups), start=1)
+        ))
+        _insert(connection, "approvals", ("id", "team_id", "status", "created_at"), (
+            (i, i, rng.choice(APPROVAL_STATUSES), created_at)
+            for i, created_at in enumerate(_timestamps(rng, groups), start=1)
+        ))
+        _insert(connection, "submissions", ("id", "project_id", "submitted_by", "text", "created_at"), (
+            (i, (i + 1) // 2, rng.randint(1, scale), f"Submission {i}", created_at)
+            for i, created_at in enumerate(_timestamps(rng, 2 * groups), start=1)
+        ))
+        _insert(connection, "grades", ("id", "team_id", "graded_by", "grade", "feedback", "created_at"), (
+            (i, i, BENCH_USERS["Faculty"], rng.randint(50, 100), f"Feedback {i}", created_at)
+            for i, created_at in enumerate(_timestamps(rng, groups), start=1)
+        ))
+        _insert(connection, "logs", ("id", "created_at", "level", "user_id", "message"), (
+            (i, created_at, rng.choice(LEVELS), rng.randint(1, scale), f"event {i}")
+            for i, created_at in enumerate(_timestamps(rng, scale), start=1)
+        ))
+        _insert(connection, "activity", ("id", "created_at", "user_id", "action"), (
+            (i, created_at, rng.randint(1, scale), rng.choice(ACTIONS))
+            for i, created_at in enumerate(_timestamps(rng, scale), start=1)
+        ))
+        # What the sql/007 triggers would have accumulated for these projects
+        connection.execute("insert into project_status_daily select date(created_at), status, count(*), 0 from projects group by 1, 2")
+        connection.execute("insert into project_status_monthly select strftime('%Y-%m-01', created_at), status, count(*), 0 from projects group by 1, 2")
+    connection.close()
+    return path
@@ -0,0 +1,459 @@
+import json
+import re
+import sqlite3
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+# Local PostgREST-compatible stand-in backed by SQLite. It implements the subset
+# of the PostgREST API the dashboards use (select/projection with many-to-one
+# embeds, horizontal filters, or/and trees, order, limit/offset, exact counts,
+# insert/update/delete with return=representation|minimal and RPC calls) and
+# counts queries and bytes so benchmarks can report them. Nothing leaves localhost.
+
+RESERVED_PARAMS = {"select", "order", "limit", "offset", "or", "and", "on_conflict", "columns"}
+IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+OPERATORS = {"eq": "=", "neq": "!=", "gt": ">", "gte": ">=", "lt": "<", "lte": "<=", "like": "LIKE", "ilike": "LIKE"}
+
+
+
+def _student_overview(connection, params):
+    # SQLite version of sql/010_student_overview.sql
+    user_id = params["p_user_id"]
+
+    def rows(query, *args):
+        return [dict(row) for row in connection.execute(query, args)]
+
+    team_ids = "(select team_id from team_members where user_id = ?)"
+    unread = connection.execute("select unread from notification_counters where user_id = ?", (user_id,)).fetchone()
+    return {
+        "teams": rows(f"select id, name, status from teams where id in {team_ids} order by id", user_id),
+        "projects": rows(
+            f"select p.id, p.title, p.status, p.team_id, (select max(created_at) from submissions s where s.project_id = p.id) as last_submitted_at "
+            f"from projects p where p.team_id in {team_ids} order by p.id", user_id),
+        "members": rows(
+            f"select u.id, u.name, m.team_id from team_members m join users u on u.id = m.user_id "
+            f"where m.team_id in {team_ids} and m.user_id <> ? order by u.name", user_id, user_id),
+        "unread": unread[0] if unread else 0,
+        "notifications": rows(
+            "select un.id, n.message, n.type, un.created_at, un.read_at from user_notifications un "
+            "join notifications n on n.id = un.notification_id where un.user_id = ? order by un.id desc limit 5", user_id),
+        "team_chat": rows(
+            f"select team_id, sender_id, body, created_at from team_messages where id in "
+            f"(select max(id) from team_messages where team_id in {team_ids} group by team_id) order by team_id", user_id),
+        "direct_chat": rows(
+            "select sender_id, recipient_id, body, created_at from direct_messages "
+            "where sender_id = ? or recipient_id = ? order by id desc limit 5", user_id, user_id),
+    }
+
+
+def _deliver(connection, notification_id, role, team_id):
+    # sql/005_notification_inbox.sql: inbox rows for the audience plus the unread
+    # counters its triggers maintain
+    audience = (
+        "select id from users where (:role is null or role = :role) "
+        "and (:team_id is null or id in (select user_id from team_members where team_id = :team_id))"
+    )
+    args = {"role": role, "team_id": team_id, "notification_id": notification_id}
+    delivered = connection.execute(
+        f"insert into user_notifications (user_id, notification_id) select id, :notification_id from ({audience})", args,
+    ).rowcount
+    connection.execute(
+        f"insert into notification_counters (user_id, unread) select id, 1 from ({audience}) where true "
+        "on conflict (user_id) do update set unread = unread + 1", args,
+    )
+    return delivered
+
+
+def _deliver_notification(connection, params):
+    connection.execute("begin")
+    try:
+        delivered = _deliver(connection, params["p_notification_id"], params.get("p_role"), params.get("p_team_id"))
+    except BaseException:
+        connection.execute("rollback")
+        raise
+    connection.execute("commit")
+    return delivered
+
+
+def _announce(connection, params):
+    # sql/012_announce.sql: the notification and its delivery in one transaction
+    connection.execute("begin")
+    try:
+        notification_id = connection.execute(
+            "insert into notifications (message, type) values (?, ?)", (params["p_message"], params["p_type"]),
+        ).lastrowid
+        delivered = _deliver(connection, notification_id, params.get("p_role"), params.get("p_team_id"))
+    except BaseException:
+        connection.execute("rollback")
+        raise
+    connection.execute("commit")
+    return delivered
+
+
+def _send_team_message(connection, params):
+    # sql/013_send_team_message.sql: the message and its receipts in one transaction
+    connection.execute("begin")
+    try:
+        message = connection.execute(
+            "insert into team_messages (team_id, sender_id, body) values (?, ?, ?) returning *",
+            (params["p_team_id"], params["p_sender_id"], params["p_body"]),
+        ).fetchone()
+        connection.execute(
+            "insert into team_message_receipts (message_id, user_id) "
+            "select ?, user_id from team_members where team_id = ? and user_id != ?",
+            (message["id"], params["p_team_id"], params["p_sender_id"]),
+        )
+    except BaseException:
+        connection.execute("rollback")
+        raise
+    connection.execute("commit")
+    return dict(message)
+
+
+# RPC name -> callable(connection, params) returning JSON-serialisable data
+RPCS = {
+    "student_overview": _student_overview,
+    "deliver_notification": _deliver_notification,
+    "announce": _announce,
+    "send_team_message": _send_team_message,
+}
+
+# Many-to-one embeds, (table, embedded table) -> foreign key column on table,
+# e.g. user_notifications?select=id,notifications(message,type)
+EMBEDS = {
+    ("user_notifications", "notifications"): "notification_id",
+}
+
+# View columns built with SQLite's json_group_array/json_object; decoded before
+# sending so they arrive as arrays, like jsonb columns from PostgREST
+JSON_COLUMNS = {
+    "mentor_team_overview": {"projects", "members", "recent_submissions"},
+}
+
+
+class QueryError(Exception):
+    def __init__(self, message, status=400, code="PGRST100"):
+        super().__init__(message)
+        self.status = status
+        self.code = code
+
+
+def _identifier(name):
+    if not IDENTIFIER.match(name):
+        raise QueryError(f"invalid identifier: {name}")
+    return f'"{name}"'
+
+
+def _split(text):
+    # Split on top-level commas, respecting parentheses and double quotes
+    parts, depth, quoted, current = [], 0, False, []
+    i = 0
+    while i < len(text):
+        char = text[i]
+        if quoted and char == "\\" and i + 1 < len(text):
+            current.append(text[i:i + 2])
+            i += 2
+            continue
+        if char == '"':
+            quoted = not quoted
+        elif not quoted and char == "(":
+            depth += 1
+        elif not quoted and char == ")":
+            depth -= 1
+        elif not quoted and depth == 0 and char == ",":
+            parts.append("".join(current))
+            current = []
+            i += 1
+            continue
+        current.append(char)
+        i += 1
+    if current:
+        parts.append("".join(current))
+    return parts
+
+
+def _unquote(value):
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        return re.sub(r"\\(.)", r"\1", value[1:-1])
+    return value
+
+
+def _filter(column, expression):
+    # column + "op.value" (optionally prefixed with "not.") -> (sql, params)
+    negate = expression.startswith("not.")
+    if negate:
+        expression = expression[4:]
+    op, _, value = expression.partition(".")
+    column = _identifier(column)
+    if op in OPERATORS:
+        value = _unquote(value)
+        if op in ("like", "ilike"):
+            value = value.replace("*", "%")
+        sql, params = f"{column} {OPERATORS[op]} ?", [value]
+    elif op == "in":
+        values = [_unquote(v) for v in _split(value.strip("()"))]
+        sql, params = f"{column} IN ({','.join('?' * len(values))})", values
+    elif op == "is":
+        literal = {"null": "NULL", "true": "1", "false": "0"}.get(value.lower())
+        if literal is None:
+            raise QueryError(f"invalid is value: {value}")
+        sql, params = f"{column} IS {literal}", []
+    else:
+        raise QueryError(f"unsupported operator: {op}")
+    return (f"NOT ({sql})", params) if negate else (sql, params)
+
+
+def _condition(expression):
+    # A single filter or a nested and(...)/or(...) tree from a logic parameter
+    for logic in ("and", "or"):
+        if expression.startswith(f"{logic}("):
+            return _logic(logic, expression[len(logic):])
+    column, _, rest = expression.partition(".")
+    return _filter(column, rest)
+
+
+def _logic(logic, group):
+    parts = [_condition(part) for part in _split(group[1:-1])]
+    sql = f" {logic.upper()} ".join(f"({part})" for part, _ in parts)
+    return sql, [param for _, params in parts for param in params]
+
+
+def _where(params):
+    clauses, values = [], []
+    for name, value in params:
+        if name in ("or", "and"):
+            sql, args = _logic(name, value)
+        elif name in RESERVED_PARAMS:
+            continue
+        else:
+            sql, args = _filter(name, value)
+        clauses.append(sql)
+        values.extend(args)
+    return (" WHERE " + " AND ".join(f"({clause})" for clause in clauses) if clauses else ""), values
+
+
+def _order(params):
+    terms = []
+    for name, value in params:
+        if name != "order":
+            continue
+        for term in value.split(","):
+            column, *modifiers = term.split(".")
+            direction = "DESC" if "desc" in modifiers else "ASC"
+            # Postgres' default null order, not SQLite's: last ascending, first descending
+            first = "nullsfirst" in modifiers or ("nullslast" not in modifiers and direction == "DESC")
+            nulls = " NULLS FIRST" if first else " NULLS LAST"
+            terms.append(f"{_identifier(column)} {direction}{nulls}")
+    return " ORDER BY " + ", ".join(terms) if terms else ""
+
+
+def _projection(table, params):
+    # (SQL column list, [(embedded table, columns, foreign key)], foreign keys
+    # selected only to resolve embeds)
+    select = dict(params).get("select", "*")
+    if select == "*":
+        return "*", [], []
+    columns, embeds = [], []
+    for item in _split(select):
+        item = item.strip()
+        name, paren, inner = item.partition("(")
+        if not paren:
+            columns.append(_identifier(item))
+            continue
+        foreign_key = EMBEDS.get((table, name))
+        if foreign_key is None:
+            raise QueryError(f"Could not find a relationship between '{table}' and '{name}'", code="PGRST200")
+        embeds.append((name, [column.strip() for column in inner.rstrip(")").split(",")], foreign_key))
+    hidden = [fk for _, _, fk in embeds if _identifier(fk) not in columns]
+    return ", ".join([*columns, *map(_identifier, hidden)]), embeds, hidden
+
+
+def _embed(connection, rows, embeds, hidden):
+    # One IN query per embedded table, like PostgREST's single join
+    for name, columns, foreign_key in embeds:
+        ids = sorted({row[foreign_key] for row in rows if row[foreign_key] is not None})
+        related = {}
+        if ids:
+            projection = ", ".join(_identifier(column) for column in dict.fromkeys(("id", *columns)))
+            query = f"SELECT {projection} FROM {_identifier(name)} WHERE id IN ({','.join('?' * len(ids))})"
+            related = {row["id"]: {column: row[column] for column in columns} for row in connection.execute(query, ids)}
+        for row in rows:
+            row[name] = related.get(row[foreign_key])
+    for row in rows:
+        for foreign_key in hidden:
+            del row[foreign_key]
+
+
+class Stats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            snapshot = dict(getattr(self, "counters", {}))
+            self.counters = {"queries": 0, "bytes_in": 0, "bytes_out": 0}
+        return snapshot
+
+    def record(self, bytes_in, bytes_out):
+        with self._lock:
+            self.counters["queries"] += 1
+            self.counters["bytes_in"] += bytes_in
+            self.counters["bytes_out"] += bytes_out
+
+
+class StandinServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, db_path, address=("127.0.0.1", 0)):
+        super().__init__(address, _Handler)
+        self.db_path = db_path
+        self.stats = Stats()
+        self._local = threading.local()
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.db_path, isolation_level=None)
+            connection.row_factory = sqlite3.Row
+            self._local.connection = connection
+        return connection
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, name="standin", daemon=True).start()
+        return self
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_HEAD(self):
+        self._dispatch("HEAD")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_PATCH(self):
+        self._dispatch("PATCH")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+    def _dispatch(self, method):
+        url = urlsplit(self.path)
+        params = parse_qsl(url.query, keep_blank_values=True)
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+        if url.path == "/__stats":
+            snapshot = self.server.stats.reset() if dict(params).get("reset") else dict(self.server.stats.counters)
+            return self._send(200, json.dumps(snapshot).encode(), record=False)
+
+        path = url.path.removeprefix("/rest/v1/")
+        prefer = self.headers.get("Prefer", "")
+        try:
+            with self.server.connection() as connection:
+                if path.startswith("rpc/"):
+                    status, data, headers = self._rpc(connection, path[4:], body, params)
+                elif method in ("GET", "HEAD"):
+                    status, data, headers = self._select(connection, path, params, prefer, head=method == "HEAD")
+                elif method == "POST":
+                    status, data, headers = self._insert(connection, path, body, prefer)
+                elif method == "PATCH":
+                    status, data, headers = self._update(connection, path, params, body, prefer)
+                else:
+                    status, data, headers = self._delete(connection, path, params, prefer)
+        except QueryError as e:
+            return self._send(e.status, self._error(str(e), e.code), len(body))
+        except sqlite3.Error as e:
+            status, code = (404, "42P01") if "no such table" in str(e) else (400, "PGRST100")
+            return self._send(status, self._error(str(e), code), len(body))
+
+        payload = b"" if data is None else json.dumps(data, default=str).encode()
+        self._send(status, payload, len(body), headers, head=method == "HEAD")
+
+    def _error(self, message, code):
+        return json.dumps({"message": message, "code": code, "hint": None, "details": None}).encode()
+
+    def _send(self, status, payload, bytes_in=0, headers=None, head=False, record=True):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        if not head:
+            self.wfile.write(payload)
+        if record:
+            self.server.stats.record(bytes_in, 0 if head else len(payload))
+
+    def _select(self, connection, table, params, prefer, head=False):
+        table = _identifier(table)
+        where, values = _where(params)
+        rows = []
+        if not head:
+            projection, embeds, hidden = _projection(table.strip('"'), params)
+            query = f"SELECT {projection} FROM {table}{where}{_order(params)}"
+            options = dict(params)
+            if "limit" in options or "offset" in options:
+                query += f" LIMIT {int(options.get('limit', -1))} OFFSET {int(options.get('offset', 0))}"
+            rows = [dict(row) for row in connection.execute(query, values)]
+            _embed(connection, rows, embeds, hidden)
+            for column in JSON_COLUMNS.get(table.strip('"'), ()):
+                for row in rows:
+                    if isinstance(row.get(column), str):
+                        row[column] = json.loads(row[column])
+        # Like PostgREST, always report the returned range; the total only when asked
+        total = "*"
+        if "count=" in prefer:
+            total = connection.execute(f"SELECT count(*) FROM {table}{where}", values).fetchone()[0]
+        offset = int(dict(params).get("offset", 0))
+        headers = {"Content-Range": f"{offset}-{offset + len(rows) - 1}/{total}" if rows else f"*/{total}"}
+        return 200, rows, headers
+
+    def _insert(self, connection, table, body, prefer):
+        table = _identifier(table)
+        rows = json.loads(body or b"[]")
+        rows = [rows] if isinstance(rows, dict) else rows
+        inserted = []
+        for row in rows:
+            columns = ", ".join(_identifier(column) for column in row)
+            placeholders = ", ".join("?" * len(row))
+            cursor = connection.execute(f"INSERT INTO {table} ({columns}) VALUES ({placeholders}) RETURNING *", list(row.values()))
+            inserted.extend(dict(record) for record in cursor)
+        return 201, None if "return=minimal" in prefer else inserted, {}
+
+    def _update(self, connection, table, params, body, prefer):
+        table = _identifier(table)
+        values = json.loads(body or b"{}")
+        assignments = ", ".join(f"{_identifier(column)} = ?" for column in values)
+        where, args = _where(params)
+        rowids = [row[0] for row in connection.execute(f"UPDATE {table} SET {assignments}{where} RETURNING rowid", [*values.values(), *args])]
+        # Re-read the rows: RETURNING does not see what AFTER triggers (updated_at) wrote
+        marks = ", ".join("?" * len(rowids))
+        rows = [dict(row) for row in connection.execute(f"SELECT * FROM {table} WHERE rowid IN ({marks})", rowids)] if rowids else []
+        return (204, None, {}) if "return=minimal" in prefer else (200, rows, {})
+
+    def _delete(self, connection, table, params, prefer):
+        table = _identifier(table)
+        where, args = _where(params)
+        rows = [dict(row) for row in connection.execute(f"DELETE FROM {table}{where} RETURNING *", args)]
+        return (204, None, {}) if "return=minimal" in prefer else (200, rows, {})
+
+    def _rpc(self, connection, name, body, params):
+        function = RPCS.get(name)
+        if function is None:
+            raise QueryError(f"function {name} does not exist", status=404, code="PGRST202")
+        arguments = json.loads(body) if body else dict(params)
+        return 200, function(connection, arguments), {}
@@ -0,0 +1,2 @@
+# Lets tests import the app's top-level packages (services, dashboards) as the
+# Streamlit entry point does
@@ -1,363 +1,377 @@
 import streamlit as st
-from supabase import create_client, Client
-import os
-from dotenv import load_dotenv
-import pandas as pd
-import plotly.express as px
+from postgrest.exceptions import APIError
+from services.queryCache import select_rows, insert_rows, update_rows, delete_rows
+from services.aggregates import count_rows, project_status_counts
+from services.workers import fetch_all
+from services.instrumentation import fragment, set_page, step
+from services.session import remember_page
+from services.auth import hash_password, change_password, throttled, client_address
+from services.assets import use_stylesheets
+from services.logTail import shared_tail
+from services.frames import arrow_table, frame
+from services.notifications import announce
+from dashboards.notificationPanel import audience_picker
+from dashboards.paginatedTable import render as render_paginated_table
+from dashboards.editForm import render as render_edit_form
+from dashboards.reportPanel import render as render_report_panel
+from dashboards.statusTrendPanel import render as render_status_trend
+from datetime import timedelta
 
-# Load environment variables
-load_dotenv()
+# pandas, plotly and the bulk import helpers are imported by the pages that use them
 
-class Config:
-    # Common configuration
-    SECRET_KEY = os.getenv('SECRET_KEY', 'default-secret-key')
-    SUPABASE_URL = os.getenv('SUPABASE_URL')
-    SUPABASE_KEY = os.getenv('SUPABASE_KEY')
+def _live_tail_panel(tail):
+    try:
+        tail.poll()
+    except APIError as e:
+        st.error(f"Failed to fetch {tail.table}: {e.message}")
+        return
+    # The tail is shared, so "new" is counted against this session's own cursor
+    cursors = st.session_state.setdefault("tail_cursors", {})
+    view = (tail.table, tail.columns, tail.filters)
+    new_rows = tail.appended - cursors.get(view, tail.appended - len(tail.rows))
+    cursors[view] = tail.appended
+    st.caption(f"{len(tail.rows)} rows buffered, {new_rows} new, last id {tail.last_id}")
+    with step(f"{tail.table} tail dataframe"):
+        st.dataframe(arrow_table(tail.snapshot(), tail.columns.split(",")), hide_index=True)
 
-# Initialize Supabase client
-supabase: Client = create_client(Config.SUPABASE_URL, Config.SUPABASE_KEY)
+def render_live_tail(tail, run_every=None):
+    # Only this panel re-runs on the refresh interval, not the whole page
+    fragment(_live_tail_panel, run_every=run_every)(tail)
 
-def render():
-    st.markdown("""
-        <style>
-            @import url('https://fonts.googleapis.com/css2?family=Poppins:wght@300;400;500;600;700&display=swap');
-            body {
-                background: linear-gradient(135deg, #6a11cb, #2575fc);
-                color: #ffffff;
-                font-family: 'Poppins', sans-serif;
-                margin: 0;
-                padding: 0;
-            }
-            .stButton>button {
-                background: linear-gradient(135deg, #6a11cb, #2575fc);
-                color: white;
-                font-family: 'Poppins', sans-serif;
-                font-size: 16px;
-                font-weight: 500;
-                border-radius: 8px;
-                padding: 10px 24px;
-                border: none;
-                transition: all 0.3s ease;
-                box-shadow: 0px 4px 10px rgba(106, 17, 203, 0.3);
-                display: block;
-                margin: 10px auto;
-            }
-            .stButton>button:hover {
-                background: linear-gradient(135deg, #2575fc, #6a11cb);
-                transform: translateY(-2px);
-                box-shadow: 0px 6px 15px rgba(106, 17, 203, 0.5);
-            }
-            .stSelectbox>div>div {
-                background-color: rgba(255, 255, 255, 0.05);
-                color: #f4f4f8;
-                border: 1px solid rgba(255, 255, 255, 0.1);
-                border-radius: 8px;
-            }
-            .stTextInput>div>div>input {
-                background-color: rgba(255, 255, 255, 0.05);
-                color: #ffffff !important;
-                border: 1px solid rgba(255, 255, 255, 0.1);
-                border-radius: 8px;
-                padding: 8px 12px;
-                font-family: 'Poppins', sans-serif;
-            }
-            h1, h2, h3 {
-                color: #ffdd55; /* Gold accent color for headings */
-            }
-            .metric-container {
-                text-align: center;
-            }
-            .metric-container div {
-                color: #ffffff;
-                font-size: 18px;
-                font-weight: bold;
-            }
-        </style>
-    """, unsafe_allow_html=True)
+ROLES = ["Student", "Faculty", "Admin"]
 
-    st.sidebar.title("ADMIN")
-    options = ["Dashboard", "User Management", "Team Management", "Project Tracking", "Analytics and Reports", "Notifications", "Logs and Activity", "Settings"]
-    choice = st.sidebar.radio("", options)
+# Inputs of the edit forms; widget keys carry the record version (dashboards/editForm.py)
+def _user_fields(user, prefix):
+    return {
+        "name": st.text_input("Full Name", value=user['name'], key=f"{prefix}_name"),
+        "email": st.text_input("Email", value=user['email'], key=f"{prefix}_email"),
+        "role": st.selectbox("Role", ROLES, index=ROLES.index(user['role']), key=f"{prefix}_role"),
+    }
 
-    
+def _profile_fields(user, prefix):
+    return {
+        "name": st.text_input("Full Name", value=user['name'], key=f"{prefix}_name"),
+        "email": st.text_input("Email", value=user['email'], key=f"{prefix}_email"),
+    }
 
-    if choice == "Dashboard":
-        st.title("Admin Dashboard")
-        st.subheader("Overview")
+def _team_fields(team, prefix):
+    return {
+        "name": st.text_input("Team Name", value=team['name'], key=f"{prefix}_name"),
+        "mentor_id": st.number_input("Mentor ID", value=team['mentor_id'], min_value=1, step=1, key=f"{prefix}_mentor_id"),
+    }
 
-        # Fetch data from Supabase
-        users_response = supabase.table('users').select('*').execute()
-        projects_response = supabase.table('projects').select('*').execute()
-        approvals_response = supabase.table('approvals').select('*').execute()
+def _dashboard():
+    st.title("Admin Dashboard")
+    st.subheader("Overview")
 
-        total_users = len(users_response.data)
-        active_projects = len([project for project in projects_response.data if project['status'] == 'In Progress'])
-        pending_approvals = len([approval for approval in approvals_response.data if approval['status'] == 'Pending'])
+    # Counted in the database (served from the shared query cache when fresh),
+    # with the independent queries issued concurrently
+    with step("overview queries"):
+        overview = fetch_all(
+            total_users=lambda: count_rows('users'),
+            active_projects=lambda: count_rows('projects', [('status', 'eq', 'In Progress')]),
+            pending_approvals=lambda: count_rows('approvals', [('status', 'eq', 'Pending')]),
+            status_counts=project_status_counts,
+        )
+    total_users = overview['total_users']
+    active_projects = overview['active_projects']
+    pending_approvals = overview['pending_approvals']
 
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            st.metric(label="Total Users", value=total_users)
-        with col2:
-            st.metric(label="Active Projects", value=active_projects)
-        with col3:
-            st.metric(label="Pending Approvals", value=pending_approvals)
-
-        # Example graph
-        st.subheader("Project Status Distribution")
-        project_status_counts = pd.DataFrame(projects_response.data)['status'].value_counts().reset_index()
-        project_status_counts.columns = ['Status', 'Count']
-        fig = px.pie(project_status_counts, values='Count', names='Status', title='Project Status Distribution')
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric(label="Total Users", value=total_users)
+    with col2:
+        st.metric(label="Active Projects", value=active_projects)
+    with col3:
+        st.metric(label="Pending Approvals", value=pending_approvals)
+
+    # Example graph
+    st.subheader("Project Status Distribution")
+    with step("status chart"):
+        import plotly.express as px
+        status_counts = frame(overview['status_counts'], ['status', 'count'])
+        status_counts.columns = ['Status', 'Count']
+        fig = px.pie(status_counts, values='Count', names='Status', title='Project Status Distribution')
         st.plotly_chart(fig)
 
-    elif choice == "User Management":
-        st.subheader("User Management")
-        user_action = st.selectbox("Action", ["Add User", "Edit User", "Remove User", "View Users"], key="user_action_selectbox")
-        
-        if user_action == "Add User":
-            role = st.selectbox("Role", ["Student", "Faculty", "Admin"], key="add_user_role")
-            name = st.text_input("Full Name", key="add_user_name")
-            username = st.text_input("Username", key="add_user_username")
-            email = st.text_input("Email", key="add_user_email")
-            password = st.text_input("Password", type="password", key="add_user_password")
-            if st.button("Add User", key="add_user_button"):
-                response = supabase.table('users').insert({
+    st.subheader("Project Status Trends")
+    render_status_trend("admin_status_trend")
+
+def _user_management():
+    st.subheader("User Management")
+    user_action = st.selectbox("Action", ["Add User", "Bulk Import", "Edit User", "Remove User", "View Users"], key="user_action_selectbox")
+
+    if user_action == "Add User":
+        role = st.selectbox("Role", ["Student", "Faculty", "Admin"], key="add_user_role")
+        name = st.text_input("Full Name", key="add_user_name")
+        username = st.text_input("Username", key="add_user_username")
+        email = st.text_input("Email", key="add_user_email")
+        password = st.text_input("Password", type="password", key="add_user_password")
+        if st.button("Add User", key="add_user_button"):
+            try:
+                insert_rows('users', {
                     "role": role,
                     "name": name,
                     "username": username,
                     "email": email,
-                    "password": password
-                }).execute()
-                if response.status_code == 201:
-                    st.success(f"User {username} added successfully.")
-                else:
-                    st.error("Failed to add user.")
-        
-        elif user_action == "Edit User":
-            username = st.text_input("Username of the user to edit", key="edit_user_username")
-            if st.button("Fetch User", key="fetch_user_button"):
-                response = supabase.table('users').select('*').eq('username', username).execute()
-                if response.data:
-                    user = response.data[0]
-                    name = st.text_input("Full Name", value=user['name'], key="edit_user_name")
-                    email = st.text_input("Email", value=user['email'], key="edit_user_email")
-                    role = st.selectbox("Role", ["Student", "Faculty", "Admin"], index=["Student", "Faculty", "Admin"].index(user['role']), key="edit_user_role")
-                    if st.button("Update User", key="update_user_button"):
-                        response = supabase.table('users').update({
-                            "name": name,
-                            "email": email,
-                            "role": role
-                        }).eq('username', username).execute()
-                        if response.status_code == 200:
-                            st.success(f"User {username} updated successfully.")
-                        else:
-                            st.error("Failed to update user.")
-                else:
-                    st.error("User not found.")
-        
-        elif user_action == "Remove User":
-            username = st.text_input("Username of the user to remove", key="remove_user_username")
-            if st.button("Remove User", key="remove_user_button"):
-                response = supabase.table('users').delete().eq('username', username).execute()
-                if response.status_code == 200:
-                    st.success(f"User {username} removed successfully.")
-                else:
-                    st.error("Failed to remove user.")
-        
-        elif user_action == "View Users":
-            response = supabase.table('users').select('*').execute()
-            users = response.data
-            df = pd.DataFrame(users)
-            st.dataframe(df)
-
-    elif choice == "Team Management":
-        st.subheader("Team Management")
-        team_action = st.selectbox("Action", ["View Teams", "Approve Team", "Modify Team"], key="team_action_selectbox")
-        
-        if team_action == "View Teams":
-            response = supabase.table('teams').select('*').execute()
-            teams = response.data
-            df = pd.DataFrame(teams)
-            st.dataframe(df)
-        
-        elif team_action == "Approve Team":
-            team_id = st.text_input("Team ID to approve", key="approve_team_id")
-            if st.button("Approve Team", key="approve_team_button"):
-                response = supabase.table('teams').update({"status": "Approved"}).eq("id", team_id).execute()
-                if response.status_code == 200:
-                    st.success(f"Team {team_id} approved successfully.")
-                else:
-                    st.error("Failed to approve team.")
-        
-        elif team_action == "Modify Team":
-            team_id = st.text_input("Team ID to modify", key="modify_team_id")
-            if st.button("Fetch Team", key="fetch_team_button"):
-                response = supabase.table('teams').select('*').eq('id', team_id).execute()
-                if response.data:
-                    team = response.data[0]
-                    team_name = st.text_input("Team Name", value=team['name'], key="modify_team_name")
-                    mentor_id = st.text_input("Mentor ID", value=team['mentor_id'], key="modify_team_mentor_id")
-                    if st.button("Update Team", key="update_team_button"):
-                        response = supabase.table('teams').update({
-                            "name": team_name,
-                            "mentor_id": mentor_id
-                        }).eq('id', team_id).execute()
-                        if response.status_code == 200:
-                            st.success(f"Team {team_id} updated successfully.")
-                        else:
-                            st.error("Failed to update team.")
-                else:
-                    st.error("Team not found.")
-
-    elif choice == "Project Tracking":
-        st.subheader("Project Tracking")
-        project_action = st.selectbox("Action", ["View Projects", "Update Project Status"], key="project_action_selectbox")
-        
-        if project_action == "View Projects":
-            response = supabase.table('projects').select('*').execute()
-            projects = response.data
-            df = pd.DataFrame(projects)
-            st.dataframe(df)
-        
-        elif project_action == "Update Project Status":
-            project_id = st.text_input("Project ID to update", key="update_project_id")
-            new_status = st.selectbox("New Status", ["Initiated", "In Progress", "Completed"], key="update_project_status")
-            if st.button("Update Status", key="update_project_button"):
-                response = supabase.table('projects').update({"status": new_status}).eq("id", project_id).execute()
-                if response.status_code == 200:
-                    st.success(f"Project {project_id} status updated to {new_status}.")
-                else:
-                    st.error("Failed to update project status.")
-
-        elif choice == "Analytics and Reports":
-            st.subheader("Analytics and Reports")
-
-            report_action = st.selectbox("Select Report Type", ["Monthly Report", "Yearly Report", "Custom Report"], key="report_action_selectbox")
-
-            if report_action == "Monthly Report":
-                month = st.selectbox("Select Month", ["January", "February", "March", "April", "May", "June", "July", "August", "September", "October", "November", "December"], key="month_selectbox")
-                year = st.number_input("Select Year", min_value=2000, max_value=2100, value=2023, step=1, key="year_input")
-                if st.button("Download Monthly Report", key="download_monthly_report_button"):
-                    st.success(f"Monthly report for {month} {year} is being generated...")
-
-            elif report_action == "Yearly Report":
-                year = st.number_input("Select Year", min_value=2000, max_value=2100, value=2023, step=1, key="yearly_year_input")
-                if st.button("Download Yearly Report", key="download_yearly_report_button"):
-                    st.success(f"Yearly report for {year} is being generated...")
-
-            elif report_action == "Custom Report":
-                start_date = st.date_input("Start Date", key="start_date_input")
-                end_date = st.date_input("End Date", key="end_date_input")
-                if st.button("Download Custom Report", key="download_custom_report_button"):
-                    st.success(f"Custom report from {start_date} to {end_date} is being generated...")
-
-    elif choice == "Notifications":
-        st.subheader("Notifications")
-        notification_action = st.selectbox("Action", ["Send Announcement", "Manage Deadlines"], key="notification_action_selectbox")
-        
-        if notification_action == "Send Announcement":
-            announcement = st.text_area("Announcement", key="announcement_text")
-            if st.button("Send Announcement", key="send_announcement_button"):
-                response = supabase.table('notifications').insert({
-                    "message": announcement,
-                    "type": "announcement"
-                }).execute()
-                if response.status_code == 201:
-                    st.success("Announcement sent successfully.")
-                else:
-                    st.error("Failed to send announcement.")
-        
-        elif notification_action == "Manage Deadlines":
-            deadline_name = st.text_input("Deadline Name", key="deadline_name")
-            deadline_date = st.date_input("Deadline Date", key="deadline_date")
-            if st.button("Set Deadline", key="set_deadline_button"):
-                response = supabase.table('notifications').insert({
-                    "message": f"Deadline for {deadline_name} is {deadline_date}",
-                    "type": "deadline"
-                }).execute()
-                if response.status_code == 201:
-                    st.success("Deadline set successfully.")
-                else:
-                    st.error("Failed to set deadline.")
+                    "password": hash_password(password)
+                })
+                st.success(f"User {username} added successfully.")
+            except APIError:
+                st.error("Failed to add user.")
 
-        elif choice == "Logs and Activity":
-            st.subheader("Logs and Activity")
+    elif user_action == "Bulk Import":
+        from services.userImport import read_user_file, validate_users, import_users
+        st.caption("CSV or XLSX with columns: role, name, username, email, password")
+        uploaded_file = st.file_uploader("User file", type=["csv", "xlsx"], key="bulk_import_file")
+        batch_size = st.number_input("Batch size", min_value=50, max_value=1000, value=500, step=50, key="bulk_import_batch_size")
+        if uploaded_file:
+            try:
+                users = validate_users(read_user_file(uploaded_file))
+            except ValueError as e:
+                st.error(str(e))
+                users = None
+            if users is not None:
+                invalid = users[users['error'] != ""]
+                valid = users[users['error'] == ""]
+                st.write(f"{len(valid)} valid rows, {len(invalid)} rows with errors.")
+                if not invalid.empty:
+                    st.dataframe(invalid.drop(columns=['password']))
+                if st.button(f"Import {len(valid)} Users", key="bulk_import_button", disabled=valid.empty):
+                    progress_bar = st.progress(0.0)
+                    report = import_users(valid, batch_size=int(batch_size), progress=progress_bar.progress)
+                    inserted = (report['status'] == "inserted").sum()
+                    st.success(f"Imported {inserted} of {len(valid)} users.")
+                    # Render the new students' profile QR codes now rather than on their first visit
+                    from services.qrCodes import pregenerate, profile_url
+                    students = report[(report['status'] == "inserted") & (valid['role'] == "Student")]['username']
+                    if not students.empty:
+                        with st.spinner("Generating profile QR codes..."):
+                            rendered = pregenerate(profile_url(username) for username in students)
+                        st.caption(f"Generated {rendered} profile QR code(s).")
+                    failed = report[report['status'] != "inserted"]
+                    if not failed.empty:
+                        st.error(f"{len(failed)} rows failed.")
+                        st.dataframe(failed)
 
-            log_action = st.selectbox("Select Log Type", ["View Logs", "View Activity"], key="log_action_selectbox")
+    elif user_action == "Edit User":
+        render_edit_form("edit_user", 'users', "id,username,name,email,role", ('username', "Username of the user to edit"), _user_fields, "User")
 
-            if log_action == "View Logs":
-                response = supabase.table('logs').select('*').execute()
-                if response.error:
-                    st.error(f"Failed to fetch logs: {response.error['message']}")
-                else:
-                    logs = response.data
-                    df = pd.DataFrame(logs)
-                    st.dataframe(df)
-
-            elif log_action == "View Activity":
-                response = supabase.table('activity').select('*').execute()
-                if response.error:
-                    st.error(f"Failed to fetch activity: {response.error['message']}")
+    elif user_action == "Remove User":
+        username = st.text_input("Username of the user to remove", key="remove_user_username")
+        if st.button("Remove User", key="remove_user_button"):
+            try:
+                delete_rows('users', [('username', 'eq', username)])
+                st.success(f"User {username} removed successfully.")
+            except APIError:
+                st.error("Failed to remove user.")
+
+    elif user_action == "View Users":
+        render_paginated_table(
+            'users', ('id', 'name', 'username', 'email', 'role'), key="view_users",
+            sortable=('id', 'name', 'username', 'role'),
+            filterable={'username': 'ilike', 'name': 'ilike', 'email': 'ilike', 'role': 'eq'},
+        )
+
+def _team_management():
+    st.subheader("Team Management")
+    team_action = st.selectbox("Action", ["View Teams", "Approve Team", "Modify Team"], key="team_action_selectbox")
+
+    if team_action == "View Teams":
+        render_paginated_table(
+            'teams', ('id', 'name', 'mentor_id', 'status'), key="view_teams",
+            sortable=('id', 'name', 'status'),
+            filterable={'name': 'ilike', 'status': 'eq', 'mentor_id': 'eq'},
+        )
+
+    elif team_action == "Approve Team":
+        pending_teams = {team['id']: team['name'] for team in select_rows('teams', 'id,name', [('status', 'neq', 'Approved')], order='id')}
+        team_ids = st.multiselect("Teams to approve", list(pending_teams), format_func=lambda team_id: f"{team_id} - {pending_teams[team_id]}", key="approve_team_ids")
+        if st.button("Approve Teams", key="approve_team_button", disabled=not team_ids):
+            # One filtered update, applied atomically; only rows that actually change are returned
+            try:
+                changed = update_rows('teams', {"status": "Approved"}, [("id", "in_", tuple(team_ids)), ("status", "neq", "Approved")])
+                changed_ids = sorted(team['id'] for team in changed)
+                st.success(f"Approved {len(changed_ids)} team(s): {', '.join(map(str, changed_ids))}")
+                unchanged = sorted(set(team_ids) - set(changed_ids))
+                if unchanged:
+                    st.warning(f"Not changed (already approved or removed): {', '.join(map(str, unchanged))}")
+            except APIError:
+                st.error("Failed to approve teams.")
+
+    elif team_action == "Modify Team":
+        render_edit_form("modify_team", 'teams', "id,name,mentor_id", ('id', "Team ID to modify"), _team_fields, "Team")
+
+def _project_tracking():
+    st.subheader("Project Tracking")
+    project_action = st.selectbox("Action", ["View Projects", "Update Project Status"], key="project_action_selectbox")
+
+    if project_action == "View Projects":
+        render_paginated_table(
+            'projects', ('id', 'title', 'team_id', 'status'), key="view_projects",
+            sortable=('id', 'title', 'status'),
+            filterable={'title': 'ilike', 'status': 'eq', 'team_id': 'eq'},
+        )
+
+    elif project_action == "Update Project Status":
+        current_status = st.selectbox("Current Status", ["Initiated", "In Progress", "Completed"], key="update_project_current_status")
+        candidates = {project['id']: project['title'] for project in select_rows('projects', 'id,title', [('status', 'eq', current_status)], order='id')}
+        project_ids = st.multiselect("Projects to update", list(candidates), format_func=lambda project_id: f"{project_id} - {candidates[project_id]}", key="update_project_ids")
+        new_status = st.selectbox("New Status", ["Initiated", "In Progress", "Completed"], key="update_project_status")
+        if st.button("Update Status", key="update_project_button", disabled=not project_ids):
+            # One filtered update, applied atomically; only rows that actually change are returned
+            try:
+                changed = update_rows('projects', {"status": new_status}, [("id", "in_", tuple(project_ids)), ("status", "neq", new_status)])
+                changed_ids = sorted(project['id'] for project in changed)
+                st.success(f"Updated {len(changed_ids)} project(s) to {new_status}: {', '.join(map(str, changed_ids))}")
+                unchanged = sorted(set(project_ids) - set(changed_ids))
+                if unchanged:
+                    st.warning(f"Not changed (already {new_status} or removed): {', '.join(map(str, unchanged))}")
+            except APIError:
+                st.error("Failed to update project status.")
+
+def _analytics():
+    st.subheader("Analytics and Reports")
+    render_report_panel("admin_report")
+
+def _notifications():
+    st.subheader("Notifications")
+    notification_action = st.selectbox("Action", ["Send Announcement", "Manage Deadlines"], key="notification_action_selectbox")
+
+    if notification_action == "Send Announcement":
+        announcement = st.text_area("Announcement", key="announcement_text")
+        audience = audience_picker("announcement")
+        if st.button("Send Announcement", key="send_announcement_button", disabled=audience is None):
+            role, team_id = audience
+            try:
+                recipients = announce(announcement, "announcement", role=role, team_id=team_id)
+                st.success(f"Announcement sent successfully to {recipients} user(s).")
+            except APIError:
+                st.error("Failed to send announcement.")
+
+    elif notification_action == "Manage Deadlines":
+        deadline_name = st.text_input("Deadline Name", key="deadline_name")
+        deadline_date = st.date_input("Deadline Date", key="deadline_date")
+        audience = audience_picker("deadline")
+        if st.button("Set Deadline", key="set_deadline_button", disabled=audience is None):
+            role, team_id = audience
+            try:
+                recipients = announce(f"Deadline for {deadline_name} is {deadline_date}", "deadline", role=role, team_id=team_id)
+                st.success(f"Deadline set successfully for {recipients} user(s).")
+            except APIError:
+                st.error("Failed to set deadline.")
+
+def _logs():
+    st.subheader("Logs and Activity")
+
+    log_action = st.selectbox("Select Log Type", ["View Logs", "View Activity", "Live Tail"], key="log_action_selectbox")
+
+    if log_action == "View Logs":
+        render_paginated_table(
+            'logs', ('id', 'created_at', 'level', 'user_id', 'message'), key="view_logs",
+            sortable=('created_at', 'id'), default_desc=True,
+            filterable={'level': 'eq', 'user_id': 'eq', 'message': 'ilike'},
+        )
+
+    elif log_action == "View Activity":
+        render_paginated_table(
+            'activity', ('id', 'created_at', 'user_id', 'action'), key="view_activity",
+            sortable=('created_at', 'id'), default_desc=True,
+            filterable={'user_id': 'eq', 'action': 'ilike'},
+        )
+
+    elif log_action == "Live Tail":
+        source = st.selectbox("Source", ["logs", "activity"], key="tail_source")
+        col1, col2 = st.columns(2)
+        with col1:
+            levels = st.multiselect("Level", ["INFO", "WARNING", "ERROR"], key="tail_levels") if source == "logs" else []
+            user_id = st.text_input("User ID", key="tail_user_id").strip()
+        with col2:
+            since = st.date_input("From", value=None, key="tail_since")
+            until = st.date_input("To", value=None, key="tail_until")
+        interval = st.select_slider("Refresh every (seconds)", [2, 5, 10, 30, 60], value=5, key="tail_interval")
+        paused = st.toggle("Pause", key="tail_paused")
+
+        filters = []
+        if levels:
+            filters.append(('level', 'in_', tuple(levels)))
+        if user_id:
+            filters.append(('user_id', 'eq', user_id))
+        if since:
+            filters.append(('created_at', 'gte', since.isoformat()))
+        if until:
+            filters.append(('created_at', 'lt', (until + timedelta(days=1)).isoformat()))
+
+        # Shared by every session watching the same source and filters
+        columns = ('created_at', 'level', 'user_id', 'message') if source == "logs" else ('created_at', 'user_id', 'action')
+        tail = shared_tail(source, columns, tuple(filters))
+        render_live_tail(tail, run_every=None if paused else interval)
+
+def _settings():
+    st.subheader("Settings")
+
+    settings_action = st.selectbox("Select Setting", ["Change Password", "Update Profile", "Manage Roles"], key="settings_action_selectbox")
+
+    if settings_action == "Change Password":
+        st.subheader("Change Password")
+        username = st.text_input("Username", key="change_password_username")
+        old_password = st.text_input("Old Password", type="password", key="old_password")
+        new_password = st.text_input("New Password", type="password", key="new_password")
+        confirm_password = st.text_input("Confirm New Password", type="password", key="confirm_password")
+        if st.button("Change Password", key="change_password_button"):
+            if new_password == confirm_password:
+                client = client_address()
+                if throttled(username, client):
+                    st.error("Too many failed attempts. Please wait a few minutes and try again.")
                 else:
-                    activity = response.data
-                    df = pd.DataFrame(activity)
-                    st.dataframe(df)
-        elif choice == "Settings":
-            st.subheader("Settings")
-
-            settings_action = st.selectbox("Select Setting", ["Change Password", "Update Profile", "Manage Roles"], key="settings_action_selectbox")
-
-            if settings_action == "Change Password":
-                st.subheader("Change Password")
-                username = st.text_input("Username", key="change_password_username")
-                old_password = st.text_input("Old Password", type="password", key="old_password")
-                new_password = st.text_input("New Password", type="password", key="new_password")
-                confirm_password = st.text_input("Confirm New Password", type="password", key="confirm_password")
-                if st.button("Change Password", key="change_password_button"):
-                    if new_password == confirm_password:
-                        response = supabase.table('users').select('*').eq('username', username).eq('password', old_password).execute()
-                        if response.data:
-                            user_id = response.data[0]['id']
-                            update_response = supabase.table('users').update({"password": new_password}).eq('id', user_id).execute()
-                            if update_response.status_code == 200:
-                                st.success("Password changed successfully.")
-                            else:
-                                st.error("Failed to change password.")
+                    # Old password verified against the stored hash; only the new hash is written
+                    try:
+                        if change_password(username, old_password, new_password, client):
+                            st.success("Password changed successfully.")
                         else:
                             st.error("Incorrect username or old password.")
-                    else:
-                        st.error("New passwords do not match.")
-
-            elif settings_action == "Update Profile":
-                st.subheader("Update Profile")
-                username = st.text_input("Username", key="update_profile_username")
-                if st.button("Fetch Profile", key="fetch_profile_button"):
-                    response = supabase.table('users').select('*').eq('username', username).execute()
-                    if response.data:
-                        user = response.data[0]
-                        name = st.text_input("Full Name", value=user['name'], key="update_profile_name")
-                        email = st.text_input("Email", value=user['email'], key="update_profile_email")
-                        if st.button("Update Profile", key="update_profile_button"):
-                            update_response = supabase.table('users').update({
-                            "name": name,
-                            "email": email
-                        }).eq('username', username).execute()
-                            if update_response.status_code == 200:
-                                st.success("Profile updated successfully.")
-                            else:
-                                st.error("Failed to update profile.")
-                    else:
-                        st.error("User not found.")
-
-            elif settings_action == "Manage Roles":
-                st.subheader("Manage Roles")
-                username = st.text_input("Username", key="manage_roles_username")
-                new_role = st.selectbox("New Role", ["Student", "Faculty", "Admin"], key="manage_roles_new_role")
-                if st.button("Update Role", key="update_role_button"):
-                    response = supabase.table('users').update({"role": new_role}).eq('username', username).execute()
-                    if response.status_code == 200:
-                        st.success(f"Role for {username} updated to {new_role}.")
-                    else:
-                        st.error("Failed to update role.")
+                    except APIError:
+                        st.error("Failed to change password.")
+            else:
+                st.error("New passwords do not match.")
+
+    elif settings_action == "Update Profile":
+        st.subheader("Update Profile")
+        render_edit_form("update_profile", 'users', "id,username,name,email", ('username', "Username"), _profile_fields, "Profile")
+
+    elif settings_action == "Manage Roles":
+        st.subheader("Manage Roles")
+        username = st.text_input("Username", key="manage_roles_username")
+        new_role = st.selectbox("New Role", ["Student", "Faculty", "Admin"], key="manage_roles_new_role")
+        if st.button("Update Role", key="update_role_button"):
+            try:
+                update_rows('users', {"role": new_role}, [('username', 'eq', username)])
+                st.success(f"Role for {username} updated to {new_role}.")
+            except APIError:
+                st.error("Failed to update role.")
+
+PAGES = {
+    "Dashboard": _dashboard,
+    "User Management": _user_management,
+    "Team Management": _team_management,
+    "Project Tracking": _project_tracking,
+    "Analytics and Reports": _analytics,
+    "Notifications": _notifications,
+    "Logs and Activity": _logs,
+    "Settings": _settings,
+}
+
+def render():
+    use_stylesheets("admin")
+
+    st.sidebar.title("ADMIN")
+    options = list(PAGES)
+    choice = st.sidebar.radio("", options, key="nav_page")
+    set_page(f"Admin/{choice}")
+    remember_page(choice)
+
+    # Widgets inside a page re-run only that page; switching pages re-runs the app
+    fragment(PAGES[choice])()
 
 if __name__ == "__main__":
     render()
\ No newline at end of file
@@ -0,0 +1,50 @@
+import streamlit as st
+from postgrest.exceptions import APIError
+from services.instrumentation import fragment, step
+from services.chat import PAGE_SIZE
+
+POLL_SECONDS = 5
+
+
+def _older_messages(conversation, window, window_has_older, key):
+    # Messages before the shared window that this session asked for. They live in
+    # session state, so one viewer loading history does not grow everyone's window.
+    conversation_id = (conversation.table, conversation.key)
+    state = st.session_state.get(f"{key}_history")
+    if state is None or state["conversation"] != conversation_id:
+        state = st.session_state[f"{key}_history"] = {"conversation": conversation_id, "rows": [], "has_older": True, "window_start": None}
+    rows = state["rows"]
+    if rows and window and window[0]["id"] != state["window_start"]:
+        # The shared window moved on; fetch what dropped out of it since
+        rows.extend(conversation.between(rows[-1]["id"], window[0]["id"]))
+        state["window_start"] = window[0]["id"]
+    if (state["has_older"] if rows else window_has_older) and st.button("Load older messages", key=f"{key}_older"):
+        page = conversation.older((rows or window)[0]["id"])
+        if not rows:
+            state["window_start"] = window[0]["id"]
+        rows[:0] = page
+        state["has_older"] = len(page) == PAGE_SIZE
+    return [row for row in rows if not window or row["id"] < window[0]["id"]]
+
+
+def _history(conversation, user_id, names, key):
+    try:
+        conversation.poll()
+        window, window_has_older = conversation.snapshot()
+        messages = _older_messages(conversation, window, window_has_older, key) + window
+    except APIError as e:
+        st.error(f"Failed to load messages: {e.message}")
+        return
+    with step("chat history"):
+        for message in messages:
+            mine = message["sender_id"] == user_id
+            sender = "You" if mine else names.get(message["sender_id"], f"User {message['sender_id']}")
+            with st.chat_message("user" if mine else "assistant"):
+                st.caption(f"{sender} · {message['created_at']}")
+                st.text(message["body"])
+
+
+def render(conversation, user_id, names, key):
+    # History panel that polls for new messages without re-running the page
+    st.subheader("Chat History")
+    fragment(_history, run_every=POLL_SECONDS)(conversation, user_id, names, key)
@@ -0,0 +1,74 @@
+import streamlit as st
+from postgrest.exceptions import APIError
+from services.records import changed_fields, fetch_record, update_record
+
+
+def _notice(key, level, message):
+    # Re-runs the page fragment so the form shows the stored record; the
+    # message is displayed on that rerun
+    st.session_state[f"{key}_notice"] = (level, message)
+    st.rerun(scope="fragment")
+
+
+def render(key, table, columns, lookup, fields, noun):
+    # Fetch-then-edit flow for one row. lookup is (column, label) of the field
+    # the row is found by; fields(record, prefix) draws the form inputs and
+    # returns {column: value}. The fetched record is kept in session state, so
+    # typing in the form neither re-runs the page nor re-fetches the row, and
+    # submitting writes only the columns that changed, in a single update.
+    state_key = f"{key}_record"
+    lookup_column, lookup_label = lookup
+
+    with st.form(f"{key}_lookup"):
+        value = st.text_input(lookup_label, key=f"{key}_lookup_value").strip()
+        if st.form_submit_button(f"Fetch {noun}"):
+            try:
+                st.session_state[state_key] = fetch_record(table, columns, [(lookup_column, value)])
+            except APIError:
+                st.session_state[state_key] = None
+            if st.session_state[state_key] is None:
+                st.error(f"{noun} not found.")
+
+    notice = st.session_state.pop(f"{key}_notice", None)
+    if notice:
+        getattr(st, notice[0])(notice[1])
+
+    record = st.session_state.get(state_key)
+    if record is None:
+        return
+
+    # Widget keys include the row version, so the inputs reset to the stored
+    # values whenever the record is reloaded
+    prefix = f"{key}_{record['id']}_{record['updated_at']}"
+    with st.form(f"{key}_edit"):
+        st.caption(f"Editing {noun.lower()} {record[lookup_column]}")
+        values = fields(record, prefix)
+        submitted = st.form_submit_button(f"Update {noun}")
+    if not submitted:
+        return
+
+    changes = changed_fields(record, values)
+    if not changes:
+        st.info("Nothing to update.")
+        return
+    try:
+        updated = update_record(table, record, changes)
+    except APIError:
+        st.error(f"Failed to update {noun.lower()}.")
+        return
+
+    if updated is not None:
+        st.session_state[state_key] = updated
+        _notice(key, "success", f"{noun} {record[lookup_column]} updated: {', '.join(changes)}.")
+        return
+
+    # Someone else saved first: load their version instead of overwriting it
+    try:
+        st.session_state[state_key] = fetch_record(table, columns, [("id", record["id"])])
+    except APIError:
+        st.session_state[state_key] = None
+    if st.session_state[state_key] is None:
+        _notice(key, "error", f"{noun} {record[lookup_column]} was removed by someone else.")
+    else:
+        _notice(key, "warning", f"{noun} {record[lookup_column]} was changed by someone else after you fetched it. "
+                                "The form now shows the current values; review them and submit again.")
@@ -1,240 +1,255 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
+from services.instrumentation import fragment, set_page, step
+from services.assets import use_stylesheets
+from services.session import current_user, remember_page
+from services.queryCache import insert_rows
+from services.facultyData import mentor_overview, assigned_projects, mentees, recent_submissions
+from services.frames import arrow_table, frame
+from services.chat import direct_conversation, team_conversation, send_direct, send_team
+from services.notifications import announce, inbox
+from dashboards.chatPanel import render as render_chat
+from dashboards.notificationPanel import render_badge, render_inbox
+from dashboards.reportPanel import render as render_report_panel
+from dashboards.statusTrendPanel import render as render_status_trend
+from postgrest.exceptions import APIError
+
+def _overview(user):
+    # The mentor's teams, projects, members, submissions and grades in one request;
+    # cached per mentor, so page fragments re-read it without another query
+    if user is None:
+        return []
+    try:
+        return mentor_overview(user['id'])
+    except APIError as e:
+        st.error(f"Failed to load your teams: {e.message}")
+        return []
+
+def _team_picker(overview, key):
+    # Only the teams this faculty member mentors can be picked
+    teams = {team['team_id']: team for team in overview}
+    return st.selectbox("Team", list(teams), format_func=lambda team_id: f"{team_id} - {teams[team_id]['team_name']}", key=key)
+
+def _dashboard(user):
+    st.title("Faculty Dashboard")
+    st.subheader("Overview")
+    overview = _overview(user)
+
+    projects = assigned_projects(overview)
+
+    # Assigned Teams
+    st.subheader("Assigned Teams")
+    if projects:
+        st.dataframe(arrow_table(projects, ['team_id', 'team_name', 'project_id', 'title', 'status']), hide_index=True)
+    else:
+        st.info("No teams assigned yet.")
+
+    # Notifications
+    st.subheader("Notifications")
+    if user is not None:
+        try:
+            notifications = inbox(user['id'], limit=5)
+        except APIError as e:
+            st.error(f"Failed to load notifications: {e.message}")
+            notifications = []
+        st.dataframe([{"Notification": row["notifications"]["message"], "Date": row["created_at"]} for row in notifications], hide_index=True)
+
+    # Analysis Graphs
+    st.subheader("Project Status Distribution")
+    if projects:
+        with step("status chart"):
+            import plotly.express as px
+            project_status_counts = frame(projects, ['status'])['status'].value_counts().reset_index()
+            project_status_counts.columns = ['Status', 'Count']
+            fig = px.pie(project_status_counts, values='Count', names='Status', title='Project Status Distribution')
+            st.plotly_chart(fig)
+
+    st.subheader("Project Status Trends")
+    render_status_trend("faculty_status_trend")
+
+def _mentees(user):
+    st.subheader("View Mentees")
+    overview = _overview(user)
+    rows = mentees(overview)
+    if rows:
+        st.dataframe(arrow_table(rows, ['id', 'name', 'username', 'team_id', 'team_name']), hide_index=True)
+    else:
+        st.info("No mentees yet.")
+
+def _grading(user):
+    st.subheader("Feedback & Grading")
+    overview = _overview(user)
+    team_id = _team_picker(overview, "feedback_team_id")
+    if team_id is not None:
+        team = next(team for team in overview if team['team_id'] == team_id)
+        st.write(f"Team Name: {team['team_name']}")
+        for project in team['projects']:
+            st.write(f"Project: {project['title']} ({project['status']})")
+        if team['last_graded_at']:
+            st.caption(f"Latest grade {team['latest_grade']} on {team['last_graded_at']} ({team['grade_count']} in total)")
+        feedback = st.text_area("Feedback", key="feedback_text")
+        grade = st.number_input("Grade", min_value=0.0, max_value=100.0, step=0.5, key="grade_value")
+        if st.button("Submit Feedback & Grade", key="submit_feedback_button"):
+            try:
+                insert_rows('grades', {"team_id": team_id, "graded_by": user['id'], "grade": grade, "feedback": feedback}, returning="minimal")
+                st.success("Feedback and grade submitted successfully.")
+            except APIError:
+                st.error("Failed to submit feedback and grade.")
+
+def _project_tracking(user):
+    st.subheader("Project Tracking")
+    overview = _overview(user)
+    project_action = st.selectbox("Action", ["View Submissions", "Track Progress"], key="project_action_selectbox")
+
+    if project_action == "View Submissions":
+        submissions = recent_submissions(overview)
+        if submissions:
+            st.dataframe(arrow_table(submissions, ['id', 'team_id', 'project', 'submitted_by', 'created_at']), hide_index=True)
+        else:
+            st.info("No submissions yet.")
+
+    elif project_action == "Track Progress":
+        projects = assigned_projects(overview)
+        if projects:
+            st.dataframe(arrow_table(projects, ['team_id', 'team_name', 'title', 'status']), hide_index=True)
+        else:
+            st.info("No projects yet.")
+
+def _chat(user):
+    st.subheader("Chat Feature")
+    chat_action = st.selectbox("Chat With", ["Individual Student", "Team"], key="chat_action_selectbox")
+
+    if user is None:
+        st.warning("Chat is available once your login is linked to a user account.")
+
+    elif chat_action == "Individual Student":
+        # Only the students on the teams this faculty member mentors
+        names = {row['id']: row['name'] for row in mentees(_overview(user))}
+        student_id = st.selectbox("Student", list(names), format_func=lambda s: f"{names[s]} (ID {s})", key="chat_student_id")
+        message = st.text_area("Message", key="chat_message")
+        if student_id is None:
+            st.info("No mentees yet.")
+        else:
+            conversation = direct_conversation(user['id'], student_id)
+            if st.button("Send Message", key="send_message_button") and message:
+                try:
+                    send_direct(user['id'], student_id, message)
+                    st.success("Message sent successfully.")
+                except APIError:
+                    st.error("Failed to send message.")
+            render_chat(conversation, user['id'], names, key="faculty_direct_chat")
+
+    elif chat_action == "Team":
+        team_id = _team_picker(_overview(user), "chat_team_id")
+        message = st.text_area("Message", key="chat_team_message")
+        if team_id is None:
+            st.info("No teams assigned yet.")
+        else:
+            conversation = team_conversation(team_id)
+            if st.button("Send Message to Team", key="send_team_message_button") and message:
+                try:
+                    send_team(team_id, user['id'], message)
+                    st.success("Message sent to team successfully.")
+                except APIError:
+                    st.error("Failed to send message to team.")
+            render_chat(conversation, user['id'], {}, key="faculty_team_chat")
+
+def _notifications(user):
+    st.subheader("Notifications")
+    notification_action = st.selectbox("Action", ["Inbox", "Set Deadline", "Send Alert"], key="notification_action_selectbox")
+
+    if notification_action == "Inbox":
+        if user is None:
+            st.warning("Notifications are available once your login is linked to a user account.")
+        else:
+            render_inbox(user['id'], key="faculty_inbox")
+
+    elif notification_action == "Set Deadline":
+        deadline_name = st.text_input("Deadline Name", key="deadline_name")
+        deadline_date = st.date_input("Deadline Date", key="deadline_date")
+        team_id = _team_picker(_overview(user), "deadline_team_id")
+        if st.button("Set Deadline", key="set_deadline_button", disabled=team_id is None):
+            try:
+                recipients = announce(f"Deadline for {deadline_name} is {deadline_date}", "deadline", team_id=team_id)
+                st.success(f"Deadline set successfully for {recipients} team member(s).")
+            except APIError:
+                st.error("Failed to set deadline.")
+
+    elif notification_action == "Send Alert":
+        alert_message = st.text_area("Alert Message", key="alert_message")
+        team_id = _team_picker(_overview(user), "alert_team_id")
+        if st.button("Send Alert", key="send_alert_button", disabled=team_id is None):
+            try:
+                recipients = announce(alert_message, "alert", team_id=team_id)
+                st.success(f"Alert sent successfully to {recipients} team member(s).")
+            except APIError:
+                st.error("Failed to send alert.")
+
+def _analytics(user):
+    st.subheader("Analytics and Insights")
+    overview = _overview(user)
+    if user is None:
+        st.warning("Reports are available once your login is linked to a user account.")
+    else:
+        # Reports cover the teams this faculty member mentors
+        team_ids = [team['team_id'] for team in overview]
+        render_report_panel("faculty_report", team_ids=team_ids)
+
+def _settings(user):
+    st.subheader("Profile & Settings")
+
+    settings_action = st.selectbox("Select Setting", ["Update Profile", "Change Password"], key="settings_action_selectbox")
+
+    if settings_action == "Update Profile":
+        st.subheader("Update Profile")
+        username = st.text_input("Username", key="update_profile_username")
+        # Mock data for demonstration
+        user = {
+            'name': 'John Doe',
+            'email': 'john.doe@example.com'
+        }
+        name = st.text_input("Full Name", value=user['name'], key="update_profile_name")
+        email = st.text_input("Email", value=user['email'], key="update_profile_email")
+        if st.button("Update Profile", key="update_profile_button"):
+            st.success("Profile updated successfully.")
+
+    elif settings_action == "Change Password":
+        st.subheader("Change Password")
+        username = st.text_input("Username", key="change_password_username")
+        old_password = st.text_input("Old Password", type="password", key="old_password")
+        new_password = st.text_input("New Password", type="password", key="new_password")
+        confirm_password = st.text_input("Confirm New Password", type="password", key="confirm_password")
+        if st.button("Change Password", key="change_password_button"):
+            if new_password == confirm_password:
+                st.success("Password changed successfully.")
+            else:
+                st.error("New passwords do not match.")
+
+PAGES = {
+    "Dashboard": _dashboard,
+    "View Mentees": _mentees,
+    "Feedback & Grading": _grading,
+    "Project Tracking": _project_tracking,
+    "Chat": _chat,
+    "Notifications": _notifications,
+    "Analytics": _analytics,
+    "Profile & Settings": _settings,
+}
 
 def render():
-    st.markdown("""
-        <style>
-            @import url('https://fonts.googleapis.com/css2?family=Poppins:wght@300;400;500;600;700&display=swap');
-            body {
-                background: linear-gradient(135deg, #ff9a9e, #fad0c4);
-                color: #333;
-                font-family: 'Poppins', sans-serif;
-                margin: 0;
-                padding: 0;
-            }
-            .stButton>button {
-                background: linear-gradient(135deg, #ff9a9e, #fad0c4);
-                color: white;
-                font-family: 'Poppins', sans-serif;
-                font-size: 16px;
-                font-weight: 500;
-                border-radius: 8px;
-                padding: 10px 24px;
-                border: none;
-                transition: all 0.3s ease;
-                box-shadow: 0px 4px 10px rgba(255, 154, 158, 0.3);
-                display: block;
-                margin: 10px auto;
-            }
-            .stButton>button:hover {
-                background: linear-gradient(135deg, #fad0c4, #ff9a9e);
-                transform: translateY(-2px);
-                box-shadow: 0px 6px 15px rgba(255, 154, 158, 0.5);
-            }
-            .stSelectbox>div>div {
-                background-color: rgba(255, 255, 255, 0.05);
-                color: #333;
-                border: 1px solid rgba(255, 255, 255, 0.1);
-                border-radius: 8px;
-                transition: all 0.3s ease;
-            }
-            .stTextInput>div>div>input {
-                background-color: rgba(255, 255, 255, 0.05);
-                color: #333 !important;
-                border: 1px solid rgba(255, 255, 255, 0.1);
-                border-radius: 8px;
-                padding: 8px 12px;
-                font-family: 'Poppins', sans-serif;
-                transition: all 0.3s ease;
-            }
-            .stTextInput>div>div>input:focus {
-                border-color: #ff9a9e;
-                box-shadow: 0 0 5px rgba(255, 154, 158, 0.5);
-            }
-            .stSelectbox>div>div:hover, .stTextInput>div>div>input:hover {
-                border-color: #fad0c4;
-                box-shadow: 0 0 5px rgba(250, 208, 196, 0.5);
-            }
-            .stMetric>div {
-                background: linear-gradient(135deg, #ff9a9e, #fad0c4);
-                color: white;
-                border-radius: 8px;
-                padding: 10px;
-                box-shadow: 0px 4px 10px rgba(255, 154, 158, 0.3);
-                transition: all 0.3s ease;
-            }
-            .stMetric>div:hover {
-                transform: translateY(-2px);
-                box-shadow: 0px 6px 15px rgba(255, 154, 158, 0.5);
-            }
-        </style>
-    """, unsafe_allow_html=True)
+    use_stylesheets("faculty")
 
     st.sidebar.title("FACULTY")
-    options = ["Dashboard", "View Mentees", "Feedback & Grading", "Project Tracking", "Chat", "Notifications", "Analytics", "Profile & Settings"]
-    choice = st.sidebar.radio("Faculty", options)
-
-    if choice == "Dashboard":
-        st.title("Faculty Dashboard")
-        st.subheader("Overview")
+    options = list(PAGES)
+    choice = st.sidebar.radio("Faculty", options, key="nav_page")
+    set_page(f"Faculty/{choice}")
+    remember_page(choice)
 
-        # Mock data for demonstration
-        teams = pd.DataFrame({
-            'Team ID': [1, 2, 3],
-            'Team Name': ['Team A', 'Team B', 'Team C'],
-            'Project Title': ['Project 1', 'Project 2', 'Project 3'],
-            'Status': ['In Progress', 'Completed', 'Initiated']
-        })
-        notifications = pd.DataFrame({
-            'Notification': ['Deadline approaching', 'New submission', 'Meeting scheduled'],
-            'Date': ['2023-10-01', '2023-10-02', '2023-10-03']
-        })
-
-        # Assigned Teams
-        st.subheader("Assigned Teams")
-        st.dataframe(teams)
-
-        # Notifications
-        st.subheader("Notifications")
-        st.dataframe(notifications)
-
-        # Analysis Graphs
-        st.subheader("Project Status Distribution")
-        project_status_counts = teams['Status'].value_counts().reset_index()
-        project_status_counts.columns = ['Status', 'Count']
-        fig = px.pie(project_status_counts, values='Count', names='Status', title='Project Status Distribution')
-        st.plotly_chart(fig)
-
-    elif choice == "View Mentees":
-        st.subheader("View Mentees")
-        mentees = pd.DataFrame({
-            'Mentee ID': [1, 2, 3],
-            'Name': ['Alice', 'Bob', 'Charlie'],
-            'Role': ['Leader', 'Member', 'Member']
-        })
-        st.dataframe(mentees)
-
-    elif choice == "Feedback & Grading":
-        st.subheader("Feedback & Grading")
-        team_id = st.text_input("Team ID", key="feedback_team_id")
-        if st.button("Fetch Team Details", key="fetch_team_details_button"):
-            # Mock data for demonstration
-            team = {
-                'name': 'Team A',
-                'project_title': 'Project 1',
-                'project_description': 'Description of Project 1'
-            }
-            st.write(f"Team Name: {team['name']}")
-            st.write(f"Project Title: {team['project_title']}")
-            st.write(f"Project Description: {team['project_description']}")
-            feedback = st.text_area("Feedback", key="feedback_text")
-            grade = st.text_input("Grade", key="grade_text")
-            if st.button("Submit Feedback & Grade", key="submit_feedback_button"):
-                st.success("Feedback and grade submitted successfully.")
+    user = current_user()
+    if user is not None:
+        render_badge(user['id'])
 
-    elif choice == "Project Tracking":
-        st.subheader("Project Tracking")
-        project_action = st.selectbox("Action", ["View Submissions", "Track Progress"], key="project_action_selectbox")
-        
-        if project_action == "View Submissions":
-            submissions = pd.DataFrame({
-                'Submission ID': [1, 2, 3],
-                'Team ID': [1, 2, 3],
-                'Submission Date': ['2023-10-01', '2023-10-02', '2023-10-03']
-            })
-            st.dataframe(submissions)
-        
-        elif project_action == "Track Progress":
-            progress = pd.DataFrame({
-                'Team ID': [1, 2, 3],
-                'Milestone': ['Milestone 1', 'Milestone 2', 'Milestone 3'],
-                'Status': ['Completed', 'In Progress', 'Not Started']
-            })
-            st.dataframe(progress)
-
-    elif choice == "Chat":
-        st.subheader("Chat Feature")
-        chat_action = st.selectbox("Chat With", ["Individual Student", "Team"], key="chat_action_selectbox")
-        
-        if chat_action == "Individual Student":
-            student_id = st.text_input("Student ID", key="chat_student_id")
-            message = st.text_area("Message", key="chat_message")
-            if st.button("Send Message", key="send_message_button"):
-                st.success("Message sent successfully.")
-        
-        elif chat_action == "Team":
-            team_id = st.text_input("Team ID", key="chat_team_id")
-            message = st.text_area("Message", key="chat_team_message")
-            if st.button("Send Message to Team", key="send_team_message_button"):
-                st.success("Message sent to team successfully.")
-
-    elif choice == "Notifications":
-        st.subheader("Notifications")
-        notification_action = st.selectbox("Action", ["Set Deadline", "Send Alert"], key="notification_action_selectbox")
-        
-        if notification_action == "Set Deadline":
-            deadline_name = st.text_input("Deadline Name", key="deadline_name")
-            deadline_date = st.date_input("Deadline Date", key="deadline_date")
-            if st.button("Set Deadline", key="set_deadline_button"):
-                st.success("Deadline set successfully.")
-        
-        elif notification_action == "Send Alert":
-            alert_message = st.text_area("Alert Message", key="alert_message")
-            if st.button("Send Alert", key="send_alert_button"):
-                st.success("Alert sent successfully.")
-
-    elif choice == "Analytics":
-        st.subheader("Analytics and Insights")
-
-        report_action = st.selectbox("Select Report Type", ["Monthly Report", "Yearly Report", "Custom Report"], key="report_action_selectbox")
-
-        if report_action == "Monthly Report":
-            month = st.selectbox("Select Month", ["January", "February", "March", "April", "May", "June", "July", "August", "September", "October", "November", "December"], key="month_selectbox")
-            year = st.number_input("Select Year", min_value=2000, max_value=2100, value=2023, step=1, key="year_input")
-            if st.button("Download Monthly Report", key="download_monthly_report_button"):
-                st.success(f"Monthly report for {month} {year} is being generated...")
-
-        elif report_action == "Yearly Report":
-            year = st.number_input("Select Year", min_value=2000, max_value=2100, value=2023, step=1, key="yearly_year_input")
-            if st.button("Download Yearly Report", key="download_yearly_report_button"):
-                st.success(f"Yearly report for {year} is being generated...")
-
-        elif report_action == "Custom Report":
-            start_date = st.date_input("Start Date", key="start_date_input")
-            end_date = st.date_input("End Date", key="end_date_input")
-            if st.button("Download Custom Report", key="download_custom_report_button"):
-                st.success(f"Custom report from {start_date} to {end_date} is being generated...")
-
-    elif choice == "Profile & Settings":
-        st.subheader("Profile & Settings")
-
-        settings_action = st.selectbox("Select Setting", ["Update Profile", "Change Password"], key="settings_action_selectbox")
-
-        if settings_action == "Update Profile":
-            st.subheader("Update Profile")
-            username = st.text_input("Username", key="update_profile_username")
-            # Mock data for demonstration
-            user = {
-                'name': 'John Doe',
-                'email': 'john.doe@example.com'
-            }
-            name = st.text_input("Full Name", value=user['name'], key="update_profile_name")
-            email = st.text_input("Email", value=user['email'], key="update_profile_email")
-            if st.button("Update Profile", key="update_profile_button"):
-                st.success("Profile updated successfully.")
-
-        elif settings_action == "Change Password":
-            st.subheader("Change Password")
-            username = st.text_input("Username", key="change_password_username")
-            old_password = st.text_input("Old Password", type="password", key="old_password")
-            new_password = st.text_input("New Password", type="password", key="new_password")
-            confirm_password = st.text_input("Confirm New Password", type="password", key="confirm_password")
-            if st.button("Change Password", key="change_password_button"):
-                if new_password == confirm_password:
-                    st.success("Password changed successfully.")
-                else:
-                    st.error("New passwords do not match.")
+    # Widgets inside a page re-run only that page; switching pages re-runs the app
+    fragment(PAGES[choice])(user)
 
 if __name__ == "__main__":
     render()
\ No newline at end of file
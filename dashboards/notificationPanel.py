@@ -0,0 +1,53 @@
+import streamlit as st
+from postgrest.exceptions import APIError
+from services.notifications import inbox, mark_read, unread_count
+
+
+def audience_picker(key, roles=("Student", "Faculty", "Admin")):
+    # Returns (role, team_id) for notifications.announce(); (None, None) means
+    # everyone. Returns None while the chosen audience is incomplete, so a blank
+    # or mistyped Team ID can never widen the audience to every user.
+    audience = st.selectbox("Send to", ["Everyone", "Role", "Team"], key=f"{key}_audience")
+    if audience == "Role":
+        return st.selectbox("Role", list(roles), key=f"{key}_role"), None
+    if audience == "Team":
+        team_id = st.text_input("Team ID", key=f"{key}_team_id").strip()
+        if team_id.isdigit():
+            return None, int(team_id)
+        if team_id:
+            st.error("Please enter a valid Team ID")
+        return None
+    return None, None
+
+
+def render_badge(user_id, unread=None):
+    # Unread counter in the sidebar; one primary-key lookup, briefly cached,
+    # unless the page already has the count (e.g. from an overview bundle)
+    if unread is None:
+        try:
+            unread = unread_count(user_id)
+        except APIError:
+            return
+    st.sidebar.caption(f"🔔 {unread} unread notification{'s' if unread != 1 else ''}")
+
+
+def render_inbox(user_id, key):
+    unread_only = st.toggle("Unread only", key=f"{key}_unread_only")
+    try:
+        rows = inbox(user_id, unread_only=unread_only)
+    except APIError as e:
+        st.error(f"Failed to load notifications: {e.message}")
+        return
+    if not rows:
+        st.info("No notifications.")
+        return
+    st.dataframe([{
+        "Notification": row["notifications"]["message"],
+        "Type": row["notifications"]["type"],
+        "Date": row["created_at"],
+        "Read": row["read_at"] is not None,
+    } for row in rows], hide_index=True)
+    unread_ids = [row["id"] for row in rows if row["read_at"] is None]
+    if unread_ids and st.button("Mark all as read", key=f"{key}_mark_read"):
+        mark_read(user_id, unread_ids)
+        st.rerun()
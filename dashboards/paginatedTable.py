@@ -0,0 +1,67 @@
+import streamlit as st
+from postgrest.exceptions import APIError
+from services.pagination import fetch_page, prefetch_page
+from services.instrumentation import step
+
+PAGE_SIZES = [25, 50, 100, 250]
+
+
+def render(table, columns, key, sortable=("id",), filterable=None, default_desc=False):
+    # Keyset-paginated view of a table. Only the requested columns and one page
+    # of rows are ever fetched; sorting and filtering happen in the database.
+    # filterable maps column -> PostgREST operator ("eq" or "ilike").
+    filterable = filterable or {}
+    state_key = f"{key}_cursors"
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        sort = st.selectbox("Sort by", list(sortable), key=f"{key}_sort")
+    with col2:
+        desc = st.toggle("Descending", value=default_desc, key=f"{key}_desc")
+    with col3:
+        page_size = st.selectbox("Rows per page", PAGE_SIZES, index=1, key=f"{key}_page_size")
+
+    filters = []
+    if filterable:
+        col1, col2 = st.columns([1, 2])
+        with col1:
+            filter_column = st.selectbox("Filter column", list(filterable), key=f"{key}_filter_column")
+        with col2:
+            filter_value = st.text_input("Filter value", key=f"{key}_filter_value").strip()
+        if filter_value:
+            op = filterable[filter_column]
+            filters.append((filter_column, op, f"%{filter_value}%" if op == "ilike" else filter_value))
+
+    # Cursor stack: one entry per page visited, reset whenever the view changes
+    view = (sort, desc, page_size, tuple(filters))
+    if st.session_state.get(f"{key}_view") != view:
+        st.session_state[f"{key}_view"] = view
+        st.session_state[state_key] = [None]
+    cursors = st.session_state[state_key]
+
+    try:
+        with step(f"{table} page"):
+            page, next_cursor = fetch_page(table, columns, sort, desc, cursors[-1], page_size, filters)
+    except APIError as e:
+        st.error(f"Failed to fetch {table}: {e.message}")
+        return
+
+    if next_cursor is not None:
+        prefetch_page(table, columns, sort, desc, next_cursor, page_size, filters)
+
+    with step(f"{table} dataframe"):
+        # Streamlit serializes to Arrow anyway, so the cached table is sent as is
+        st.dataframe(page, hide_index=True)
+
+    # Page turns re-run only the enclosing page fragment (tables are always rendered inside one)
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        if st.button("Previous", key=f"{key}_prev", disabled=len(cursors) == 1):
+            cursors.pop()
+            st.rerun(scope="fragment")
+    with col2:
+        st.caption(f"Page {len(cursors)}")
+    with col3:
+        if st.button("Next", key=f"{key}_next", disabled=next_cursor is None):
+            cursors.append(next_cursor)
+            st.rerun(scope="fragment")
@@ -0,0 +1,56 @@
+import calendar
+import streamlit as st
+from postgrest.exceptions import APIError
+from services.instrumentation import fragment
+from services.reports import FORMATS, report_period, request_report
+
+POLL_SECONDS = 2
+
+
+def _job_status(key):
+    job, file_name, mime = st.session_state[key]
+    if not job.done():
+        st.info(f"Generating {file_name}...")
+        return
+    if st.session_state.pop(f"{key}_polling", False):
+        # Re-register the panel without run_every so it stops polling
+        st.rerun()
+    error = job.exception()
+    if error is not None:
+        message = error.message if isinstance(error, APIError) else str(error)
+        st.error(f"Failed to generate report: {message}")
+        return
+    st.download_button(f"Download {file_name}", job.result(), file_name=file_name, mime=mime, key=f"{key}_download")
+
+
+def render(key, team_ids=None):
+    # Report selectors plus a queued job; only the status panel polls while it runs
+    report_action = st.selectbox("Select Report Type", ["Monthly Report", "Yearly Report", "Custom Report"], key="report_action_selectbox")
+
+    if report_action == "Monthly Report":
+        month = st.selectbox("Select Month", list(calendar.month_name)[1:], key="month_selectbox")
+        year = st.number_input("Select Year", min_value=2000, max_value=2100, value=2023, step=1, key="year_input")
+        period = report_period(report_action, month=month, year=int(year))
+    elif report_action == "Yearly Report":
+        year = st.number_input("Select Year", min_value=2000, max_value=2100, value=2023, step=1, key="yearly_year_input")
+        period = report_period(report_action, year=int(year))
+    else:
+        start_date = st.date_input("Start Date", key="start_date_input")
+        end_date = st.date_input("End Date", key="end_date_input")
+        if end_date < start_date:
+            st.error("End date must not be before start date.")
+            return
+        period = report_period(report_action, start_date=start_date, end_date=end_date)
+
+    fmt = st.selectbox("Format", list(FORMATS), key=f"{key}_format")
+    start, end, label = period
+    if st.button(f"Generate {report_action}", key=f"{key}_generate"):
+        extension, mime = FORMATS[fmt]
+        file_name = f"{key}_{report_action.split()[0].lower()}_{label}.{extension}"
+        st.session_state[f"{key}_job"] = (request_report(report_action, start, end, fmt, team_ids), file_name, mime)
+
+    job = st.session_state.get(f"{key}_job")
+    if job is not None:
+        polling = not job[0].done()
+        st.session_state[f"{key}_job_polling"] = polling
+        fragment(_job_status, run_every=POLL_SECONDS if polling else None)(f"{key}_job")
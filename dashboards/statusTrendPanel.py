@@ -0,0 +1,37 @@
+import streamlit as st
+from datetime import date
+from postgrest.exceptions import APIError
+from services.aggregates import TREND_VIEWS, project_status_trend
+from services.instrumentation import step
+from services.frames import frame
+
+RANGES = {"Last 12 months": 1, "Last 3 years": 3, "All time": None}
+
+
+def render(key):
+    # Project status over time, charted straight from the pre-aggregated rollups
+    col1, col2 = st.columns(2)
+    with col1:
+        granularity = st.radio("Granularity", list(TREND_VIEWS), index=1, horizontal=True, key=f"{key}_granularity")
+    with col2:
+        window = st.selectbox("Range", list(RANGES), key=f"{key}_range")
+    years = RANGES[window]
+    today = date.today()
+    since = today.replace(year=today.year - years, day=1) if years else None
+
+    try:
+        rows = project_status_trend(granularity, since)
+    except APIError as e:
+        st.error(f"Failed to load status trends: {e.message}")
+        return
+    if not rows:
+        st.info("No project status history yet.")
+        return
+
+    with step("status trend chart"):
+        import plotly.express as px
+        trend = frame(rows, ['period', 'status', 'entered', 'exited', 'count'])
+        trend.columns = ['Period', 'Status', 'Entered', 'Exited', 'Projects']
+        fig = px.line(trend, x='Period', y='Projects', color='Status', markers=True, hover_data=['Entered', 'Exited'],
+                      title=f'{granularity} Project Status Trend')
+        st.plotly_chart(fig, key=f"{key}_chart")
@@ -1,225 +1,228 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import qrcode
-from io import BytesIO
-from PIL import Image
+from services.instrumentation import fragment, set_page, step
+from services.assets import use_stylesheets
+from services.qrCodes import profile_url, qr_code
+from services.submissionStore import save_submission
+from services.session import current_user, remember_page
+from services.studentData import student_overview
+from services.frames import arrow_table, frame
+from services.chat import direct_conversation, team_conversation, send_direct, send_team
+from dashboards.chatPanel import render as render_chat
+from dashboards.notificationPanel import render_badge, render_inbox
+from postgrest.exceptions import APIError
+
+# Pages built from the student overview bundle
+OVERVIEW_PAGES = ("Dashboard", "View Projects", "Chat")
+
+def _overview(user):
+    # Everything the Dashboard, View Projects and Chat pages show, in one call;
+    # briefly cached, so page fragments re-read it without another query
+    if user is None:
+        return None
+    try:
+        return student_overview(user['id'])
+    except APIError as e:
+        st.error(f"Failed to load your overview: {e.message}")
+        return None
+
+def _dashboard(user):
+    st.subheader("Overview")
+    overview = _overview(user)
+
+    projects = overview['projects'] if overview else []
+    names = {member['id']: member['name'] for member in overview['members']} if overview else {}
+
+    # Projects
+    st.subheader("Your Projects")
+    if projects:
+        st.dataframe(arrow_table(projects, ['id', 'title', 'status', 'team_id', 'last_submitted_at']), hide_index=True)
+    else:
+        st.info("You are not on a project yet.")
+
+    # Notifications
+    st.subheader("Notifications")
+    if overview and overview['notifications']:
+        st.dataframe(arrow_table(overview['notifications'], ['message', 'type', 'created_at']), hide_index=True)
+    else:
+        st.info("No notifications.")
+
+    # Latest chat messages
+    if overview and (overview['team_chat'] or overview['direct_chat']):
+        st.subheader("Recent Messages")
+        for message in [*overview['team_chat'], *overview['direct_chat']]:
+            sender = "You" if message['sender_id'] == user['id'] else names.get(message['sender_id'], f"User {message['sender_id']}")
+            st.caption(f"{sender} · {message['created_at']}")
+            st.text(message['body'])
+
+    # Analysis Graphs
+    if projects:
+        st.subheader("Project Status Distribution")
+        with step("status chart"):
+            import plotly.express as px
+            project_status_counts = frame(projects, ['status'])['status'].value_counts().reset_index()
+            project_status_counts.columns = ['Status', 'Count']
+            fig = px.pie(project_status_counts, values='Count', names='Status', title='Project Status Distribution')
+            st.plotly_chart(fig)
+
+    # QR Code for Profile (pre-generated when the student was imported)
+    if user is not None:
+        st.subheader("Generate QR Code for Profile")
+        with step("qr code"):
+            qr_png = qr_code(profile_url(user['username']))
+        st.image(qr_png, caption="Scan to view profile")
+
+def _projects(user):
+    st.subheader("View Projects")
+    overview = _overview(user)
+    projects = overview['projects'] if overview else []
+    if projects:
+        st.dataframe(arrow_table(projects, ['id', 'title', 'status', 'team_id', 'last_submitted_at']), hide_index=True)
+    else:
+        st.info("You are not on a project yet.")
+
+def _submit_work(user):
+    st.subheader("Submit Work")
+    overview = _overview(user)
+    projects = {project['id']: project for project in (overview['projects'] if overview else [])}
+    project_id = st.selectbox("Project", list(projects), format_func=lambda p: f"{projects[p]['title']} (ID {p})",
+                              key="submit_project_id")
+    submission_text = st.text_area("Submission Text", key="submission_text")
+    uploaded_files = st.file_uploader("Upload Files", type=["pdf", "docx", "txt", "jpg", "png"], accept_multiple_files=True)
+    if 'submission_jobs' not in st.session_state:
+        st.session_state.submission_jobs = []
+    if st.button("Submit", key="submit_button"):
+        if user is None:
+            st.error("Submissions are available once your login is linked to a user account.")
+        elif project_id is None:
+            st.error("You are not on a project yet.")
+        else:
+            # Files are copied to storage on the upload pool; this rerun does not wait
+            future = save_submission(project_id, submission_text, uploaded_files, submitted_by=user['id'])
+            st.session_state.submission_jobs.append((project_id, [f.name for f in uploaded_files or []], future))
+            st.success("Work submitted. Your files are being uploaded.")
+
+    # Finished jobs are shown once and then dropped from the session
+    running = []
+    for job_project_id, file_names, future in reversed(st.session_state.submission_jobs):
+        if not future.done():
+            running.insert(0, (job_project_id, file_names, future))
+            st.info(f"Project {job_project_id}: uploading {len(file_names)} file(s)...")
+        elif future.exception():
+            st.error(f"Project {job_project_id}: submission failed ({future.exception()})")
+        else:
+            result = future.result()
+            st.success(f"Project {job_project_id}: submission {result['submission_id']} saved with {result['files']} file(s).")
+            for file_name in file_names:
+                st.write(f"Uploaded file: {file_name}")
+    st.session_state.submission_jobs = running
+
+def _chat(user):
+    st.subheader("Chat with Team Members")
+    overview = _overview(user)
+    teams = overview['teams'] if overview else []
+    if not teams:
+        st.warning("Chat is available once you are a member of a team.")
+    else:
+        team_id = teams[0]['id']
+        names = {member['id']: member['name'] for member in overview['members'] if member['team_id'] == team_id}
+        member_ids = list(names)
+        member = st.selectbox("Select Member", ["Whole Team", *member_ids], format_func=lambda m: names.get(m, m), key="chat_member_selectbox")
+        message = st.text_area("Message", key="chat_message")
+        if member == "Whole Team":
+            conversation = team_conversation(team_id)
+        else:
+            conversation = direct_conversation(user['id'], member)
+        if st.button("Send Message", key="send_message_button") and message:
+            try:
+                if member == "Whole Team":
+                    send_team(team_id, user['id'], message)
+                else:
+                    send_direct(user['id'], member, message)
+                st.success(f"Message sent to {names.get(member, member)} successfully.")
+            except APIError:
+                st.error("Failed to send message.")
+        render_chat(conversation, user['id'], names, key="student_chat")
+
+def _notifications(user):
+    st.subheader("Notifications")
+    if user is None:
+        st.warning("Notifications are available once your login is linked to a user account.")
+    else:
+        render_inbox(user['id'], key="student_inbox")
+
+def _settings(user):
+    st.subheader("Profile & Settings")
+
+    settings_action = st.selectbox("Select Setting", ["Update Profile", "Change Password"], key="settings_action_selectbox")
+
+    if settings_action == "Update Profile":
+        st.subheader("Update Profile")
+        username = st.text_input("Username", key="update_profile_username")
+        # Mock data for demonstration
+        user = {
+            'name': 'John Doe',
+            'email': 'john.doe@example.com',
+            'resume': 'resume.pdf',
+            'github': 'https://github.com/johndoe'
+        }
+        name = st.text_input("Full Name", value=user['name'], key="update_profile_name")
+        email = st.text_input("Email", value=user['email'], key="update_profile_email")
+        resume = st.file_uploader("Upload Resume", type=["pdf", "docx"], key="update_profile_resume")
+        github = st.text_input("GitHub ID", value=user['github'], key="update_profile_github")
+        profile_image = st.file_uploader("Upload Profile Image", type=["jpg", "png"], key="update_profile_image")
+        if st.button("Update Profile", key="update_profile_button"):
+            st.success("Profile updated successfully.")
+            if resume:
+                st.write(f"Uploaded resume: {resume.name}")
+            if profile_image:
+                st.image(profile_image, caption="Profile Image")
+
+    elif settings_action == "Change Password":
+        st.subheader("Change Password")
+        username = st.text_input("Username", key="change_password_username")
+        old_password = st.text_input("Old Password", type="password", key="old_password")
+        new_password = st.text_input("New Password", type="password", key="new_password")
+        confirm_password = st.text_input("Confirm New Password", type="password", key="confirm_password")
+        if st.button("Change Password", key="change_password_button"):
+            if new_password == confirm_password:
+                st.success("Password changed successfully.")
+            else:
+                st.error("New passwords do not match.")
+
+PAGES = {
+    "Dashboard": _dashboard,
+    "View Projects": _projects,
+    "Submit Work": _submit_work,
+    "Chat": _chat,
+    "Notifications": _notifications,
+    "Profile & Settings": _settings,
+}
 
 def render():
-    st.markdown("""
-        <style>
-            @import url('https://fonts.googleapis.com/css2?family=Poppins:wght@300;400;500;600;700&display=swap');
-            body {
-                background: linear-gradient(135deg, #1e3c72, #2a5298);
-                color: #f4f4f8;
-                font-family: 'Poppins', sans-serif;
-                margin: 0;
-                padding: 0;
-                overflow-x: hidden;
-            }
-            .stButton>button {
-                background: linear-gradient(135deg, #1e3c72, #2a5298);
-                color: white;
-                font-family: 'Poppins', sans-serif;
-                font-size: 16px;
-                font-weight: 500;
-                border-radius: 8px;
-                padding: 10px 24px;
-                border: none;
-                transition: all 0.3s ease;
-                box-shadow: 0px 4px 10px rgba(30, 60, 114, 0.3);
-                display: block;
-                margin: 10px auto;
-            }
-            .stButton>button:hover {
-                background: linear-gradient(135deg, #2a5298, #1e3c72);
-                transform: translateY(-2px);
-                box-shadow: 0px 6px 15px rgba(30, 60, 114, 0.5);
-            }
-            .stSelectbox>div>div {
-                background-color: rgba(255, 255, 255, 0.05);
-                color: #f4f4f8;
-                border: 1px solid rgba(255, 255, 255, 0.1);
-                border-radius: 8px;
-                transition: all 0.3s ease;
-            }
-            .stTextInput>div>div>input {
-                background-color: rgba(255, 255, 255, 0.05);
-                color: #f4f4f8 !important;
-                border: 1px solid rgba(255, 255, 255, 0.1);
-                border-radius: 8px;
-                padding: 8px 12px;
-                font-family: 'Poppins', sans-serif;
-                transition: all 0.3s ease;
-            }
-            .stTextInput>div>div>input:focus {
-                border-color: #1e3c72;
-                box-shadow: 0 0 5px rgba(30, 60, 114, 0.5);
-            }
-            .stSelectbox>div>div:hover, .stTextInput>div>div>input:hover {
-                border-color: #2a5298;
-                box-shadow: 0 0 5px rgba(42, 82, 152, 0.5);
-            }
-            .stMetric>div {
-                background: linear-gradient(135deg, #1e3c72, #2a5298);
-                color: white;
-                border-radius: 8px;
-                padding: 10px;
-                box-shadow: 0px 4px 10px rgba(30, 60, 114, 0.3);
-                transition: all 0.3s ease;
-            }
-            .stMetric>div:hover {
-                transform: translateY(-2px);
-                box-shadow: 0px 6px 15px rgba(30, 60, 114, 0.5);
-            }
-            .sidebar .sidebar-content {
-                background: linear-gradient(135deg, #1e3c72, #2a5298);
-                color: white;
-            }
-            .sidebar .sidebar-content a {
-                color: white;
-            }
-            .sidebar .sidebar-content a:hover {
-                color: #f0f2f6;
-            }
-        </style>
-    """, unsafe_allow_html=True)
+    use_stylesheets("student")
 
     st.title("Student Dashboard")
     st.write("Welcome to the Student Dashboard!")
 
-    options = ["Dashboard", "View Projects", "Submit Work", "Chat", "Notifications", "Profile & Settings"]
-    choice = st.sidebar.radio("Student", options)
-
-    if choice == "Dashboard":
-        st.subheader("Overview")
-
-        # Mock data for demonstration
-        projects = pd.DataFrame({
-            'Project ID': [1, 2, 3],
-            'Project Title': ['Project 1', 'Project 2', 'Project 3'],
-            'Status': ['In Progress', 'Completed', 'Initiated']
-        })
-        notifications = pd.DataFrame({
-            'Notification': ['Deadline approaching', 'New submission', 'Meeting scheduled'],
-            'Date': ['2023-10-01', '2023-10-02', '2023-10-03']
-        })
-
-        # Projects
-        st.subheader("Your Projects")
-        st.dataframe(projects)
-
-        # Notifications
-        st.subheader("Notifications")
-        st.dataframe(notifications)
-
-        # Analysis Graphs
-        st.subheader("Project Status Distribution")
-        project_status_counts = projects['Status'].value_counts().reset_index()
-        project_status_counts.columns = ['Status', 'Count']
-        fig = px.pie(project_status_counts, values='Count', names='Status', title='Project Status Distribution')
-        st.plotly_chart(fig)
-
-        # QR Code for Profile
-        st.subheader("Generate QR Code for Profile")
-        profile_url = "https://example.com/profile/johndoe"  # Mock profile URL
-        qr = qrcode.QRCode(
-            version=1,
-            error_correction=qrcode.constants.ERROR_CORRECT_L,
-            box_size=10,
-            border=4,
-        )
-        qr.add_data(profile_url)
-        qr.make(fit=True)
-        img = qr.make_image(fill='black', back_color='white')
-        buf = BytesIO()
-        img.save(buf)
-        st.image(buf.getvalue(), caption="Scan to view profile")
-
-    elif choice == "View Projects":
-        st.subheader("View Projects")
-        projects = pd.DataFrame({
-            'Project ID': [1, 2, 3],
-            'Project Title': ['Project 1', 'Project 2', 'Project 3'],
-            'Description': ['Description of Project 1', 'Description of Project 2', 'Description of Project 3'],
-            'Status': ['In Progress', 'Completed', 'Initiated']
-        })
-        st.dataframe(projects)
-
-    elif choice == "Submit Work":
-        st.subheader("Submit Work")
-        project_id = st.text_input("Project ID", key="submit_project_id")
-        submission_text = st.text_area("Submission Text", key="submission_text")
-        uploaded_files = st.file_uploader("Upload Files", type=["pdf", "docx", "txt", "jpg", "png"], accept_multiple_files=True)
-        if st.button("Submit", key="submit_button"):
-            st.success("Work submitted successfully.")
-            if uploaded_files:
-                for uploaded_file in uploaded_files:
-                    st.write(f"Uploaded file: {uploaded_file.name}")
-
-    elif choice == "Chat":
-        st.subheader("Chat with Team Members")
-        team_members = ["Alice", "Bob", "Charlie"]  # Mock data for team members
-        member = st.selectbox("Select Member", team_members, key="chat_member_selectbox")
-        message = st.text_area("Message", key="chat_message")
-        if st.button("Send Message", key="send_message_button"):
-            st.success(f"Message sent to {member} successfully.")
-        
-        # Display chat history (mock data)
-        st.subheader("Chat History")
-        chat_history = pd.DataFrame({
-            'Sender': ['You', 'Alice', 'You', 'Bob'],
-            'Message': ['Hello!', 'Hi there!', 'How is the project going?', 'It is going well!'],
-            'Timestamp': ['2023-10-01 10:00', '2023-10-01 10:01', '2023-10-01 10:05', '2023-10-01 10:10']
-        })
-        st.dataframe(chat_history)
-
-    elif choice == "Notifications":
-        st.subheader("Notifications")
-        notifications = pd.DataFrame({
-            'Notification': ['Deadline approaching', 'New submission', 'Meeting scheduled'],
-            'Date': ['2023-10-01', '2023-10-02', '2023-10-03']
-        })
-        st.dataframe(notifications)
-
-    elif choice == "Profile & Settings":
-        st.subheader("Profile & Settings")
-
-        settings_action = st.selectbox("Select Setting", ["Update Profile", "Change Password"], key="settings_action_selectbox")
-
-        if settings_action == "Update Profile":
-            st.subheader("Update Profile")
-            username = st.text_input("Username", key="update_profile_username")
-            # Mock data for demonstration
-            user = {
-                'name': 'John Doe',
-                'email': 'john.doe@example.com',
-                'resume': 'resume.pdf',
-                'github': 'https://github.com/johndoe'
-            }
-            name = st.text_input("Full Name", value=user['name'], key="update_profile_name")
-            email = st.text_input("Email", value=user['email'], key="update_profile_email")
-            resume = st.file_uploader("Upload Resume", type=["pdf", "docx"], key="update_profile_resume")
-            github = st.text_input("GitHub ID", value=user['github'], key="update_profile_github")
-            profile_image = st.file_uploader("Upload Profile Image", type=["jpg", "png"], key="update_profile_image")
-            if st.button("Update Profile", key="update_profile_button"):
-                st.success("Profile updated successfully.")
-                if resume:
-                    st.write(f"Uploaded resume: {resume.name}")
-                if profile_image:
-                    st.image(profile_image, caption="Profile Image")
-
-        elif settings_action == "Change Password":
-            st.subheader("Change Password")
-            username = st.text_input("Username", key="change_password_username")
-            old_password = st.text_input("Old Password", type="password", key="old_password")
-            new_password = st.text_input("New Password", type="password", key="new_password")
-            confirm_password = st.text_input("Confirm New Password", type="password", key="confirm_password")
-            if st.button("Change Password", key="change_password_button"):
-                if new_password == confirm_password:
-                    st.success("Password changed successfully.")
-                else:
-                    st.error("New passwords do not match.")
+    options = list(PAGES)
+    choice = st.sidebar.radio("Student", options, key="nav_page")
+    set_page(f"Student/{choice}")
+    remember_page(choice)
+
+    user = current_user()
+
+    # The badge reuses the unread count from the overview the page is about to load
+    overview = None
+    if user is not None and choice in OVERVIEW_PAGES:
+        try:
+            overview = student_overview(user['id'])
+        except APIError:
+            pass  # reported by the page
+    if user is not None:
+        render_badge(user['id'], overview['unread'] if overview else None)
+
+    # Widgets inside a page re-run only that page; switching pages re-runs the app
+    fragment(PAGES[choice])(user)
 
 if __name__ == "__main__":
     render()
\ No newline at end of file
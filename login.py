@@ -1,29 +1,13 @@
 import streamlit as st
-from supabase import create_client, Client
-import os
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
-
-class Config:
-    # Common configuration
-    SECRET_KEY = os.getenv('SECRET_KEY', 'default-secret-key')
-    SUPABASE_URL = os.getenv('SUPABASE_URL')
-    SUPABASE_KEY = os.getenv('SUPABASE_KEY')
-
-# Initialize Supabase client
-supabase: Client = create_client(Config.SUPABASE_URL, Config.SUPABASE_KEY)
+from services.instrumentation import begin_rerun, set_page, end_rerun, render_debug_panel
+from services.assets import use_stylesheets, render_image
+from services import session, auth
 
 # Page configuration
 st.set_page_config(page_title="CortexPM", layout="centered")
 
-# Hardcoded credentials for demonstration purposes
-CREDENTIALS = {
-    "admin@test.com": {"password": "admin123", "role": "Admin"},
-    "faculty@test.com": {"password": "faculty123", "role": "Faculty"},
-    "student@test.com": {"password": "student123", "role": "Student"}
-}
+# Per-rerun instrumentation (queries, timings, payload sizes)
+begin_rerun()
 
 # Initialize session states
 if 'logged_in' not in st.session_state:
@@ -33,109 +17,29 @@ if 'role' not in st.session_state:
 if 'page' not in st.session_state:
     st.session_state.page = 'main'
 
-# CSS styling
-st.markdown("""
-    <style>
-        @import url('https://fonts.googleapis.com/css2?family=Poppins:wght@300;400;500;600;700&display=swap');
-
-        body {
-            background: linear-gradient(135deg, #0d47a1, #1de9b6);
-            color: #f4f4f8;
-            font-family: 'Poppins', sans-serif;
-        }
-
-        .stTextInput > div > div > input {
-            background-color: rgba(255, 255, 255, 0.05);
-            color: #e0f7fa !important;
-            border: 1px solid rgba(255, 255, 255, 0.1);
-            border-radius: 8px;
-            padding: 8px 12px;
-            font-family: 'Poppins', sans-serif;
-        }
-
-        .stButton>button {
-            background: linear-gradient(135deg, #0d47a1, #1de9b6);
-            color: white;
-            font-family: 'Poppins', sans-serif;
-            font-size: 16px;
-            font-weight: 500;
-            border-radius: 8px;
-            padding: 10px 24px;
-            border: none;
-            width: 100%;
-            margin: 5px 0;
-            transition: all 0.3s ease;
-        }
-
-        .stButton>button:hover {
-            background: linear-gradient(135deg, #1565C0, #00BFA5);
-            transform: translateY(-2px);
-        }
-
-        h1 {
-            text-align: center;
-            background: linear-gradient(to right, #4facfe 0%, #00f2fe 100%);
-            -webkit-background-clip: text;
-            -webkit-text-fill-color: transparent;
-            font-family: 'Poppins', sans-serif;
-            font-weight: 700;
-            font-size: 2.8em;
-            margin-bottom: 10px;
-        }
-
-        h2 {
-            text-align: center;
-            color: #a5f3fc;
-            font-family: 'Poppins', sans-serif;
-            font-weight: 300;
-            font-size: 1.5em;
-            margin-bottom: 30px;
-        }
-
-        .element-container .stError {
-            background: rgba(255, 82, 82, 0.1);
-            backdrop-filter: blur(10px);
-            border: 1px solid rgba(255, 82, 82, 0.3);
-            color: #ffcdd2;
-            padding: 10px;
-            border-radius: 8px;
-        }
-
-        .element-container .stSuccess {
-            background: linear-gradient(135deg, rgba(13, 71, 161, 0.1), rgba(29, 233, 182, 0.1));
-            backdrop-filter: blur(10px);
-            border: 1px solid rgba(29, 233, 182, 0.3);
-            color: #e0f7fa;
-            padding: 10px;
-            border-radius: 8px;
-        }
-
-        .stInfo {
-            background: rgba(255, 255, 255, 0.05);
-            backdrop-filter: blur(10px);
-            border: 1px solid rgba(255, 255, 255, 0.1);
-            border-radius: 10px;
-            color: #e0f7fa;
-            padding: 20px;
-            margin: 20px 0;
-        }
-
-        /* Select box styling */
-        .stSelectbox > div > div {
-            background-color: rgba(255, 255, 255, 0.05);
-            color: #e0f7fa;
-            border: 1px solid rgba(255, 255, 255, 0.1);
-            border-radius: 8px;
-        }
-    </style>
-""", unsafe_allow_html=True)
+# Pick a stored session back up after a reload or server restart (session cookie)
+session.restore()
+
+# Every rerun re-checks the signed session token (one HMAC, no password hashing)
+if st.session_state.logged_in:
+    claims = auth.verify_token(st.session_state.get('token'))
+    if claims is None or claims['role'] != st.session_state.role:
+        session.end()
+        st.session_state.page = 'login'
+        st.warning("Your session has expired. Please log in again.")
 
-# Logo
-st.markdown("<div style='text-align: center; margin-bottom: 20px;'>", unsafe_allow_html=True)
-st.image("assets/CORTEX PM LOGO.png", width=350)
-st.markdown("</div>", unsafe_allow_html=True)
+# Write or clear the session cookie after a login, restore or logout
+session.sync_cookie()
+
+# CSS styling (assets/css, read once per process and inlined)
+use_stylesheets("login")
+
+# Logo (pre-sized static variants, cached by the browser)
+render_image("assets/CORTEX PM LOGO.png", width=350, alt="CortexPM")
 
 if not st.session_state.logged_in:
+    set_page(f"Public/{st.session_state.page}")
+
     # Title and tagline
     st.markdown("<h1>CortexPM</h1>", unsafe_allow_html=True)
     st.markdown("<h2>Empowering Collaboration, Tracking Success</h2>", unsafe_allow_html=True)
@@ -162,13 +66,18 @@ if not st.session_state.logged_in:
         password = st.text_input("Password", type="password")
 
         if st.button("Submit"):
-            if username in CREDENTIALS and CREDENTIALS[username]["password"] == password:
-                st.session_state.logged_in = True
-                st.session_state.role = CREDENTIALS[username]["role"]
-                st.success(f"Successfully logged in as {CREDENTIALS[username]['role']}!")
-                st.rerun()
+            client = auth.client_address()
+            if auth.throttled(username, client):
+                st.error("Too many failed attempts. Please wait a few minutes and try again.")
             else:
-                st.error("Invalid username or password")
+                user = auth.authenticate(username, password, client)
+                if user:
+                    token = auth.issue_token(user['id'], user['role'])
+                    session.start(user['username'], user['role'], user['id'], token)
+                    st.success(f"Successfully logged in as {user['role']}!")
+                    st.rerun()
+                else:
+                    st.error("Invalid username or password")
 
     elif st.session_state.page == 'register':
         st.markdown("### Register New Account")
@@ -217,8 +126,7 @@ else:
 
     # Logout button in sidebar
     if st.sidebar.button("Logout"):
-        st.session_state.logged_in = False
-        st.session_state.role = None
+        session.end()
         st.session_state.page = 'main'
         st.rerun()
 
@@ -227,4 +135,7 @@ st.markdown("""
     <div style='text-align: center; padding: 20px; color: #a5f3fc; font-family: "Poppins", sans-serif; font-size: 0.9em; position: fixed; bottom: 0; width: 100%; left: 0; background: rgba(0,0,0,0.1);'>
         © 2024 CortexPM | All rights reserved
     </div>
-""", unsafe_allow_html=True)
\ No newline at end of file
+""", unsafe_allow_html=True)
+
+render_debug_panel()
+end_rerun()
\ No newline at end of file
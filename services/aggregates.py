@@ -0,0 +1,37 @@
+from services.supabaseClient import get_client
+from services.queryCache import apply_filters, cached
+
+
+def count_rows(table, filters=(), count="exact", ttl=None):
+    # Count-only request: PostgREST returns the total in Content-Range and no rows
+    filters = tuple(filters)
+
+    def load():
+        query = get_client().table(table).select("id", count=count, head=True)
+        return apply_filters(query, filters).execute().count or 0
+
+    return cached(("count", table, filters, count), (table,), load, ttl=ttl)
+
+
+def project_status_counts(ttl=None):
+    # Grouped in the database by the project_status_counts view (sql/001_overview_aggregates.sql)
+    def load():
+        return get_client().table("project_status_counts").select("status,count").execute().data
+
+    return cached(("view", "project_status_counts"), ("projects",), load, ttl=ttl)
+
+
+TREND_VIEWS = {"Weekly": "project_status_trend_weekly", "Monthly": "project_status_trend_monthly"}
+
+
+def project_status_trend(granularity="Monthly", since=None, ttl=None):
+    # Read from the incrementally maintained rollups (sql/007_status_rollups.sql):
+    # one row per period and status, independent of the number of projects
+    view = TREND_VIEWS[granularity]
+    filters = (("period", "gte", since.isoformat()),) if since is not None else ()
+
+    def load():
+        query = get_client().table(view).select("period,status,entered,exited,count")
+        return apply_filters(query, filters).order("period").execute().data
+
+    return cached(("view", view, filters), ("projects",), load, ttl=ttl)
@@ -0,0 +1,92 @@
+import hashlib
+import os
+import tempfile
+from functools import lru_cache
+
+import streamlit as st
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STATIC_DIR = os.path.join(ROOT, "static")
+IMAGE_DIR = os.path.join(STATIC_DIR, "img")
+CSS_DIR = os.path.join(ROOT, "assets", "css")
+
+
+@lru_cache(maxsize=64)
+def _version(path, mtime_ns):
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()[:12]
+
+
+def static_url(relative_path):
+    # URL of a file under ./static. The content hash in ?v= makes tornado serve it
+    # with a one-year Cache-Control and changes whenever the file does.
+    path = os.path.join(STATIC_DIR, relative_path)
+    return f"app/static/{relative_path}?v={_version(path, os.stat(path).st_mtime_ns)}"
+
+
+@lru_cache(maxsize=16)
+def _stylesheet(path, mtime_ns):
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def use_stylesheets(*names):
+    # Inline <style> block built from assets/css, read from disk once per file
+    # version rather than on every rerun. (Streamlit's static file server sends
+    # .css as text/plain with nosniff, so <link> tags to it are rejected.)
+    paths = [os.path.join(CSS_DIR, f"{name}.css") for name in ("fonts", *names)]
+    css = "\n".join(_stylesheet(path, os.stat(path).st_mtime_ns) for path in paths)
+    st.markdown(f"<style>{css}</style>", unsafe_allow_html=True)
+
+
+@lru_cache(maxsize=64)
+def _image_bytes(path, mtime_ns, width, fmt):
+    from io import BytesIO
+    from PIL import Image
+
+    with Image.open(path) as img:
+        height = round(img.height * width / img.width)
+        resized = img.resize((width, height), Image.LANCZOS)
+    buf = BytesIO()
+    if fmt == "webp":
+        resized.save(buf, "WEBP", quality=85, method=6)
+    else:
+        resized.save(buf, "PNG", optimize=True)
+    return buf.getvalue()
+
+
+def image_bytes(relative_path, width, fmt="png"):
+    # Source image (relative to the repo root) resized to width and re-encoded.
+    # Cached in memory by source mtime, so editing the source regenerates it.
+    path = os.path.join(ROOT, relative_path)
+    return _image_bytes(path, os.stat(path).st_mtime_ns, width, fmt)
+
+
+def image_url(relative_path, width, fmt="png"):
+    # Write the variant under static/img (once per source change) and return its
+    # long-cacheable static URL
+    path = os.path.join(ROOT, relative_path)
+    stem = os.path.splitext(os.path.basename(path))[0].lower().replace(" ", "-")
+    name = f"{stem}-{width}w.{fmt}"
+    target = os.path.join(IMAGE_DIR, name)
+    if not os.path.exists(target) or os.stat(target).st_mtime_ns < os.stat(path).st_mtime_ns:
+        os.makedirs(IMAGE_DIR, exist_ok=True)
+        # Unique temporary file per writer: cold sessions may race on the same variant
+        with tempfile.NamedTemporaryFile("wb", dir=IMAGE_DIR, delete=False) as f:
+            f.write(image_bytes(relative_path, width, fmt))
+        os.replace(f.name, target)
+    return static_url(f"img/{name}")
+
+
+def render_image(relative_path, width, alt=""):
+    # Pre-sized WebP with a PNG fallback, 1x and 2x, served as static files the
+    # browser caches instead of the full-resolution original on every rerun
+    webp = ", ".join(f"{image_url(relative_path, width * scale, 'webp')} {scale}x" for scale in (1, 2))
+    png = ", ".join(f"{image_url(relative_path, width * scale)} {scale}x" for scale in (1, 2))
+    st.markdown(
+        f"<div style='text-align: center; margin-bottom: 20px;'><picture>"
+        f"<source type='image/webp' srcset='{webp}'>"
+        f"<img src='{image_url(relative_path, width)}' srcset='{png}' width='{width}' alt='{alt}'>"
+        f"</picture></div>",
+        unsafe_allow_html=True,
+    )
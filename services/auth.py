@@ -0,0 +1,177 @@
+import base64
+import hashlib
+import hmac
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+
+from services.supabaseClient import Config, get_client
+from services.queryCache import update_rows
+
+# scrypt cost: 16 MiB and roughly 50 ms per hash on a server core
+SCRYPT_N, SCRYPT_R, SCRYPT_P = 2 ** 14, 8, 1
+SALT_BYTES = 16
+HASH_PREFIX = "scrypt"
+
+
+@st.cache_resource(show_spinner=False)
+def get_hash_executor() -> ThreadPoolExecutor:
+    # hashlib.scrypt releases the GIL, so this bounds how many cores hashing can take
+    return ThreadPoolExecutor(max_workers=Config.AUTH_HASH_WORKERS, thread_name_prefix="cortexpm-auth")
+
+
+def _b64(data):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _unb64(text):
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def _scrypt(password, salt, n=SCRYPT_N, r=SCRYPT_R, p=SCRYPT_P):
+    return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p, maxmem=256 * r * n)
+
+
+def _hash(password):
+    salt = os.urandom(SALT_BYTES)
+    return f"{HASH_PREFIX}${SCRYPT_N}${SCRYPT_R}${SCRYPT_P}${_b64(salt)}${_b64(_scrypt(password, salt))}"
+
+
+def _verify(password, stored):
+    # True if password matches the stored hash. Rows written before hashing was
+    # introduced hold plaintext; those compare in constant time and get rehashed.
+    if not stored.startswith(HASH_PREFIX + "$"):
+        return hmac.compare_digest(password.encode(), stored.encode())
+    _, n, r, p, salt, expected = stored.split("$")
+    return hmac.compare_digest(_scrypt(password, _unb64(salt), int(n), int(r), int(p)), _unb64(expected))
+
+
+def hash_password(password):
+    return get_hash_executor().submit(_hash, password).result()
+
+
+def hash_passwords(passwords):
+    # Bulk variant for imports, spread over the hashing pool
+    return list(get_hash_executor().map(_hash, passwords))
+
+
+def verify_password(password, stored):
+    return get_hash_executor().submit(_verify, password, stored).result()
+
+
+# Compared against when the username does not exist, so unknown and known
+# usernames take the same time to reject
+_DUMMY_HASH = _hash(os.urandom(8).hex())
+
+
+class SlidingWindowLimiter:
+    # At most `limit` events per key within the last `window` seconds
+
+    def __init__(self, limit, window):
+        self.limit = limit
+        self.window = window
+        self._events = defaultdict(deque)
+        self._lock = threading.Lock()
+
+    def _trim(self, key, now):
+        events = self._events[key]
+        while events and events[0] <= now - self.window:
+            events.popleft()
+        if not events:
+            del self._events[key]
+        return events
+
+    def blocked(self, key):
+        with self._lock:
+            return len(self._trim(key, time.monotonic())) >= self.limit
+
+    def hit(self, key):
+        with self._lock:
+            now = time.monotonic()
+            self._trim(key, now)
+            self._events[key].append(now)
+
+    def reset(self, key):
+        with self._lock:
+            self._events.pop(key, None)
+
+
+@st.cache_resource(show_spinner=False)
+def get_login_limiter() -> SlidingWindowLimiter:
+    return SlidingWindowLimiter(Config.AUTH_MAX_FAILURES, Config.AUTH_FAILURE_WINDOW)
+
+
+def client_address():
+    # First hop of X-Forwarded-For when behind a proxy, else None
+    forwarded = st.context.headers.get("X-Forwarded-For", "")
+    return forwarded.split(",")[0].strip() or None
+
+
+def _limit_keys(username, client):
+    keys = [f"user:{username.lower()}"]
+    if client:
+        keys.append(f"client:{client}")
+    return keys
+
+
+def throttled(username, client=None):
+    limiter = get_login_limiter()
+    return any(limiter.blocked(key) for key in _limit_keys(username, client))
+
+
+def authenticate(username, password, client=None):
+    # The users row (without the hash) for valid credentials, else None. Uses the
+    # unique username index and never the shared query cache.
+    rows = get_client().table("users").select("id,name,username,role,password").eq("username", username).limit(1).execute().data
+    user = rows[0] if rows else None
+    stored = user.pop("password") if user else None
+    valid = verify_password(password, stored or _DUMMY_HASH) and bool(stored)
+
+    limiter = get_login_limiter()
+    if not valid:
+        for key in _limit_keys(username, client):
+            limiter.hit(key)
+        return None
+    limiter.reset(f"user:{username.lower()}")
+    if not stored.startswith(HASH_PREFIX + "$"):
+        update_rows("users", {"password": hash_password(password)}, [("id", "eq", user["id"])])
+    return user
+
+
+def change_password(username, old_password, new_password, client=None):
+    # True when the old password checked out and the new hash was stored
+    user = authenticate(username, old_password, client)
+    if user is None:
+        return False
+    update_rows("users", {"password": hash_password(new_password)}, [("id", "eq", user["id"])])
+    return True
+
+
+def _sign(payload):
+    return _b64(hmac.new(Config.SECRET_KEY.encode(), payload.encode(), hashlib.sha256).digest())
+
+
+def issue_token(user_id, role, ttl=None):
+    # Signed "payload.signature" token; validating it is one HMAC, no rehashing
+    claims = {"uid": user_id, "role": role, "exp": int(time.time() + (ttl or Config.SESSION_TTL))}
+    payload = _b64(json.dumps(claims, separators=(",", ":")).encode())
+    return f"{payload}.{_sign(payload)}"
+
+
+def verify_token(token):
+    # Claims dict for a valid, unexpired token, else None
+    if not token:
+        return None
+    payload, _, signature = token.partition(".")
+    if not hmac.compare_digest(signature, _sign(payload)):
+        return None
+    try:
+        claims = json.loads(_unb64(payload))
+    except ValueError:
+        return None
+    return claims if claims.get("exp", 0) > time.time() else None
@@ -0,0 +1,101 @@
+import threading
+
+import streamlit as st
+
+from services.supabaseClient import get_client
+from services.queryCache import call_rpc, insert_rows
+
+PAGE_SIZE = 50
+# Newest messages held in each shared window; older history is loaded per session
+WINDOW = 200
+# Ids re-read below the newest one on every poll, so messages whose transaction
+# commits after a higher id was already seen are still picked up
+OVERLAP = 20
+
+
+@st.cache_resource(show_spinner=False, max_entries=1024, ttl=3600)
+def _shared_conversation(table, key_column, key):
+    # One window per conversation for the whole process: every participant and
+    # browser tab reads the same newest messages and polls share one cursor
+    return Conversation(table, key_column, key)
+
+
+def direct_conversation(user_id, other_id):
+    low, high = sorted((int(user_id), int(other_id)))
+    return _shared_conversation("direct_messages", "conversation", f"{low}:{high}")
+
+
+def team_conversation(team_id):
+    return _shared_conversation("team_messages", "team_id", int(team_id))
+
+
+class Conversation:
+    # Shared window onto the newest WINDOW messages of an append-only table, in
+    # ascending id order. Polling re-reads a small overlap below the newest id
+    # and skips ids already held. Anything older than the window is fetched per
+    # session with older()/between() and never added to the shared list.
+
+    def __init__(self, table, key_column, key):
+        self.table = table
+        self.key_column = key_column
+        self.key = key
+        self.messages = []
+        self.has_older = True
+        self._ids = set()
+        self._lock = threading.Lock()
+
+    def _query(self):
+        return get_client().table(self.table).select("id,sender_id,body,created_at").eq(self.key_column, self.key)
+
+    def snapshot(self):
+        # (messages, has_older) as of now, safe while another session polls
+        with self._lock:
+            return list(self.messages), self.has_older
+
+    def older(self, before_id, limit=PAGE_SIZE):
+        # Up to limit messages before before_id, ascending
+        rows = self._query().lt("id", before_id).order("id", desc=True).limit(limit).execute().data
+        return rows[::-1]
+
+    def between(self, after_id, before_id):
+        return self._query().gt("id", after_id).lt("id", before_id).order("id").execute().data
+
+    def poll(self):
+        # Returns the number of new messages
+        with self._lock:
+            if not self.messages:
+                rows = self._query().order("id", desc=True).limit(PAGE_SIZE).execute().data
+                rows.reverse()
+                self.has_older = len(rows) == PAGE_SIZE
+            else:
+                rows = self._query().gt("id", self.messages[-1]["id"] - OVERLAP).order("id").execute().data
+            new_rows = [row for row in rows if row["id"] not in self._ids]
+            if new_rows:
+                self.messages = sorted(self.messages + new_rows, key=lambda message: message["id"])
+                self._ids.update(row["id"] for row in new_rows)
+            if len(self.messages) > WINDOW:
+                for message in self.messages[:-WINDOW]:
+                    self._ids.discard(message["id"])
+                del self.messages[:-WINDOW]
+                self.has_older = True
+            return len(new_rows)
+
+
+def send_direct(sender_id, recipient_id, body):
+    low, high = sorted((int(sender_id), int(recipient_id)))
+    return insert_rows("direct_messages", {
+        "conversation": f"{low}:{high}",
+        "sender_id": sender_id,
+        "recipient_id": recipient_id,
+        "body": body,
+    })[0]
+
+
+def send_team(team_id, sender_id, body):
+    # The message and a receipt for every other member, in one transaction
+    # (sql/013_send_team_message.sql)
+    return call_rpc("send_team_message", {
+        "p_team_id": team_id,
+        "p_sender_id": sender_id,
+        "p_body": body,
+    }, invalidates=("team_messages", "team_message_receipts"))
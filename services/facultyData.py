@@ -0,0 +1,48 @@
+from services.supabaseClient import get_client
+from services.queryCache import cached
+
+# Any write to these tables can change a mentor's overview
+OVERVIEW_TABLES = ("teams", "projects", "team_members", "users", "submissions", "grades")
+
+COLUMNS = ",".join((
+    "team_id", "team_name", "team_status", "projects", "members", "recent_submissions",
+    "grade_count", "latest_grade", "latest_feedback", "last_graded_at",
+))
+
+
+def mentor_overview(mentor_id, ttl=None):
+    # One row per team mentored by mentor_id with its projects, members, recent
+    # submissions and latest grade embedded (sql/009_mentor_overview.sql): a single
+    # request however many teams, shared by every session of the same mentor
+    def load():
+        return get_client().table("mentor_team_overview").select(COLUMNS) \
+            .eq("mentor_id", mentor_id).order("team_id").execute().data
+
+    return cached(("mentor_overview", mentor_id), OVERVIEW_TABLES, load, ttl=ttl)
+
+
+def assigned_projects(overview):
+    # Flattened (team, project) rows for the Assigned Teams table
+    return [
+        {"team_id": team["team_id"], "team_name": team["team_name"], "project_id": project["id"],
+         "title": project["title"], "status": project["status"]}
+        for team in overview for project in team["projects"]
+    ]
+
+
+def mentees(overview):
+    return [
+        {"id": member["id"], "name": member["name"], "username": member["username"],
+         "team_id": team["team_id"], "team_name": team["team_name"]}
+        for team in overview for member in team["members"]
+    ]
+
+
+def recent_submissions(overview):
+    titles = {project["id"]: project["title"] for team in overview for project in team["projects"]}
+    rows = [
+        {"id": submission["id"], "team_id": team["team_id"], "project": titles.get(submission["project_id"]),
+         "submitted_by": submission["submitted_by"], "created_at": submission["created_at"]}
+        for team in overview for submission in team["recent_submissions"]
+    ]
+    return sorted(rows, key=lambda row: row["created_at"], reverse=True)
@@ -0,0 +1,35 @@
+import pyarrow as pa
+
+# Low-cardinality columns stored dictionary-encoded (pandas Categorical): each
+# distinct value is kept once and rows hold small integer codes
+CATEGORICAL = frozenset({"status", "role", "level", "action", "type"})
+
+
+def arrow_table(rows, columns, categorical=CATEGORICAL):
+    # Columnar Arrow table straight from a PostgREST JSON response (a list of
+    # dicts); one pass per column, no intermediate object-dtype DataFrame
+    arrays = []
+    for column in columns:
+        array = pa.array([row.get(column) for row in rows])
+        if column in categorical and pa.types.is_string(array.type):
+            array = array.dictionary_encode()
+        arrays.append(array)
+    return pa.Table.from_arrays(arrays, names=list(columns))
+
+
+def _arrow_dtype(arrow_type):
+    # Arrow-backed pandas dtypes, except dictionaries which become Categorical
+    import pandas as pd
+
+    if pa.types.is_dictionary(arrow_type):
+        return None
+    return pd.ArrowDtype(arrow_type)
+
+
+def arrow_frame(table):
+    # pandas view of an Arrow table for Plotly and vectorized work; values stay in Arrow buffers
+    return table.to_pandas(types_mapper=_arrow_dtype)
+
+
+def frame(rows, columns, categorical=CATEGORICAL):
+    return arrow_frame(arrow_table(rows, columns, categorical))
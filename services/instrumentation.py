@@ -0,0 +1,207 @@
+import contextvars
+import functools
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+import streamlit as st
+
+logger = logging.getLogger("cortexpm.metrics")
+
+# Recorder for the rerun executing in the current context. Worker threads see it
+# when work is submitted through contextvars.copy_context() (see services.workers).
+_current = contextvars.ContextVar("cortexpm_rerun", default=None)
+
+
+class Recorder:
+    # Everything measured during one script rerun of one session
+
+    def __init__(self):
+        self.page = "unknown"
+        self.started = time.perf_counter()
+        self.events = []
+        self._lock = threading.Lock()
+
+    def add(self, event):
+        with self._lock:
+            self.events.append(event)
+
+    def queries(self):
+        return [event for event in self.events if event["kind"] == "query"]
+
+    def summary(self):
+        queries = self.queries()
+        return {
+            "page": self.page,
+            "duration_ms": round((time.perf_counter() - self.started) * 1000, 1),
+            "queries": len(queries),
+            "query_ms": round(sum(event["duration_ms"] for event in queries), 1),
+            "rows": sum(event["rows"] for event in queries),
+            "bytes": sum(event["bytes"] for event in queries),
+        }
+
+
+class Metrics:
+    # Process-wide Prometheus-style counters, keyed by (name, labels)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = defaultdict(float)
+
+    def inc(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] += value
+
+    def text(self):
+        # Prometheus text exposition format
+        with self._lock:
+            counters = sorted(self._counters.items())
+        lines, typed = [], set()
+        for (name, labels), value in counters:
+            if name not in typed:
+                lines.append(f"# TYPE {name} counter")
+                typed.add(name)
+            rendered = ",".join(f'{key}="{str(val)}"' for key, val in labels)
+            lines.append(f"{name}{{{rendered}}} {value:g}" if rendered else f"{name} {value:g}")
+        return "\n".join(lines) + "\n"
+
+
+@st.cache_resource(show_spinner=False)
+def get_metrics() -> Metrics:
+    return Metrics()
+
+
+def current():
+    return _current.get()
+
+
+def begin_rerun():
+    recorder = Recorder()
+    _current.set(recorder)
+    return recorder
+
+
+def set_page(page):
+    recorder = current()
+    if recorder is not None:
+        recorder.page = page
+
+
+def end_rerun():
+    # Fold the rerun into the process counters, emit a structured log line and
+    # refresh the Prometheus textfile if METRICS_TEXTFILE is set
+    recorder = current()
+    if recorder is None:
+        return
+    _current.set(None)
+    summary = recorder.summary()
+    metrics = get_metrics()
+    metrics.inc("cortexpm_reruns_total", page=recorder.page)
+    metrics.inc("cortexpm_rerun_seconds_total", summary["duration_ms"] / 1000, page=recorder.page)
+    logger.info(json.dumps({"event": "rerun", **summary, "steps": [e for e in recorder.events if e["kind"] == "step"]}))
+
+    path = os.getenv("METRICS_TEXTFILE")
+    if path:
+        directory = os.path.dirname(os.path.abspath(path))
+        with tempfile.NamedTemporaryFile("w", dir=directory, delete=False) as f:
+            f.write(metrics.text())
+        os.replace(f.name, path)
+
+
+def fragment(func, run_every=None):
+    # st.fragment whose partial reruns are recorded like full reruns, under
+    # "<page>#<function>", so per-interaction query counts show up in the
+    # rerun log and the Prometheus counters
+    recorder = current()
+    page = f"{recorder.page if recorder else 'unknown'}#{func.__name__.strip('_')}"
+
+    @functools.wraps(func)
+    def run(*args, **kwargs):
+        if current() is not None:
+            # Part of a full rerun, which is already being recorded
+            return func(*args, **kwargs)
+        begin_rerun().page = page
+        try:
+            return func(*args, **kwargs)
+        finally:
+            end_rerun()
+
+    return st.fragment(run, run_every=run_every)
+
+
+@contextmanager
+def step(name):
+    # Time a render step (DataFrame construction, chart rendering, ...)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - start
+        recorder = current()
+        page = recorder.page if recorder else "unknown"
+        get_metrics().inc("cortexpm_step_seconds_total", duration, page=page, step=name)
+        if recorder is not None:
+            recorder.add({"kind": "step", "name": name, "duration_ms": round(duration * 1000, 1)})
+
+
+def _response_rows(response):
+    # PostgREST reports the returned range as "first-last/total" or "*/total"
+    content_range = response.headers.get("content-range", "")
+    first_last = content_range.split("/")[0]
+    if "-" in first_last:
+        first, last = first_last.split("-")
+        return int(last) - int(first) + 1
+    return 0
+
+
+def on_response(response):
+    # httpx response hook installed on the shared Supabase session; covers every query
+    response.read()
+    request = response.request
+    table = request.url.path.removeprefix("/rest/v1/")
+    duration = response.elapsed.total_seconds()
+    rows, size = _response_rows(response), len(response.content)
+
+    metrics = get_metrics()
+    labels = {"table": table, "method": request.method}
+    metrics.inc("cortexpm_queries_total", **labels)
+    metrics.inc("cortexpm_query_seconds_total", duration, **labels)
+    metrics.inc("cortexpm_query_rows_total", rows, **labels)
+    metrics.inc("cortexpm_query_bytes_total", size, **labels)
+    if response.status_code >= 400:
+        metrics.inc("cortexpm_query_errors_total", **labels)
+
+    recorder = current()
+    if recorder is not None:
+        recorder.add({
+            "kind": "query", "name": f"{request.method} {table}", "duration_ms": round(duration * 1000, 1),
+            "rows": rows, "bytes": size, "status": response.status_code,
+        })
+
+
+def debug_panel_enabled():
+    # ?debug=1 is honoured only for a logged-in admin: the panel exposes the
+    # process-wide metrics of every session
+    if os.getenv("CORTEXPM_DEBUG") == "1":
+        return True
+    admin = st.session_state.get("logged_in") and st.session_state.get("role") == "Admin"
+    return bool(admin) and st.query_params.get("debug") == "1"
+
+
+def render_debug_panel():
+    # Optional sidebar panel describing the current rerun
+    recorder = current()
+    if recorder is None or not debug_panel_enabled():
+        return
+    summary = recorder.summary()
+    with st.sidebar.expander("Debug: this rerun", expanded=False):
+        st.write(f"**{summary['page']}** in {summary['duration_ms']} ms")
+        st.write(f"{summary['queries']} queries, {summary['query_ms']} ms, {summary['rows']} rows, {summary['bytes'] / 1024:.1f} KiB")
+        st.dataframe(recorder.events, hide_index=True)
+        st.download_button("Prometheus metrics", get_metrics().text(), file_name="cortexpm_metrics.prom", mime="text/plain")
@@ -0,0 +1,76 @@
+import threading
+from collections import deque
+
+import streamlit as st
+
+from services.supabaseClient import get_client
+from services.queryCache import apply_filters
+
+
+# Ids re-read below the cursor on every poll, so rows whose transaction commits
+# after a higher id was already seen are still picked up
+OVERLAP = 100
+
+
+class LogTail:
+    # Incremental follower for an append-only table (logs, activity). Remembers
+    # the highest id seen and keeps at most `maxlen` recent rows in a ring buffer;
+    # each poll fetches only rows from just below the cursor and drops the ones
+    # already seen. `appended` counts every row ever added, so each viewer
+    # can tell how many arrived since it last looked.
+
+    def __init__(self, table, columns, filters=(), maxlen=1000, batch_size=500):
+        self.table = table
+        self.columns = ",".join(dict.fromkeys((*columns, "id")))
+        self.filters = tuple(filters)
+        self.rows = deque(maxlen=maxlen)
+        self.batch_size = batch_size
+        self.last_id = None
+        self.appended = 0
+        self._floor = 0
+        self._seen = set()
+        self._lock = threading.Lock()
+
+    def _query(self):
+        return apply_filters(get_client().table(self.table).select(self.columns), self.filters)
+
+    def poll(self):
+        # Returns the number of new rows appended
+        with self._lock:
+            return self._poll()
+
+    def snapshot(self):
+        # Newest-first copy of the buffer, safe while another session polls
+        with self._lock:
+            return sorted(self.rows, key=lambda row: row["id"], reverse=True)
+
+    def _poll(self):
+        if self.last_id is None:
+            # Start from the newest rows that fit in the buffer; anything older is
+            # never re-read
+            rows = self._query().order("id", desc=True).limit(self.rows.maxlen).execute().data
+            rows.reverse()
+            if rows:
+                self._floor = rows[0]["id"] - 1
+        else:
+            after = max(self._floor, self.last_id - OVERLAP)
+            rows = self._query().gt("id", after).order("id").limit(self.batch_size + OVERLAP).execute().data
+        new_rows = [row for row in rows if row["id"] not in self._seen]
+        self.rows.extend(new_rows)
+        self.appended += len(new_rows)
+        if rows:
+            self.last_id = rows[-1]["id"] if self.last_id is None else max(self.last_id, rows[-1]["id"])
+            # Only ids inside the overlap window can come back from a poll
+            window = self.last_id - OVERLAP
+            self._seen = {row_id for row_id in self._seen if row_id > window}
+            self._seen.update(row["id"] for row in new_rows if row["id"] > window)
+        return len(new_rows)
+
+
+@st.cache_resource(show_spinner=False, max_entries=32, ttl=3600)
+def shared_tail(table, columns, filters=()):
+    # One tail per source and filter set for the whole process, so admins watching
+    # the same view share one buffer. Every viewer's fragment still polls on its
+    # own interval, but polls are serialized and each only fetches rows past the
+    # shared cursor, so concurrent viewers mostly get back empty batches.
+    return LogTail(table, columns, filters)
@@ -0,0 +1,50 @@
+from datetime import datetime, timezone
+
+from services.supabaseClient import get_client
+from services.queryCache import cached, call_rpc, update_rows
+
+INBOX_TABLES = ("user_notifications", "notification_counters")
+
+# Badges tolerate a few seconds of staleness; reads by the owner after their
+# own writes are invalidated immediately.
+COUNTER_TTL = 10
+
+
+def announce(message, kind, role=None, team_id=None):
+    # Store the notification once and deliver inbox rows to its audience in bulk,
+    # in one transaction (sql/012_announce.sql). Returns the number of recipients.
+    return call_rpc("announce", {
+        "p_message": message,
+        "p_type": kind,
+        "p_role": role,
+        "p_team_id": team_id,
+    }, invalidates=("notifications", *INBOX_TABLES))
+
+
+def unread_count(user_id):
+    # Single-key lookup of the trigger-maintained counter
+    def load():
+        rows = get_client().table("notification_counters").select("unread").eq("user_id", user_id).execute().data
+        return rows[0]["unread"] if rows else 0
+
+    return cached(("unread", user_id), INBOX_TABLES, load, ttl=COUNTER_TTL)
+
+
+def inbox(user_id, unread_only=False, limit=50):
+    def load():
+        query = get_client().table("user_notifications") \
+            .select("id,read_at,created_at,notifications(message,type)") \
+            .eq("user_id", user_id)
+        if unread_only:
+            query = query.is_("read_at", "null")
+        return query.order("id", desc=True).limit(limit).execute().data
+
+    return cached(("inbox", user_id, unread_only, limit), INBOX_TABLES, load)
+
+
+def mark_read(user_id, ids):
+    return update_rows("user_notifications", {"read_at": datetime.now(timezone.utc).isoformat()}, [
+        ("user_id", "eq", user_id),
+        ("id", "in_", tuple(ids)),
+        ("read_at", "is_", "null"),
+    ])
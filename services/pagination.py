@@ -0,0 +1,75 @@
+from services.supabaseClient import get_client
+from services.queryCache import apply_filters, cached
+from services.workers import submit
+from services.frames import arrow_table
+
+
+def _quote(value):
+    # Double-quote values inside PostgREST logic trees so commas and parentheses survive
+    text = str(value).replace('\\', '\\\\').replace('"', '\\"')
+    return f'"{text}"'
+
+
+def _after_cursor(query, sort, desc, cursor):
+    # Keyset condition for rows strictly after cursor in (sort, id) order.
+    # NULLs keep Postgres' default place, which the (col, id) btrees in
+    # sql/002_keyset_indexes.sql serve in both directions: last ascending,
+    # first descending.
+    op = "lt" if desc else "gt"
+    sort_value, last_id = cursor
+    if sort == "id":
+        return getattr(query, op)("id", last_id)
+    if sort_value is None:
+        if desc:
+            # Rest of the leading NULL block, then every non-NULL row
+            return query.or_(f"and({sort}.is.null,id.lt.{_quote(last_id)}),{sort}.not.is.null")
+        # Inside the trailing NULL block
+        return query.is_(sort, "null").gt("id", last_id)
+    # The range bound gives the index scan its start point, so a deep page
+    # costs the same as the first. It also drops NULLs, which ascending pages
+    # pick up from _null_tail once the non-NULL rows run out.
+    query = getattr(query, "lte" if desc else "gte")(sort, sort_value)
+    return query.or_(f"{sort}.{op}.{_quote(sort_value)},id.{op}.{_quote(last_id)}")
+
+
+def _null_tail(sort, desc, cursor):
+    # An ascending page after a non-NULL cursor stops at the last non-NULL
+    # value (see _after_cursor); the NULL rows that sort after it come from a
+    # second query, only on the page where the non-NULL rows run out
+    return cursor is not None and cursor[0] is not None and sort != "id" and not desc
+
+
+def fetch_page(table, columns, sort="id", desc=False, cursor=None, page_size=50, filters=(), ttl=None):
+    # Returns (page, next_cursor) where page is a pyarrow.Table; next_cursor is None
+    # on the last page. The projection always carries id and the sort column so the
+    # cursor can be built. Pages are cached as Arrow, not as lists of dicts.
+    columns = tuple(dict.fromkeys((*columns, "id", sort)))
+    filters = tuple(filters)
+
+    def select():
+        return apply_filters(get_client().table(table).select(",".join(columns)), filters)
+
+    def load():
+        query = select()
+        if cursor is not None:
+            query = _after_cursor(query, sort, desc, cursor)
+        query = query.order(sort, desc=desc)
+        if sort != "id":
+            query = query.order("id", desc=desc)
+        # One extra row tells us whether another page exists
+        rows = query.limit(page_size + 1).execute().data
+        if len(rows) <= page_size and _null_tail(sort, desc, cursor):
+            nulls = select().is_(sort, "null").order("id").limit(page_size + 1 - len(rows))
+            rows += nulls.execute().data
+        if len(rows) > page_size:
+            last = rows[page_size - 1]
+            return arrow_table(rows[:page_size], columns), (last[sort], last["id"])
+        return arrow_table(rows, columns), None
+
+    key = ("page", table, columns, sort, desc, cursor, page_size, filters)
+    return cached(key, (table,), load, ttl=ttl)
+
+
+def prefetch_page(*args, **kwargs):
+    # Warm the shared query cache with a page in the background
+    return submit(fetch_page, *args, **kwargs)
@@ -0,0 +1,97 @@
+import hashlib
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+import streamlit as st
+
+from services.supabaseClient import Config
+from services.queryCache import TTLCache
+
+# Rendered QR codes are cached in memory (bounded LRU, no expiry) and, when
+# QR_CACHE_DIR is set, on disk so they survive restarts and are shared between
+# server processes.
+
+ERROR_CORRECTION = {"L": 1, "M": 0, "Q": 3, "H": 2}  # qrcode.constants values
+
+
+@st.cache_resource(show_spinner=False)
+def get_qr_cache() -> TTLCache:
+    return TTLCache(maxsize=Config.QR_CACHE_SIZE, ttl=0)
+
+
+def _render(url, fmt, box_size, border, error_correction):
+    import qrcode
+
+    qr = qrcode.QRCode(
+        version=None,
+        error_correction=ERROR_CORRECTION[error_correction],
+        box_size=box_size,
+        border=border,
+    )
+    qr.add_data(url)
+    qr.make(fit=True)
+    if fmt == "svg":
+        from qrcode.image.svg import SvgPathImage
+        img = qr.make_image(image_factory=SvgPathImage)
+    else:
+        img = qr.make_image(fill_color="black", back_color="white")
+    buf = BytesIO()
+    img.save(buf)
+    return buf.getvalue()
+
+
+def _disk_path(key):
+    digest = hashlib.sha256(repr(key).encode()).hexdigest()
+    return os.path.join(Config.QR_CACHE_DIR, digest[:2], f"{digest}.{key[1]}")
+
+
+def _store(key, data):
+    get_qr_cache().set(key, data)
+    if Config.QR_CACHE_DIR:
+        path = _disk_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Unique temporary file per writer, so concurrent sessions never replace
+        # each other's partial output
+        with tempfile.NamedTemporaryFile("wb", dir=os.path.dirname(path), delete=False) as f:
+            f.write(data)
+        os.replace(f.name, path)
+
+
+def profile_url(username):
+    return Config.PROFILE_URL.format(username=username)
+
+
+def qr_code(url, fmt="png", box_size=10, border=4, error_correction="L"):
+    # Ready-to-serve PNG or SVG bytes for url, rendered at most once per parameter set
+    key = (url, fmt, box_size, border, error_correction)
+    data = get_qr_cache().get(key)
+    if data is None and Config.QR_CACHE_DIR and os.path.exists(_disk_path(key)):
+        with open(_disk_path(key), "rb") as f:
+            data = f.read()
+        get_qr_cache().set(key, data)
+    if data is None:
+        data = _render(*key)
+        _store(key, data)
+    return data
+
+
+def pregenerate(urls, fmt="png", box_size=10, border=4, error_correction="L", workers=None):
+    # Render QR codes for a whole cohort up front on a process pool (rendering is
+    # CPU-bound pure Python). Returns the number of codes rendered.
+    keys = [(url, fmt, box_size, border, error_correction) for url in dict.fromkeys(urls)]
+    missing = [key for key in keys if get_qr_cache().get(key) is None and not (Config.QR_CACHE_DIR and os.path.exists(_disk_path(key)))]
+    if not Config.QR_CACHE_DIR:
+        # Without a disk cache, codes beyond the memory cache would be evicted
+        # as soon as they are stored
+        missing = missing[:Config.QR_CACHE_SIZE]
+    if not missing:
+        return 0
+    # Spawned, not forked: this runs on a script thread of a multithreaded
+    # server, and a forked child can inherit locks held by other threads
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        for key, data in zip(missing, pool.map(_render, *zip(*missing), chunksize=32)):
+            _store(key, data)
+    return len(missing)
@@ -0,0 +1,120 @@
+import threading
+import time
+from collections import OrderedDict
+
+import streamlit as st
+
+from services.supabaseClient import Config, get_client
+
+_MISSING = object()
+
+
+class TTLCache:
+    # Thread-safe LRU cache whose entries also expire after a TTL. Each entry
+    # remembers the tables it was read from so writes can invalidate it.
+
+    def __init__(self, maxsize=512, ttl=30.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                return default
+            value, tables, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, tables=(), ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._entries[key] = (value, frozenset(tables), expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, table):
+        with self._lock:
+            stale = [key for key, (_, tables, _) in self._entries.items() if table in tables]
+            for key in stale:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+@st.cache_resource(show_spinner=False)
+def get_query_cache() -> TTLCache:
+    return TTLCache(maxsize=Config.QUERY_CACHE_SIZE, ttl=Config.QUERY_CACHE_TTL)
+
+
+def cached(key, tables, loader, ttl=None):
+    # Return the cached value for key, calling loader() on a miss
+    cache = get_query_cache()
+    value = cache.get(key, _MISSING)
+    if value is _MISSING:
+        value = loader()
+        cache.set(key, value, tables=tables, ttl=ttl)
+    return value
+
+
+def apply_filters(query, filters):
+    # filters are (column, operator, value) tuples, e.g. ("status", "eq", "Pending")
+    for column, op, value in filters:
+        query = getattr(query, op)(column, value)
+    return query
+
+
+def select_rows(table, columns="*", filters=(), order=None, desc=False, limit=None, ttl=None):
+    filters = tuple(filters)
+
+    def load():
+        query = apply_filters(get_client().table(table).select(columns), filters)
+        if order:
+            query = query.order(order, desc=desc)
+        if limit:
+            query = query.limit(limit)
+        return query.execute().data
+
+    key = ("select", table, columns, filters, order, desc, limit)
+    return cached(key, (table,), load, ttl=ttl)
+
+
+def insert_rows(table, rows, returning="representation"):
+    response = get_client().table(table).insert(rows, returning=returning).execute()
+    get_query_cache().invalidate(table)
+    return response.data
+
+
+def update_rows(table, values, filters):
+    query = apply_filters(get_client().table(table).update(values), filters)
+    response = query.execute()
+    get_query_cache().invalidate(table)
+    return response.data
+
+
+def delete_rows(table, filters):
+    query = apply_filters(get_client().table(table).delete(), filters)
+    response = query.execute()
+    get_query_cache().invalidate(table)
+    return response.data
+
+
+def call_rpc(name, params=None, invalidates=()):
+    # Call a database function; invalidates lists the tables it writes to
+    response = get_client().rpc(name, params or {}).execute()
+    cache = get_query_cache()
+    for table in invalidates:
+        cache.invalidate(table)
+    return response.data
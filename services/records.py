@@ -0,0 +1,28 @@
+from services.supabaseClient import get_client
+from services.queryCache import update_rows
+
+# Single-row edits with optimistic concurrency (sql/011_row_versions.sql): a
+# record is fetched once with its updated_at, and the update only applies if
+# that updated_at is still current.
+
+
+def fetch_record(table, columns, filters):
+    # Uncached: an edit has to start from the row as it is now
+    query = get_client().table(table).select(f"{columns},updated_at")
+    for column, value in filters:
+        query = query.eq(column, value)
+    rows = query.limit(1).execute().data
+    return rows[0] if rows else None
+
+
+def changed_fields(record, values):
+    return {column: value for column, value in values.items() if value != record.get(column)}
+
+
+def update_record(table, record, values, key="id"):
+    # Writes only the given columns. Returns the record with the new values and
+    # updated_at, or None if the row was changed or removed since it was fetched.
+    rows = update_rows(table, values, [(key, "eq", record[key]), ("updated_at", "eq", record["updated_at"])])
+    if not rows:
+        return None
+    return {**record, **values, "updated_at": rows[0]["updated_at"]}
@@ -0,0 +1,171 @@
+import calendar
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import date, timedelta
+from io import BytesIO
+
+import streamlit as st
+
+from services.supabaseClient import get_client
+from services.queryCache import TTLCache, apply_filters
+
+FORMATS = {
+    "CSV": ("csv", "text/csv"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+    "XLSX": ("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+}
+
+# Rows per request when pulling a report window (PostgREST's usual max-rows)
+FETCH_PAGE = 1000
+
+# Finished reports are kept for an hour; a report for a closed period does not change
+REPORT_TTL = 3600
+
+
+class ReportEngine:
+    # Queues report jobs on a small dedicated pool so long reports never compete
+    # with page queries, and shares both running jobs and finished results by
+    # (report type, period, scope, format) across sessions. A job is dropped as
+    # soon as it finishes; only the bounded result cache keeps report bytes.
+
+    def __init__(self, workers=2):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="cortexpm-report")
+        self._results = TTLCache(maxsize=64, ttl=REPORT_TTL)
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def request(self, key, build):
+        # Future for the report identified by key, reusing a cached result or a running job
+        with self._lock:
+            data = self._results.get(key)
+            if data is not None:
+                finished = Future()
+                finished.set_result(data)
+                return finished
+            job = self._jobs.get(key)
+            if job is None:
+                job = self._executor.submit(self._run, key, build)
+                self._jobs[key] = job
+            return job
+
+    def _run(self, key, build):
+        try:
+            data = build()
+            self._results.set(key, data)
+            return data
+        finally:
+            # Failed jobs are retried by the next request
+            with self._lock:
+                self._jobs.pop(key, None)
+
+
+@st.cache_resource(show_spinner=False)
+def get_report_engine() -> ReportEngine:
+    return ReportEngine()
+
+
+def report_period(report_type, month=None, year=None, start_date=None, end_date=None):
+    # (start, end) dates, end exclusive, plus a label for the file name
+    if report_type == "Monthly Report":
+        month_number = list(calendar.month_name).index(month)
+        start = date(year, month_number, 1)
+        end = date(year + month_number // 12, month_number % 12 + 1, 1)
+        return start, end, f"{year}-{month_number:02d}"
+    if report_type == "Yearly Report":
+        return date(year, 1, 1), date(year + 1, 1, 1), str(year)
+    return start_date, end_date + timedelta(days=1), f"{start_date}_{end_date}"
+
+
+def _fetch_all(table, columns, filters):
+    # All matching rows, walked by id so each request is an index range scan
+    rows, last_id = [], None
+    while True:
+        query = apply_filters(get_client().table(table).select(",".join(columns)), filters)
+        if last_id is not None:
+            query = query.gt("id", last_id)
+        page = query.order("id").limit(FETCH_PAGE).execute().data
+        rows.extend(page)
+        if len(page) < FETCH_PAGE:
+            return rows
+        last_id = page[-1]["id"]
+
+
+def _fetch_window(table, columns, start, end, filters=()):
+    # All rows created in [start, end)
+    return _fetch_all(table, columns, [("created_at", "gte", start.isoformat()), ("created_at", "lt", end.isoformat()), *filters])
+
+
+def _frames(start, end, team_ids=None):
+    import pandas as pd
+
+    scope = [("team_id", "in_", tuple(team_ids))] if team_ids is not None else []
+    projects = pd.DataFrame(_fetch_window("projects", ("id", "team_id", "status", "created_at"), start, end, scope),
+                            columns=["id", "team_id", "status", "created_at"])
+    approvals = pd.DataFrame(_fetch_window("approvals", ("id", "team_id", "status", "created_at"), start, end, scope),
+                             columns=["id", "team_id", "status", "created_at"])
+    if team_ids is not None:
+        # Submissions in the window may be for projects created before it, so
+        # they are scoped by every project of the teams, not just the window's
+        project_ids = tuple(row["id"] for row in _fetch_all("projects", ("id",), scope))
+        submission_scope = [("project_id", "in_", project_ids)]
+    else:
+        submission_scope = []
+    submissions = pd.DataFrame(_fetch_window("submissions", ("id", "project_id", "created_at"), start, end, submission_scope),
+                               columns=["id", "project_id", "created_at"])
+    grades = pd.DataFrame(_fetch_window("grades", ("id", "team_id", "grade", "created_at"), start, end, scope),
+                          columns=["id", "team_id", "grade", "created_at"])
+    return projects, approvals, submissions, grades
+
+
+def _aggregate(projects, approvals, submissions, grades):
+    # Vectorized summaries, one DataFrame per report section
+    import pandas as pd
+
+    for frame in (projects, approvals, submissions, grades):
+        frame["month"] = pd.to_datetime(frame["created_at"], utc=True, format="ISO8601").dt.strftime("%Y-%m")
+    grades["grade"] = pd.to_numeric(grades["grade"], errors="coerce")
+    return {
+        "Overview": pd.DataFrame({
+            "metric": ["projects", "approvals", "submissions", "graded teams", "mean grade"],
+            "value": [len(projects), len(approvals), len(submissions), grades["team_id"].nunique(), grades["grade"].mean()],
+        }),
+        "Projects by status": projects.groupby(["month", "status"]).size().unstack(fill_value=0).reset_index(),
+        "Approvals by status": approvals.groupby(["month", "status"]).size().unstack(fill_value=0).reset_index(),
+        "Submissions by month": submissions.groupby("month").agg(submissions=("id", "size"), projects=("project_id", "nunique")).reset_index(),
+        "Grades by team": grades.groupby("team_id")["grade"].agg(["count", "mean", "min", "max"]).reset_index(),
+    }
+
+
+def _encode(sections, fmt):
+    import pandas as pd
+
+    buf = BytesIO()
+    if fmt == "XLSX":
+        with pd.ExcelWriter(buf, engine="openpyxl") as writer:
+            for name, frame in sections.items():
+                frame.to_excel(writer, sheet_name=name[:31], index=False)
+        return buf.getvalue()
+    # CSV and Parquet are single tables: sections stacked in long format. Sections
+    # may have their own "value" column (Overview), so melt into a private name.
+    long = pd.concat(
+        [
+            frame.astype(str).rename(columns={frame.columns[0]: "key"})
+            .melt(id_vars=["key"], var_name="measure", value_name="_value").assign(section=name)
+            for name, frame in sections.items()
+        ],
+        ignore_index=True,
+    ).rename(columns={"_value": "value"})[["section", "key", "measure", "value"]]
+    if fmt == "Parquet":
+        long.to_parquet(buf, index=False)
+    else:
+        long.to_csv(buf, index=False)
+    return buf.getvalue()
+
+
+def build_report(start, end, fmt, team_ids=None):
+    return _encode(_aggregate(*_frames(start, end, team_ids)), fmt)
+
+
+def request_report(report_type, start, end, fmt, team_ids=None):
+    key = (report_type, start, end, fmt, tuple(sorted(team_ids)) if team_ids is not None else None)
+    return get_report_engine().request(key, lambda: build_report(start, end, fmt, team_ids))
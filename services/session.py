@@ -0,0 +1,188 @@
+import json
+import secrets
+import sqlite3
+import threading
+import time
+
+import streamlit as st
+
+from services.supabaseClient import Config
+from services.queryCache import select_rows
+
+# The only state kept per session. Query results, chat history and log tails live
+# in process-wide caches shared by every session (services.queryCache, services.chat,
+# services.logTail), so a session costs a few short strings whatever pages it visits.
+FIELDS = ("user_id", "username", "role", "token", "nav_page")
+
+# Cookie carrying the session id, so a reload or a restarted server (with
+# SESSION_STORE set) picks the session back up. It is never put in the URL: a
+# copied or shared link must not log anyone in.
+SID_COOKIE = "cortexpm_sid"
+
+
+class MemorySessionStore:
+    # Session records held by this server process
+
+    def __init__(self, ttl):
+        self._ttl = ttl
+        self._records = {}
+        self._lock = threading.Lock()
+
+    def get(self, sid):
+        with self._lock:
+            entry = self._records.get(sid)
+            if entry is None:
+                return None
+            expires, record = entry
+            if expires < time.time():
+                del self._records[sid]
+                return None
+            return dict(record)
+
+    def put(self, sid, record):
+        now = time.time()
+        with self._lock:
+            self._records[sid] = (now + self._ttl, dict(record))
+            expired = [key for key, (expires, _) in self._records.items() if expires < now]
+            for key in expired:
+                del self._records[key]
+
+    def delete(self, sid):
+        with self._lock:
+            self._records.pop(sid, None)
+
+
+class SqliteSessionStore:
+    # Session records in a local SQLite file (WAL mode), one connection per thread
+
+    def __init__(self, path, ttl):
+        self._path = path
+        self._ttl = ttl
+        self._local = threading.local()
+        with self._connection() as connection:
+            connection.execute("create table if not exists sessions (sid text primary key, data text not null, expires_at real not null)")
+            connection.execute("create index if not exists sessions_expires_at_idx on sessions (expires_at)")
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._local.connection = sqlite3.connect(self._path, timeout=5)
+            connection.execute("pragma journal_mode = wal")
+        return connection
+
+    def get(self, sid):
+        row = self._connection().execute(
+            "select data from sessions where sid = ? and expires_at > ?", (sid, time.time())
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, sid, record):
+        now = time.time()
+        with self._connection() as connection:
+            connection.execute(
+                "insert into sessions (sid, data, expires_at) values (?, ?, ?) "
+                "on conflict (sid) do update set data = excluded.data, expires_at = excluded.expires_at",
+                (sid, json.dumps(record), now + self._ttl),
+            )
+            connection.execute("delete from sessions where expires_at < ?", (now,))
+
+    def delete(self, sid):
+        with self._connection() as connection:
+            connection.execute("delete from sessions where sid = ?", (sid,))
+
+
+@st.cache_resource(show_spinner=False)
+def get_session_store():
+    if Config.SESSION_STORE:
+        return SqliteSessionStore(Config.SESSION_STORE, Config.SESSION_TTL)
+    return MemorySessionStore(Config.SESSION_TTL)
+
+
+def _record():
+    return {field: st.session_state.get(field) for field in FIELDS}
+
+
+def _set_cookie(sid):
+    # Written by sync_cookie() on the next run that reaches it; start() and end()
+    # are usually followed by st.rerun(), which would drop anything rendered now
+    st.session_state._sid_cookie = sid
+
+
+def sync_cookie():
+    # Streamlit cannot set cookies itself, so a zero-height component (served
+    # from the app's origin) writes or clears the session cookie in the browser
+    if '_sid_cookie' not in st.session_state:
+        return
+    import streamlit.components.v1 as components
+
+    sid = st.session_state.pop('_sid_cookie')
+    secure = "; Secure" if st.context.headers.get("Origin", "").startswith("https://") else ""
+    value, max_age = (sid, int(Config.SESSION_TTL)) if sid else ("", 0)
+    components.html(
+        f"<script>window.parent.document.cookie = '{SID_COOKIE}={value}; Max-Age={max_age}; Path=/; SameSite=Strict{secure}';</script>",
+        height=0,
+    )
+
+
+def restore():
+    # Rebuild the compact session from the store when the browser presents its
+    # session cookie. The id is single-use: it is rotated on every restore, so a
+    # leaked cookie stops working once the owner comes back.
+    if st.session_state.get('logged_in'):
+        return
+    sid = st.context.cookies.get(SID_COOKIE)
+    if not sid:
+        return
+    store = get_session_store()
+    record = store.get(sid)
+    if record is None:
+        # Expired, ended or already rotated (e.g. by another tab); leave the cookie
+        # alone so a newer one written by that tab is not cleared
+        return
+    store.delete(sid)
+    sid = secrets.token_urlsafe(32)
+    store.put(sid, record)
+    _set_cookie(sid)
+    # nav_page also seeds the sidebar radio (key "nav_page")
+    st.session_state.update({field: record.get(field) for field in FIELDS if record.get(field) is not None})
+    st.session_state.sid = sid
+    st.session_state.logged_in = True
+
+
+def start(username, role, user_id=None, token=None):
+    sid = secrets.token_urlsafe(32)
+    st.session_state.update(sid=sid, logged_in=True, user_id=user_id, username=username, role=role, token=token)
+    # A new login starts on the first dashboard page
+    st.session_state.pop('nav_page', None)
+    get_session_store().put(sid, _record())
+    _set_cookie(sid)
+    return sid
+
+
+def remember_page(page):
+    # Persist the dashboard page, writing to the store only when it changes
+    sid = st.session_state.get('sid')
+    if sid is None or st.session_state.get('saved_nav_page') == page:
+        return
+    get_session_store().put(sid, _record())
+    st.session_state.saved_nav_page = page
+
+
+def end():
+    sid = st.session_state.get('sid')
+    if sid is not None:
+        get_session_store().delete(sid)
+        _set_cookie(None)
+    for key in (*FIELDS, 'sid', 'saved_nav_page'):
+        st.session_state.pop(key, None)
+    st.session_state.logged_in = False
+
+
+def current_user():
+    # Row from users for the logged-in username, or None (e.g. the user was removed).
+    # Served from the shared query cache, so sessions of the same user share one entry.
+    username = st.session_state.get('username')
+    if not username:
+        return None
+    rows = select_rows('users', 'id,name,username,role', [('username', 'eq', username)])
+    return rows[0] if rows else None
@@ -0,0 +1,19 @@
+from services.supabaseClient import get_client
+from services.queryCache import cached
+
+# A new submission, notification, chat message or team change drops the
+# cached bundle; anything written outside the app shows within OVERVIEW_TTL
+OVERVIEW_TABLES = (
+    "team_members", "teams", "projects", "submissions", "users",
+    "user_notifications", "notification_counters", "team_messages", "direct_messages",
+)
+OVERVIEW_TTL = 15
+
+
+def student_overview(user_id):
+    # Teams, projects, teammates, unread count, latest notifications and chat
+    # previews for one student in a single call (sql/010_student_overview.sql)
+    def load():
+        return get_client().rpc("student_overview", {"p_user_id": user_id}).execute().data
+
+    return cached(("student_overview", user_id), OVERVIEW_TABLES, load, ttl=OVERVIEW_TTL)
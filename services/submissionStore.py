@@ -0,0 +1,80 @@
+import contextvars
+import hashlib
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+
+from services.supabaseClient import Config
+from services.queryCache import insert_rows
+
+
+@st.cache_resource(show_spinner=False)
+def get_upload_executor() -> ThreadPoolExecutor:
+    # Bounded and separate from services.workers, which serves page queries and prefetch
+    return ThreadPoolExecutor(max_workers=Config.UPLOAD_WORKERS, thread_name_prefix="cortexpm-upload")
+
+
+def _blob_path(digest):
+    return os.path.join(Config.SUBMISSION_STORE_DIR, "blobs", digest[:2], digest[2:4], digest)
+
+
+def store_blob(fileobj):
+    # Copy fileobj into the blob store chunk by chunk while hashing it, so no
+    # second full copy is made. Streamlit UploadedFiles are already held in
+    # memory whole, so upload size is bounded by server.maxUploadSize
+    # (.streamlit/config.toml), not by this copy. Files are named by their
+    # SHA-256, so identical uploads are stored once.
+    # Returns (sha256, size, deduplicated).
+    incoming = os.path.join(Config.SUBMISSION_STORE_DIR, "incoming")
+    os.makedirs(incoming, exist_ok=True)
+    digest, size = hashlib.sha256(), 0
+    fileobj.seek(0)
+    with tempfile.NamedTemporaryFile(dir=incoming, delete=False) as tmp:
+        while chunk := fileobj.read(Config.SUBMISSION_CHUNK_SIZE):
+            digest.update(chunk)
+            tmp.write(chunk)
+            size += len(chunk)
+    sha256 = digest.hexdigest()
+    path = _blob_path(sha256)
+    if os.path.exists(path):
+        os.remove(tmp.name)
+        return sha256, size, True
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    os.replace(tmp.name, path)
+    return sha256, size, False
+
+
+def open_blob(sha256):
+    return open(_blob_path(sha256), "rb")
+
+
+def _save_submission(project_id, text, files, submitted_by):
+    blobs = [(uploaded_file, *store_blob(uploaded_file)) for uploaded_file in files]
+    submission = insert_rows("submissions", {
+        "project_id": project_id,
+        "text": text,
+        "submitted_by": submitted_by,
+    })[0]
+    if blobs:
+        insert_rows("submission_files", [{
+            "submission_id": submission["id"],
+            "sha256": sha256,
+            "filename": uploaded_file.name,
+            "content_type": uploaded_file.type,
+            "size": size,
+        } for uploaded_file, sha256, size, _ in blobs], returning="minimal")
+    return {
+        "submission_id": submission["id"],
+        "files": len(blobs),
+        "bytes": sum(size for _, _, size, _ in blobs),
+        "deduplicated": sum(1 for *_, deduplicated in blobs if deduplicated),
+    }
+
+
+def save_submission(project_id, text, files, submitted_by):
+    # Store the files and record the submission on the upload pool; returns a Future
+    return get_upload_executor().submit(
+        contextvars.copy_context().run, _save_submission, project_id, text, list(files or []), submitted_by,
+    )
@@ -0,0 +1,91 @@
+import os
+
+import httpx
+import streamlit as st
+from dotenv import load_dotenv
+from supabase import create_client, Client, ClientOptions
+
+from services.instrumentation import on_response
+
+# Load environment variables
+load_dotenv()
+
+class Config:
+    # Common configuration
+    SECRET_KEY = os.getenv('SECRET_KEY', 'default-secret-key')
+    SUPABASE_URL = os.getenv('SUPABASE_URL')
+    SUPABASE_KEY = os.getenv('SUPABASE_KEY')
+
+    # HTTP connection pool shared by every session of this server process
+    SUPABASE_MAX_CONNECTIONS = int(os.getenv('SUPABASE_MAX_CONNECTIONS', '50'))
+    SUPABASE_MAX_KEEPALIVE = int(os.getenv('SUPABASE_MAX_KEEPALIVE', '20'))
+    SUPABASE_KEEPALIVE_EXPIRY = float(os.getenv('SUPABASE_KEEPALIVE_EXPIRY', '30'))
+
+    # Per-request timeouts in seconds
+    SUPABASE_TIMEOUT = float(os.getenv('SUPABASE_TIMEOUT', '10'))
+    SUPABASE_CONNECT_TIMEOUT = float(os.getenv('SUPABASE_CONNECT_TIMEOUT', '5'))
+
+    # Query result cache shared by every session of this server process
+    QUERY_CACHE_TTL = float(os.getenv('QUERY_CACHE_TTL', '30'))
+    QUERY_CACHE_SIZE = int(os.getenv('QUERY_CACHE_SIZE', '512'))
+
+    # Background worker threads (prefetching, fan-out queries)
+    WORKER_THREADS = int(os.getenv('WORKER_THREADS', '8'))
+
+    # Rendered QR codes: in-memory LRU size and optional on-disk cache directory
+    QR_CACHE_SIZE = int(os.getenv('QR_CACHE_SIZE', '2048'))
+    QR_CACHE_DIR = os.getenv('QR_CACHE_DIR')
+    # Student profile page linked from the QR code; {username} is substituted
+    PROFILE_URL = os.getenv('PROFILE_URL', 'https://example.com/profile/{username}')
+
+    # Content-addressed blob store for submitted files
+    SUBMISSION_STORE_DIR = os.getenv('SUBMISSION_STORE_DIR', os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'submissions'))
+    SUBMISSION_CHUNK_SIZE = int(os.getenv('SUBMISSION_CHUNK_SIZE', str(1024 * 1024)))
+    # Uploads get their own pool so a burst of submissions cannot starve page queries
+    UPLOAD_WORKERS = int(os.getenv('UPLOAD_WORKERS', '2'))
+
+    # Server-side session records (identity and navigation only): kept in memory
+    # unless SESSION_STORE names a SQLite file, which survives restarts and is
+    # shared by every worker process on the host. Idle sessions expire after SESSION_TTL seconds.
+    SESSION_STORE = os.getenv('SESSION_STORE')
+    SESSION_TTL = float(os.getenv('SESSION_TTL', str(12 * 3600)))
+
+    # Password hashing (scrypt) runs on a bounded pool so a burst of logins cannot
+    # take every core; failed logins are limited per username and per client
+    AUTH_HASH_WORKERS = int(os.getenv('AUTH_HASH_WORKERS', '4'))
+    AUTH_MAX_FAILURES = int(os.getenv('AUTH_MAX_FAILURES', '5'))
+    AUTH_FAILURE_WINDOW = float(os.getenv('AUTH_FAILURE_WINDOW', '300'))
+
+
+def _pooled_session(session: httpx.Client) -> httpx.Client:
+    # Same base URL and auth headers as the session postgrest built, but with
+    # our own keep-alive pool limits and timeouts, and every response recorded
+    # by services.instrumentation.
+    return httpx.Client(
+        base_url=session.base_url,
+        headers=session.headers,
+        timeout=httpx.Timeout(Config.SUPABASE_TIMEOUT, connect=Config.SUPABASE_CONNECT_TIMEOUT),
+        limits=httpx.Limits(
+            max_connections=Config.SUPABASE_MAX_CONNECTIONS,
+            max_keepalive_connections=Config.SUPABASE_MAX_KEEPALIVE,
+            keepalive_expiry=Config.SUPABASE_KEEPALIVE_EXPIRY,
+        ),
+        follow_redirects=True,
+        http2=True,
+        event_hooks={"response": [on_response]},
+    )
+
+
+@st.cache_resource(show_spinner=False)
+def get_client() -> Client:
+    # Built once per server process and shared by every session and rerun, so
+    # reruns reuse warm pooled connections instead of paying for a new client
+    # and a fresh TLS handshake. httpx clients are safe to share across threads.
+    options = ClientOptions(postgrest_client_timeout=Config.SUPABASE_TIMEOUT)
+    client = create_client(Config.SUPABASE_URL, Config.SUPABASE_KEY, options=options)
+
+    postgrest = client.postgrest
+    default_session = postgrest.session
+    postgrest.session = _pooled_session(default_session)
+    default_session.close()
+    return client
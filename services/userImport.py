@@ -0,0 +1,85 @@
+import pandas as pd
+from postgrest.exceptions import APIError
+
+from services.supabaseClient import get_client
+from services.queryCache import insert_rows
+from services.auth import hash_passwords
+
+ROLES = ["Student", "Faculty", "Admin"]
+REQUIRED_COLUMNS = ["role", "name", "username", "email", "password"]
+EMAIL_PATTERN = r"^[^@\s]+@[^@\s]+\.[^@\s]+$"
+
+# Usernames/emails per `in` lookup, keeps the request URL well under server limits
+LOOKUP_CHUNK = 200
+
+
+def read_user_file(uploaded_file):
+    if uploaded_file.name.lower().endswith((".xlsx", ".xls")):
+        df = pd.read_excel(uploaded_file, dtype=str)
+    else:
+        df = pd.read_csv(uploaded_file, dtype=str)
+    df.columns = df.columns.str.strip().str.lower()
+    missing = [column for column in REQUIRED_COLUMNS if column not in df.columns]
+    if missing:
+        raise ValueError(f"Missing columns: {', '.join(missing)}")
+    df = df[REQUIRED_COLUMNS].fillna("")
+    for column in REQUIRED_COLUMNS:
+        df[column] = df[column].str.strip()
+    df["role"] = df["role"].str.capitalize()
+    df["email"] = df["email"].str.lower()
+    return df
+
+
+def _existing(column, values):
+    # Values of `column` that are already taken in the users table
+    values = sorted(set(values) - {""})
+    taken = set()
+    for start in range(0, len(values), LOOKUP_CHUNK):
+        chunk = values[start:start + LOOKUP_CHUNK]
+        rows = get_client().table("users").select(column).in_(column, chunk).execute().data
+        taken.update(row[column] for row in rows)
+    return taken
+
+
+def validate_users(df):
+    # Returns a copy of df with an "error" column; empty string means the row is valid
+    checks = [
+        ((df[REQUIRED_COLUMNS] == "").any(axis=1), "missing required field"),
+        (~df["role"].isin(ROLES), "invalid role"),
+        (~df["email"].str.match(EMAIL_PATTERN), "invalid email"),
+        (df["username"].duplicated(keep=False), "duplicate username in file"),
+        (df["email"].duplicated(keep=False), "duplicate email in file"),
+        (df["username"].isin(_existing("username", df["username"])), "username already exists"),
+        (df["email"].isin(_existing("email", df["email"])), "email already exists"),
+    ]
+    errors = pd.Series("", index=df.index)
+    for mask, message in checks:
+        errors = errors.mask(mask, errors + message + "; ")
+    result = df.copy()
+    result["error"] = errors.str.rstrip("; ")
+    return result
+
+
+def import_users(df, batch_size=500, progress=None):
+    # Insert valid rows in batches. A failed batch is retried row by row so
+    # the report pinpoints the offending rows. Returns a per-row report.
+    records = df[REQUIRED_COLUMNS].to_dict("records")
+    report = []
+    for start in range(0, len(records), batch_size):
+        batch = records[start:start + batch_size]
+        # Stored as salted hashes, computed on the bounded hashing pool
+        for row, hashed in zip(batch, hash_passwords([row["password"] for row in batch])):
+            row["password"] = hashed
+        try:
+            insert_rows("users", batch, returning="minimal")
+            report.extend((row["username"], "inserted", "") for row in batch)
+        except APIError:
+            for row in batch:
+                try:
+                    insert_rows("users", row, returning="minimal")
+                    report.append((row["username"], "inserted", ""))
+                except APIError as e:
+                    report.append((row["username"], "failed", e.message))
+        if progress:
+            progress(min(start + batch_size, len(records)) / len(records))
+    return pd.DataFrame(report, columns=["username", "status", "error"], index=df.index)
@@ -0,0 +1,45 @@
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+
+from services.supabaseClient import Config
+
+
+@st.cache_resource(show_spinner=False)
+def get_executor() -> ThreadPoolExecutor:
+    # One bounded pool per server process, shared by every session
+    return ThreadPoolExecutor(max_workers=Config.WORKER_THREADS, thread_name_prefix="cortexpm-worker")
+
+
+# Futures submitted and not yet finished, for callers that need the pool idle
+_pending = set()
+_pending_lock = threading.Lock()
+
+
+def _done(future):
+    with _pending_lock:
+        _pending.discard(future)
+
+
+def submit(fn, *args, **kwargs):
+    # Run fn on the shared pool inside a copy of the caller's context, so work
+    # done on behalf of a rerun is still attributed to it by instrumentation
+    future = get_executor().submit(contextvars.copy_context().run, fn, *args, **kwargs)
+    with _pending_lock:
+        _pending.add(future)
+    future.add_done_callback(_done)
+    return future
+
+
+def pending():
+    with _pending_lock:
+        return list(_pending)
+
+
+def fetch_all(**loaders):
+    # Run independent zero-argument loaders concurrently and return their
+    # results by name, so a page waits for its slowest query rather than the sum.
+    futures = {name: submit(loader) for name, loader in loaders.items()}
+    return {name: future.result() for name, future in futures.items()}
@@ -0,0 +1,14 @@
+-- Aggregates backing the admin overview tiles and status chart.
+-- Row counts are served by PostgREST count-only requests (HEAD + Prefer: count=exact),
+-- which only need the status indexes below; grouped counts come from this view.
+
+create index if not exists projects_status_idx on public.projects (status);
+create index if not exists approvals_status_idx on public.approvals (status);
+
+create or replace view public.project_status_counts
+with (security_invoker = true) as
+select status, count(*)::bigint as count
+from public.projects
+group by status;
+
+grant select on public.project_status_counts to anon, authenticated;
@@ -0,0 +1,17 @@
+-- Composite indexes backing keyset pagination of the admin table views.
+-- Each view orders by (sort column, id), so every sortable column gets one.
+-- Pages keep Postgres' default null order (last ascending, first descending),
+-- which these plain btrees serve forward and backward; see services/pagination.py.
+
+create index if not exists users_name_id_idx on public.users (name, id);
+create index if not exists users_username_id_idx on public.users (username, id);
+create index if not exists users_role_id_idx on public.users (role, id);
+
+create index if not exists teams_name_id_idx on public.teams (name, id);
+create index if not exists teams_status_id_idx on public.teams (status, id);
+
+create index if not exists projects_title_id_idx on public.projects (title, id);
+create index if not exists projects_status_id_idx on public.projects (status, id);
+
+create index if not exists logs_created_at_id_idx on public.logs (created_at, id);
+create index if not exists activity_created_at_id_idx on public.activity (created_at, id);
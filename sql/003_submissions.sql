@@ -0,0 +1,23 @@
+-- Work submitted by students. File contents live in the content-addressed blob
+-- store (services/submissionStore.py); rows here only reference them by SHA-256.
+
+create table if not exists public.submissions (
+    id bigint generated always as identity primary key,
+    project_id bigint not null references public.projects (id) on delete cascade,
+    submitted_by bigint references public.users (id) on delete set null,
+    text text,
+    created_at timestamptz not null default now()
+);
+
+create table if not exists public.submission_files (
+    id bigint generated always as identity primary key,
+    submission_id bigint not null references public.submissions (id) on delete cascade,
+    sha256 char(64) not null,
+    filename text not null,
+    content_type text,
+    size bigint not null
+);
+
+create index if not exists submissions_project_id_idx on public.submissions (project_id, created_at desc);
+create index if not exists submission_files_submission_id_idx on public.submission_files (submission_id);
+create index if not exists submission_files_sha256_idx on public.submission_files (sha256);
@@ -0,0 +1,35 @@
+-- Append-only chat. Direct conversations are keyed by "<low user id>:<high user id>";
+-- team messages are stored once and fanned out to members as read receipts.
+
+create table if not exists public.direct_messages (
+    id bigint generated always as identity primary key,
+    conversation text not null,
+    sender_id bigint not null references public.users (id),
+    recipient_id bigint not null references public.users (id),
+    body text not null,
+    created_at timestamptz not null default now()
+);
+
+create table if not exists public.team_messages (
+    id bigint generated always as identity primary key,
+    team_id bigint not null references public.teams (id) on delete cascade,
+    sender_id bigint not null references public.users (id),
+    body text not null,
+    created_at timestamptz not null default now()
+);
+
+create table if not exists public.team_message_receipts (
+    message_id bigint not null references public.team_messages (id) on delete cascade,
+    user_id bigint not null references public.users (id) on delete cascade,
+    read_at timestamptz,
+    primary key (user_id, message_id)
+);
+
+-- History pages and polling both walk a conversation by id
+create index if not exists direct_messages_conversation_id_idx on public.direct_messages (conversation, id desc);
+create index if not exists team_messages_team_id_id_idx on public.team_messages (team_id, id desc);
+create index if not exists team_members_team_id_idx on public.team_members (team_id);
+create index if not exists team_members_user_id_idx on public.team_members (user_id);
+
+-- Messages are immutable once written
+revoke update, delete on public.direct_messages, public.team_messages from anon, authenticated;
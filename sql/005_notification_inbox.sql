@@ -0,0 +1,87 @@
+-- Per-user notification inbox with maintained unread counters.
+-- notifications holds each message once; user_notifications is the per-recipient
+-- inbox row; notification_counters keeps unread totals so a badge is one key lookup.
+
+create table if not exists public.user_notifications (
+    id bigint generated always as identity primary key,
+    user_id bigint not null references public.users (id) on delete cascade,
+    notification_id bigint not null references public.notifications (id) on delete cascade,
+    read_at timestamptz,
+    created_at timestamptz not null default now(),
+    unique (user_id, notification_id)
+);
+
+create index if not exists user_notifications_inbox_idx on public.user_notifications (user_id, id desc);
+create index if not exists user_notifications_unread_idx on public.user_notifications (user_id) where read_at is null;
+
+create table if not exists public.notification_counters (
+    user_id bigint primary key references public.users (id) on delete cascade,
+    unread integer not null default 0
+);
+
+-- Statement-level triggers with transition tables: one counter update per user
+-- per statement, however many inbox rows a bulk delivery inserts.
+create or replace function public.notification_counters_on_insert() returns trigger
+language plpgsql as $$
+begin
+    insert into public.notification_counters (user_id, unread)
+    select user_id, count(*) from new_rows where read_at is null group by user_id
+    on conflict (user_id) do update set unread = notification_counters.unread + excluded.unread;
+    return null;
+end $$;
+
+create or replace function public.notification_counters_on_update() returns trigger
+language plpgsql as $$
+begin
+    update public.notification_counters c
+    set unread = greatest(c.unread + d.delta, 0)
+    from (
+        select n.user_id,
+               sum((n.read_at is null)::int - (o.read_at is null)::int) as delta
+        from new_rows n join old_rows o using (id)
+        group by n.user_id
+    ) d
+    where c.user_id = d.user_id and d.delta <> 0;
+    return null;
+end $$;
+
+create or replace function public.notification_counters_on_delete() returns trigger
+language plpgsql as $$
+begin
+    update public.notification_counters c
+    set unread = greatest(c.unread - d.removed, 0)
+    from (select user_id, count(*) as removed from old_rows where read_at is null group by user_id) d
+    where c.user_id = d.user_id;
+    return null;
+end $$;
+
+drop trigger if exists user_notifications_counters_insert on public.user_notifications;
+create trigger user_notifications_counters_insert after insert on public.user_notifications
+    referencing new table as new_rows for each statement execute function public.notification_counters_on_insert();
+
+drop trigger if exists user_notifications_counters_update on public.user_notifications;
+create trigger user_notifications_counters_update after update on public.user_notifications
+    referencing new table as new_rows old table as old_rows for each statement execute function public.notification_counters_on_update();
+
+drop trigger if exists user_notifications_counters_delete on public.user_notifications;
+create trigger user_notifications_counters_delete after delete on public.user_notifications
+    referencing old table as old_rows for each statement execute function public.notification_counters_on_delete();
+
+-- Fan a notification out to its audience in one set-based insert.
+-- p_role / p_team_id narrow the audience; both null means every user.
+create or replace function public.deliver_notification(p_notification_id bigint, p_role text default null, p_team_id bigint default null)
+returns integer
+language sql as $$
+    with delivered as (
+        insert into public.user_notifications (user_id, notification_id)
+        select u.id, p_notification_id
+        from public.users u
+        where (p_role is null or u.role = p_role)
+          and (p_team_id is null or exists (
+              select 1 from public.team_members m where m.team_id = p_team_id and m.user_id = u.id
+          ))
+        on conflict (user_id, notification_id) do nothing
+        returning 1
+    )
+    select count(*)::integer from delivered;
+$$;
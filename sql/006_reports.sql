@@ -0,0 +1,21 @@
+-- Columns and indexes used by the report engine (services/reports.py). Every
+-- report walks its window as created_at range + id order, so each table gets a
+-- (created_at, id) index.
+
+alter table public.projects add column if not exists created_at timestamptz not null default now();
+alter table public.approvals add column if not exists created_at timestamptz not null default now();
+
+create table if not exists public.grades (
+    id bigint generated always as identity primary key,
+    team_id bigint not null references public.teams (id) on delete cascade,
+    graded_by bigint references public.users (id) on delete set null,
+    grade numeric(5, 2) not null,
+    feedback text,
+    created_at timestamptz not null default now()
+);
+
+create index if not exists projects_created_at_id_idx on public.projects (created_at, id);
+create index if not exists approvals_created_at_id_idx on public.approvals (created_at, id);
+create index if not exists submissions_created_at_id_idx on public.submissions (created_at, id);
+create index if not exists grades_created_at_id_idx on public.grades (created_at, id);
+create index if not exists grades_team_id_idx on public.grades (team_id);
@@ -0,0 +1,113 @@
+-- Project status time series. Every status change on projects is recorded once in
+-- project_status_history; daily and monthly rollups of those transitions are kept
+-- up to date by triggers, so a trend chart reads periods x statuses rows however
+-- many projects there are.
+
+create table if not exists public.project_status_history (
+    id bigint generated always as identity primary key,
+    project_id bigint not null,
+    old_status text,
+    new_status text,
+    changed_at timestamptz not null default now()
+);
+
+create index if not exists project_status_history_project_idx on public.project_status_history (project_id, changed_at);
+
+create table if not exists public.project_status_daily (
+    day date not null,
+    status text not null,
+    entered integer not null default 0,
+    exited integer not null default 0,
+    primary key (day, status)
+);
+
+create table if not exists public.project_status_monthly (
+    month date not null,
+    status text not null,
+    entered integer not null default 0,
+    exited integer not null default 0,
+    primary key (month, status)
+);
+
+-- Statement-level triggers with transition tables: a batch "Update Project Status"
+-- writes one history row per changed project and one rollup upsert per period and status.
+create or replace function public.project_status_history_on_insert() returns trigger
+language plpgsql as $$
+begin
+    insert into public.project_status_history (project_id, old_status, new_status)
+    select id, null, status from new_rows where status is not null;
+    return null;
+end $$;
+
+create or replace function public.project_status_history_on_update() returns trigger
+language plpgsql as $$
+begin
+    insert into public.project_status_history (project_id, old_status, new_status)
+    select n.id, o.status, n.status
+    from new_rows n join old_rows o using (id)
+    where n.status is distinct from o.status;
+    return null;
+end $$;
+
+create or replace function public.project_status_history_on_delete() returns trigger
+language plpgsql as $$
+begin
+    insert into public.project_status_history (project_id, old_status, new_status)
+    select id, status, null from old_rows where status is not null;
+    return null;
+end $$;
+
+drop trigger if exists projects_status_history_insert on public.projects;
+create trigger projects_status_history_insert after insert on public.projects
+    referencing new table as new_rows for each statement execute function public.project_status_history_on_insert();
+
+drop trigger if exists projects_status_history_update on public.projects;
+create trigger projects_status_history_update after update on public.projects
+    referencing new table as new_rows old table as old_rows for each statement execute function public.project_status_history_on_update();
+
+drop trigger if exists projects_status_history_delete on public.projects;
+create trigger projects_status_history_delete after delete on public.projects
+    referencing old table as old_rows for each statement execute function public.project_status_history_on_delete();
+
+create or replace function public.project_status_rollup() returns trigger
+language plpgsql as $$
+begin
+    with changes as (
+        select changed_at::date as day, new_status as status, 1 as entered, 0 as exited from new_rows where new_status is not null
+        union all
+        select changed_at::date, old_status, 0, 1 from new_rows where old_status is not null
+    ), daily as (
+        insert into public.project_status_daily as d (day, status, entered, exited)
+        select day, status, sum(entered), sum(exited) from changes group by day, status
+        on conflict (day, status) do update set entered = d.entered + excluded.entered, exited = d.exited + excluded.exited
+    )
+    insert into public.project_status_monthly as m (month, status, entered, exited)
+    select date_trunc('month', day)::date, status, sum(entered), sum(exited) from changes group by 1, 2
+    on conflict (month, status) do update set entered = m.entered + excluded.entered, exited = m.exited + excluded.exited;
+    return null;
+end $$;
+
+drop trigger if exists project_status_history_rollup on public.project_status_history;
+create trigger project_status_history_rollup after insert on public.project_status_history
+    referencing new table as new_rows for each statement execute function public.project_status_rollup();
+
+-- Seed the history (and through it the rollups) from existing projects, once
+insert into public.project_status_history (project_id, old_status, new_status, changed_at)
+select id, null, status, created_at from public.projects
+where status is not null and not exists (select 1 from public.project_status_history);
+
+-- Trend views: projects in each status at the end of every period, plus the
+-- transitions into and out of it during the period
+create or replace view public.project_status_trend_weekly as
+select period, status, entered, exited,
+       sum(entered - exited) over (partition by status order by period)::integer as count
+from (
+    select date_trunc('week', day)::date as period, status, sum(entered)::integer as entered, sum(exited)::integer as exited
+    from public.project_status_daily
+    group by 1, 2
+) weekly;
+
+create or replace view public.project_status_trend_monthly as
+select month as period, status, entered, exited,
+       sum(entered - exited) over (partition by status order by month)::integer as count
+from public.project_status_monthly;
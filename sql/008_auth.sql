@@ -0,0 +1,8 @@
+-- Login looks a user up by exact username (services/auth.py), so usernames are
+-- unique and indexed. users.password now holds scrypt hashes in the form
+-- scrypt$N$r$p$salt$hash; remaining plaintext values are rehashed on the
+-- user's next successful login.
+
+create unique index if not exists users_username_key on public.users (username);
+
+comment on column public.users.password is 'scrypt$N$r$p$salt$hash (base64url), written by services/auth.py';
@@ -0,0 +1,52 @@
+-- Everything the faculty dashboard shows, one row per team, so a mentor's whole
+-- dashboard is a single request: mentor_team_overview?mentor_id=eq.<id>.
+-- The lateral subqueries run only for the teams that pass the mentor filter.
+
+create index if not exists teams_mentor_id_idx on public.teams (mentor_id, id);
+create index if not exists projects_team_id_idx on public.projects (team_id, id);
+create index if not exists grades_team_id_created_at_idx on public.grades (team_id, created_at desc);
+
+create or replace view public.mentor_team_overview with (security_invoker = true) as
+select
+    t.id as team_id,
+    t.mentor_id,
+    t.name as team_name,
+    t.status as team_status,
+    coalesce(p.projects, '[]'::jsonb) as projects,
+    coalesce(m.members, '[]'::jsonb) as members,
+    coalesce(s.submissions, '[]'::jsonb) as recent_submissions,
+    coalesce(g.grade_count, 0) as grade_count,
+    g.latest_grade,
+    g.latest_feedback,
+    g.last_graded_at
+from public.teams t
+left join lateral (
+    select jsonb_agg(jsonb_build_object('id', pr.id, 'title', pr.title, 'status', pr.status) order by pr.id) as projects
+    from public.projects pr
+    where pr.team_id = t.id
+) p on true
+left join lateral (
+    select jsonb_agg(jsonb_build_object('id', u.id, 'name', u.name, 'username', u.username) order by u.name) as members
+    from public.team_members tm
+    join public.users u on u.id = tm.user_id
+    where tm.team_id = t.id
+) m on true
+left join lateral (
+    select jsonb_agg(jsonb_build_object('id', recent.id, 'project_id', recent.project_id, 'submitted_by', recent.submitted_by, 'created_at', recent.created_at)
+                     order by recent.created_at desc) as submissions
+    from (
+        select sub.id, sub.project_id, sub.submitted_by, sub.created_at
+        from public.submissions sub
+        join public.projects pr on pr.id = sub.project_id
+        where pr.team_id = t.id
+        order by sub.created_at desc
+        limit 10
+    ) recent
+) s on true
+left join lateral (
+    select count(*) over () as grade_count, gr.grade as latest_grade, gr.feedback as latest_feedback, gr.created_at as last_graded_at
+    from public.grades gr
+    where gr.team_id = t.id
+    order by gr.created_at desc
+    limit 1
+) g on true;
@@ -0,0 +1,81 @@
+-- The student Dashboard in one call: rpc/student_overview returns the student's
+-- teams, their projects (with the latest submission time), teammates, unread
+-- count, latest notifications and chat previews as a single jsonb document.
+
+create index if not exists direct_messages_sender_id_idx on public.direct_messages (sender_id, id desc);
+create index if not exists direct_messages_recipient_id_idx on public.direct_messages (recipient_id, id desc);
+
+create or replace function public.student_overview(p_user_id bigint)
+returns jsonb
+language sql stable security invoker as $$
+    with my_teams as (
+        select t.id, t.name, t.status
+        from public.team_members m
+        join public.teams t on t.id = m.team_id
+        where m.user_id = p_user_id
+    )
+    select jsonb_build_object(
+        'teams', (
+            select coalesce(jsonb_agg(jsonb_build_object('id', id, 'name', name, 'status', status) order by id), '[]'::jsonb)
+            from my_teams
+        ),
+        'projects', (
+            select coalesce(jsonb_agg(jsonb_build_object(
+                'id', p.id, 'title', p.title, 'status', p.status, 'team_id', p.team_id,
+                'last_submitted_at', (select max(s.created_at) from public.submissions s where s.project_id = p.id)
+            ) order by p.id), '[]'::jsonb)
+            from public.projects p
+            where p.team_id in (select id from my_teams)
+        ),
+        'members', (
+            select coalesce(jsonb_agg(jsonb_build_object('id', u.id, 'name', u.name, 'team_id', m.team_id) order by u.name), '[]'::jsonb)
+            from public.team_members m
+            join public.users u on u.id = m.user_id
+            where m.team_id in (select id from my_teams) and m.user_id <> p_user_id
+        ),
+        'unread', coalesce((select unread from public.notification_counters where user_id = p_user_id), 0),
+        'notifications', (
+            select coalesce(jsonb_agg(jsonb_build_object(
+                'id', latest.id, 'message', latest.message, 'type', latest.type,
+                'created_at', latest.created_at, 'read_at', latest.read_at
+            ) order by latest.id desc), '[]'::jsonb)
+            from (
+                select un.id, n.message, n.type, un.created_at, un.read_at
+                from public.user_notifications un
+                join public.notifications n on n.id = un.notification_id
+                where un.user_id = p_user_id
+                order by un.id desc
+                limit 5
+            ) latest
+        ),
+        'team_chat', (
+            select coalesce(jsonb_agg(jsonb_build_object(
+                'team_id', last.team_id, 'sender_id', last.sender_id, 'body', last.body, 'created_at', last.created_at
+            ) order by last.team_id), '[]'::jsonb)
+            from my_teams t
+            cross join lateral (
+                select tm.team_id, tm.sender_id, tm.body, tm.created_at
+                from public.team_messages tm
+                where tm.team_id = t.id
+                order by tm.id desc
+                limit 1
+            ) last
+        ),
+        'direct_chat', (
+            select coalesce(jsonb_agg(jsonb_build_object(
+                'sender_id', recent.sender_id, 'recipient_id', recent.recipient_id, 'body', recent.body, 'created_at', recent.created_at
+            ) order by recent.id desc), '[]'::jsonb)
+            from (
+                select * from (
+                    (select id, sender_id, recipient_id, body, created_at from public.direct_messages
+                     where sender_id = p_user_id order by id desc limit 5)
+                    union all
+                    (select id, sender_id, recipient_id, body, created_at from public.direct_messages
+                     where recipient_id = p_user_id order by id desc limit 5)
+                ) both_directions
+                order by id desc
+                limit 5
+            ) recent
+        )
+    );
+$$;
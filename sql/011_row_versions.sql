@@ -0,0 +1,27 @@
+-- Optimistic concurrency for the admin edit forms (services/records.py): users
+-- and teams carry updated_at, moved forward on every update. A form writes
+-- only when the row still has the updated_at it was fetched with, so a
+-- concurrent edit shows up as an update that matched no rows.
+
+alter table public.users add column if not exists updated_at timestamptz not null default now();
+alter table public.teams add column if not exists updated_at timestamptz not null default now();
+
+create or replace function public.touch_updated_at()
+returns trigger
+language plpgsql as $$
+begin
+    -- clock_timestamp(), not now(): two updates in one transaction still differ
+    new.updated_at := clock_timestamp();
+    return new;
+end;
+$$;
+
+drop trigger if exists users_touch_updated_at on public.users;
+create trigger users_touch_updated_at
+    before update on public.users
+    for each row execute function public.touch_updated_at();
+
+drop trigger if exists teams_touch_updated_at on public.teams;
+create trigger teams_touch_updated_at
+    before update on public.teams
+    for each row execute function public.touch_updated_at();
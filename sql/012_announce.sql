@@ -0,0 +1,16 @@
+-- Store a notification and deliver it to its audience in one call. A function
+-- call is a single transaction, so a failed delivery never leaves behind a
+-- notification nobody received. Returns the number of recipients.
+
+create or replace function public.announce(p_message text, p_type text, p_role text default null, p_team_id bigint default null)
+returns integer
+language plpgsql as $$
+declare
+    v_notification_id bigint;
+begin
+    insert into public.notifications (message, type)
+    values (p_message, p_type)
+    returning id into v_notification_id;
+    return public.deliver_notification(v_notification_id, p_role, p_team_id);
+end;
+$$;
@@ -0,0 +1,22 @@
+-- Post a team message and fan out its read receipts in one call. A function
+-- call is a single transaction, so a message is never stored without the
+-- receipts that unread counts are built from. Returns the message row.
+
+create or replace function public.send_team_message(p_team_id bigint, p_sender_id bigint, p_body text)
+returns public.team_messages
+language plpgsql as $$
+declare
+    v_message public.team_messages;
+begin
+    insert into public.team_messages (team_id, sender_id, body)
+    values (p_team_id, p_sender_id, p_body)
+    returning * into v_message;
+
+    insert into public.team_message_receipts (message_id, user_id)
+    select v_message.id, m.user_id
+    from public.team_members m
+    where m.team_id = p_team_id and m.user_id <> p_sender_id;
+
+    return v_message;
+end;
+$$;
@@ -0,0 +1,28 @@
+import sqlite3
+from types import SimpleNamespace
+
+import pytest
+
+
+@pytest.fixture
+def standin(tmp_path):
+    # serve(sql) -> a Supabase-shaped client (table(), rpc()) over the
+    # benchmarks' SQLite PostgREST stand-in, loaded with the given SQL
+    from postgrest import SyncPostgrestClient
+    from benchmarks.standin import StandinServer
+
+    servers = []
+
+    def serve(script):
+        path = str(tmp_path / f"standin{len(servers)}.sqlite")
+        with sqlite3.connect(path) as connection:
+            connection.executescript(script)
+        server = StandinServer(path).start()
+        servers.append(server)
+        postgrest = SyncPostgrestClient(f"{server.url}/rest/v1")
+        return SimpleNamespace(table=postgrest.from_, rpc=postgrest.rpc, postgrest=postgrest)
+
+    yield serve
+    for server in servers:
+        server.shutdown()
+        server.server_close()
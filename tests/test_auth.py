@@ -0,0 +1,125 @@
+import pytest
+
+pytest.importorskip("streamlit")
+pytest.importorskip("supabase")
+
+from services import auth, queryCache
+from services.auth import (
+    HASH_PREFIX, SlidingWindowLimiter, _hash, _verify, authenticate, get_login_limiter, issue_token, verify_token,
+)
+
+
+def test_token_round_trip():
+    claims = verify_token(issue_token(7, "Faculty"))
+    assert claims["uid"] == 7
+    assert claims["role"] == "Faculty"
+
+
+@pytest.mark.parametrize("token", [None, "", "garbage", "a.b", "e30."])
+def test_malformed_tokens_are_rejected(token):
+    assert verify_token(token) is None
+
+
+def test_tampered_token_is_rejected():
+    payload, signature = issue_token(7, "Student").split(".")
+    other_payload = issue_token(1, "Admin").split(".")[0]
+    assert verify_token(f"{other_payload}.{signature}") is None
+    assert verify_token(f"{payload}.{signature[:-2]}AA") is None
+
+
+def test_expired_token_is_rejected():
+    assert verify_token(issue_token(7, "Student", ttl=-1)) is None
+
+
+def test_hash_verifies_only_its_password():
+    stored = _hash("s3cret")
+    assert stored.startswith(HASH_PREFIX + "$")
+    assert _hash("s3cret") != stored
+    assert _verify("s3cret", stored)
+    assert not _verify("wrong", stored)
+
+
+def test_plaintext_rows_still_verify():
+    assert _verify("legacy", "legacy")
+    assert not _verify("other", "legacy")
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(auth.time, "monotonic", clock)
+    return clock
+
+
+def test_limiter_blocks_at_the_limit_and_slides(clock):
+    limiter = SlidingWindowLimiter(limit=2, window=60)
+    limiter.hit("user:a")
+    clock.now += 30
+    limiter.hit("user:a")
+    assert limiter.blocked("user:a")
+    assert not limiter.blocked("user:b")
+    # The first failure leaves the window
+    clock.now += 30
+    assert not limiter.blocked("user:a")
+
+
+def test_limiter_reset_forgets_the_key(clock):
+    limiter = SlidingWindowLimiter(limit=1, window=60)
+    limiter.hit("user:a")
+    limiter.reset("user:a")
+    assert not limiter.blocked("user:a")
+
+
+@pytest.fixture
+def users(standin, monkeypatch):
+    hashed = _hash("hashed-pw")
+    client = standin(f"""
+        create table users (id integer primary key, name text, username text, role text, password text);
+        insert into users values (1, 'Plain', 'plain', 'Student', 'plain-pw'), (2, 'Hashed', 'hashed', 'Faculty', '{hashed}');
+    """)
+    monkeypatch.setattr(auth, "get_client", lambda: client)
+    monkeypatch.setattr(queryCache, "get_client", lambda: client)
+    get_login_limiter.clear()
+    yield client
+    get_login_limiter.clear()
+
+
+def _stored(client, user_id):
+    return client.table("users").select("password").eq("id", user_id).execute().data[0]["password"]
+
+
+def test_authenticate_returns_the_user_without_the_hash(users):
+    user = authenticate("hashed", "hashed-pw")
+    assert user == {"id": 2, "name": "Hashed", "username": "hashed", "role": "Faculty"}
+    assert authenticate("hashed", "wrong") is None
+
+
+def test_plaintext_row_is_rehashed_on_login(users):
+    assert authenticate("plain", "plain-pw")["id"] == 1
+    stored = _stored(users, 1)
+    assert stored.startswith(HASH_PREFIX + "$")
+    assert _verify("plain-pw", stored)
+    assert authenticate("plain", "plain-pw")["id"] == 1
+
+
+def test_unknown_username_is_checked_against_the_dummy_hash(users, monkeypatch):
+    checked = []
+    monkeypatch.setattr(auth, "verify_password", lambda password, stored: checked.append(stored) or True)
+    assert authenticate("nobody", "anything") is None
+    assert checked == [auth._DUMMY_HASH]
+
+
+def test_failures_are_counted_per_username_and_client(users):
+    for _ in range(auth.Config.AUTH_MAX_FAILURES):
+        authenticate("hashed", "wrong", client="10.0.0.1")
+    assert auth.throttled("hashed")
+    assert auth.throttled("someone-else", client="10.0.0.1")
+    assert not auth.throttled("someone-else", client="10.0.0.2")
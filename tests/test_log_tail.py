@@ -0,0 +1,73 @@
+import pytest
+
+pytest.importorskip("streamlit")
+pytest.importorskip("supabase")
+
+from services import logTail
+from services.logTail import OVERLAP, LogTail
+
+
+@pytest.fixture
+def logs(standin, monkeypatch):
+    client = standin("create table logs (id integer primary key, message text);")
+    monkeypatch.setattr(logTail, "get_client", lambda: client)
+    connection = client.postgrest
+
+    def insert(*ids):
+        connection.from_("logs").insert([{"id": row_id, "message": f"m{row_id}"} for row_id in ids]).execute()
+
+    return insert
+
+
+def _ids(tail):
+    return [row["id"] for row in tail.snapshot()]
+
+
+def test_first_poll_loads_the_newest_rows_that_fit(logs):
+    logs(*range(1, 11))
+    tail = LogTail("logs", ("message",), maxlen=5)
+    assert tail.poll() == 5
+    assert _ids(tail) == [10, 9, 8, 7, 6]
+    assert tail.poll() == 0
+
+
+def test_poll_appends_only_new_rows(logs):
+    logs(*range(1, 11))
+    tail = LogTail("logs", ("message",))
+    tail.poll()
+    logs(11, 12)
+    assert tail.poll() == 2
+    assert tail.poll() == 0
+    assert tail.appended == 12
+    assert _ids(tail)[:3] == [12, 11, 10]
+
+
+def test_late_commit_below_the_cursor_is_picked_up(logs):
+    logs(*range(1, 11))
+    tail = LogTail("logs", ("message",))
+    tail.poll()
+    # Id 12 becomes visible before id 11 commits
+    logs(12)
+    assert tail.poll() == 1
+    logs(11)
+    assert tail.poll() == 1
+    assert _ids(tail)[:3] == [12, 11, 10]
+    assert tail.poll() == 0
+
+
+def test_rows_evicted_from_the_buffer_are_not_read_back(logs):
+    logs(*range(1, 11))
+    tail = LogTail("logs", ("message",), maxlen=5)
+    tail.poll()
+    logs(11, 12, 13)
+    assert tail.poll() == 3
+    assert _ids(tail) == [13, 12, 11, 10, 9]
+    assert tail.poll() == 0
+    assert tail.appended == 8
+
+
+def test_seen_ids_stay_within_the_overlap_window(logs):
+    logs(*range(1, OVERLAP * 3))
+    tail = LogTail("logs", ("message",), maxlen=OVERLAP * 3)
+    tail.poll()
+    assert min(tail._seen) > tail.last_id - OVERLAP
@@ -0,0 +1,65 @@
+import pytest
+
+pytest.importorskip("pyarrow")
+pytest.importorskip("streamlit")
+pytest.importorskip("supabase")
+
+from postgrest import SyncPostgrestClient
+
+from services import pagination
+from services.pagination import _after_cursor, fetch_page
+
+
+def _query():
+    return SyncPostgrestClient("http://localhost/rest/v1").from_("items").select("id,name")
+
+
+def _filters(query):
+    return [(name, value) for name, value in query.params.multi_items() if name != "select"]
+
+
+def test_id_cursor_is_a_plain_range():
+    assert _filters(_after_cursor(_query(), "id", False, (7, 7))) == [("id", "gt.7")]
+    assert _filters(_after_cursor(_query(), "id", True, (7, 7))) == [("id", "lt.7")]
+
+
+def test_value_cursor_is_bounded():
+    # The gte/lte bound is what lets Postgres start the index scan at the cursor
+    assert _filters(_after_cursor(_query(), "name", False, ("bob", 7))) == [
+        ("name", "gte.bob"), ("or", '(name.gt."bob",id.gt."7")'),
+    ]
+    assert _filters(_after_cursor(_query(), "name", True, ("bob", 7))) == [
+        ("name", "lte.bob"), ("or", '(name.lt."bob",id.lt."7")'),
+    ]
+
+
+def test_null_cursor_follows_default_null_order():
+    # NULLs sort last ascending: only the rest of the NULL block is left
+    assert _filters(_after_cursor(_query(), "name", False, (None, 7))) == [("name", "is.null"), ("id", "gt.7")]
+    # NULLs sort first descending: the rest of the NULL block, then every value
+    assert _filters(_after_cursor(_query(), "name", True, (None, 7))) == [
+        ("or", '(and(name.is.null,id.lt."7"),name.not.is.null)'),
+    ]
+
+
+@pytest.fixture
+def items(standin, monkeypatch):
+    rows = ",".join(f"({i}, {'NULL' if i % 3 == 0 else repr(f'n{i % 4}')})" for i in range(1, 24))
+    client = standin(f"create table items (id integer primary key, name text); insert into items values {rows};")
+    monkeypatch.setattr(pagination, "get_client", lambda: client)
+    monkeypatch.setattr(pagination, "cached", lambda key, tables, load, ttl=None: load())
+    return client
+
+
+@pytest.mark.parametrize("desc", [False, True])
+@pytest.mark.parametrize("sort", ["id", "name"])
+def test_pages_cover_every_row_once(items, sort, desc):
+    expected = [row["id"] for row in items.table("items").select("id").order(sort, desc=desc).order("id", desc=desc).execute().data]
+    seen, cursor = [], None
+    while True:
+        page, cursor = fetch_page("items", ("name",), sort=sort, desc=desc, cursor=cursor, page_size=4)
+        seen += page.column("id").to_pylist()
+        assert len(seen) <= len(expected)
+        if cursor is None:
+            break
+    assert seen == expected
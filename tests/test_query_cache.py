@@ -0,0 +1,63 @@
+import pytest
+
+pytest.importorskip("streamlit")
+pytest.importorskip("supabase")
+
+from services import queryCache
+from services.queryCache import TTLCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(queryCache.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_get_returns_default_on_miss():
+    cache = TTLCache()
+    assert cache.get("missing") is None
+    assert cache.get("missing", 0) == 0
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = TTLCache(ttl=30)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=60)
+    clock[0] += 30
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    clock[0] += 30
+    assert cache.get("b") is None
+    assert len(cache) == 0
+
+
+def test_zero_ttl_never_expires(clock):
+    cache = TTLCache(ttl=0)
+    cache.set("a", 1)
+    clock[0] += 10 ** 9
+    assert cache.get("a") == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_invalidate_drops_only_entries_read_from_the_table():
+    cache = TTLCache()
+    cache.set("users page", 1, tables=("users",))
+    cache.set("overview", 2, tables=("users", "teams"))
+    cache.set("projects page", 3, tables=("projects",))
+    cache.invalidate("users")
+    assert cache.get("users page") is None
+    assert cache.get("overview") is None
+    assert cache.get("projects page") == 3
+    cache.invalidate("grades")
+    assert cache.get("projects page") == 3
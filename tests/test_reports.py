@@ -0,0 +1,76 @@
+import io
+from datetime import date
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("pyarrow")
+pytest.importorskip("openpyxl")
+pytest.importorskip("streamlit")
+pytest.importorskip("supabase")
+
+from services import reports
+from services.reports import FORMATS, _aggregate, _encode, _frames
+
+
+def _sections():
+    projects = pd.DataFrame({
+        "id": [1, 2, 3], "team_id": [1, 1, 2], "status": ["Initiated", "Completed", "Initiated"],
+        "created_at": ["2024-01-05T10:00:00+00:00", "2024-01-20T10:00:00+00:00", "2024-02-01T10:00:00+00:00"],
+    })
+    approvals = pd.DataFrame({
+        "id": [1], "team_id": [1], "status": ["Approved"], "created_at": ["2024-01-06T10:00:00+00:00"],
+    })
+    submissions = pd.DataFrame({
+        "id": [1, 2], "project_id": [1, 3], "created_at": ["2024-01-10T10:00:00+00:00", "2024-02-02T10:00:00+00:00"],
+    })
+    grades = pd.DataFrame({
+        "id": [1, 2], "team_id": [1, 2], "grade": ["88.5", "92"], "created_at": ["2024-01-30T10:00:00+00:00", "2024-02-03T10:00:00+00:00"],
+    })
+    return _aggregate(projects, approvals, submissions, grades)
+
+
+@pytest.mark.parametrize("fmt", list(FORMATS))
+def test_encode_every_format(fmt):
+    sections = _sections()
+    data = _encode(sections, fmt)
+    assert data
+
+    if fmt == "XLSX":
+        sheets = pd.read_excel(io.BytesIO(data), sheet_name=None)
+        assert list(sheets) == [name[:31] for name in sections]
+        return
+
+    long = pd.read_parquet(io.BytesIO(data)) if fmt == "Parquet" else pd.read_csv(io.BytesIO(data), dtype=str)
+    assert list(long.columns) == ["section", "key", "measure", "value"]
+    assert set(long["section"]) == set(sections)
+    overview = long[long["section"] == "Overview"].set_index("key")["value"]
+    assert float(overview["projects"]) == 3
+    assert float(overview["submissions"]) == 2
+
+
+def test_team_scope_keeps_submissions_to_older_projects(standin, monkeypatch):
+    # Project 1 predates the window; its January submission still counts for team 1
+    client = standin("""
+        create table projects (id integer primary key, team_id integer, status text, created_at text);
+        create table approvals (id integer primary key, team_id integer, status text, created_at text);
+        create table submissions (id integer primary key, project_id integer, created_at text);
+        create table grades (id integer primary key, team_id integer, grade text, created_at text);
+        insert into projects values
+            (1, 1, 'Initiated', '2023-11-02T10:00:00+00:00'),
+            (2, 1, 'Initiated', '2024-01-04T10:00:00+00:00'),
+            (3, 2, 'Initiated', '2023-12-01T10:00:00+00:00');
+        insert into submissions values
+            (1, 1, '2024-01-10T10:00:00+00:00'),
+            (2, 2, '2024-01-11T10:00:00+00:00'),
+            (3, 3, '2024-01-12T10:00:00+00:00'),
+            (4, 1, '2023-12-20T10:00:00+00:00');
+    """)
+    monkeypatch.setattr(reports, "get_client", lambda: client)
+
+    projects, _, submissions, _ = _frames(date(2024, 1, 1), date(2024, 2, 1), team_ids=[1])
+    assert list(projects["id"]) == [2]
+    assert list(submissions["id"]) == [1, 2]
+
+    _, _, submissions, _ = _frames(date(2024, 1, 1), date(2024, 2, 1))
+    assert list(submissions["id"]) == [1, 2, 3]